@@ -0,0 +1,230 @@
+import pandas as pd
+from architecture.utils.format_utils import FormatUtils
+
+"""
+architecture/data_access/bulk_integration.py
+Integración vectorizada de muchos proyectos a la vez para flujos por lotes.
+Une en un solo DataFrame los datos SOAP (projectInfo) y las filas del Excel, aplica
+las reglas de formato y la normalización de fechas como operaciones por columna
+y traduce cada clave una sola vez. El resultado por proyecto es idéntico al de
+IntegrationDataManager.integrate (las celdas atípicas usan las mismas funciones escalares).
+"""
+
+# Tipos que sanitize_dict deja intactos (comparación exacta de tipo para el camino rápido)
+_PLAIN_TYPES = [str, int, float, bool, type(None)]
+_EXCEL_SUFFIX = "__excel"
+
+
+def _translate_key(key):
+    """Clave en camelCase (inglés) tal como la produce normalize_keys_to_camel_case."""
+    return next(iter(FormatUtils.normalize_keys_to_camel_case({key: None})))
+
+
+def _is_date_key(key) -> bool:
+    return isinstance(key, str) and "fecha" in key.lower()
+
+
+def _apply_rule_scalar(rule, value):
+    try:
+        return rule(value)
+    except Exception:
+        return value
+
+
+def _map_cells(column: pd.Series, func) -> pd.Series:
+    """Aplica una función escalar celda a celda sin inferencia de dtype (None no se vuelve NaN)."""
+    return pd.Series([func(v) for v in column.tolist()], index=column.index, dtype=object)
+
+
+def _finalize_scalar(key, value):
+    """Camino escalar de sanitize_dict + camelCase para una celda (valores anidados o tipos raros)."""
+    cleaned = FormatUtils.sanitize_dict({key: value})
+    return next(iter(FormatUtils.normalize_keys_to_camel_case(cleaned).values()))
+
+
+# ─────────────────────────────────────────────
+# 🔧 OPERACIONES POR COLUMNA
+# ─────────────────────────────────────────────
+def _title_case_strings(strings: pd.Series) -> pd.Series:
+    """format_title_case por columna: una columna por palabra, capitalizada y vuelta a unir."""
+    words = strings.str.lower().str.split(expand=True)
+    if words.shape[1] == 0:
+        return pd.Series([""] * len(strings), index=strings.index, dtype=object)
+    words = words.apply(lambda col: col.str.capitalize()).fillna("")
+    joined = words[0]
+    if words.shape[1] > 1:
+        joined = joined.str.cat([words[c] for c in words.columns[1:]], sep=" ")
+    # Las palabras no contienen espacios: solo se quita el relleno de filas con menos palabras
+    return joined.str.rstrip(" ").astype(object)
+
+
+def format_column(column: pd.Series, key) -> pd.Series:
+    """Aplica la regla de FORMAT_RULES que corresponde a la columna (si existe)."""
+    rule = FormatUtils.FORMAT_RULES.get(FormatUtils.normalize_key(key))
+    if rule is None:
+        return column
+
+    is_str = column.map(type).eq(str)
+    strings = column[is_str]
+    result = column.copy()
+
+    if not strings.empty:
+        if rule is FormatUtils.format_title_case:
+            result[is_str] = _title_case_strings(strings)
+        elif rule is FormatUtils.FORMAT_RULES["email representante legal"]:
+            result[is_str] = strings.str.lower().str.strip()
+        else:
+            result[is_str] = _map_cells(strings, lambda v: _apply_rule_scalar(rule, v))
+
+    # Las reglas no cambian valores que no son texto, salvo subclases de str (p. ej. de lxml)
+    others = ~is_str & column.notna()
+    if others.any():
+        result[others] = _map_cells(column[others], lambda v: _apply_rule_scalar(rule, v))
+    return result
+
+
+def normalize_date_column(column: pd.Series) -> pd.Series:
+    """
+    Equivalente vectorizado de FormatUtils.normalize_date: prueba cada formato de
+    DATE_INPUT_FORMATS en orden con pd.to_datetime(format=...) sobre las celdas
+    pendientes. Las celdas que no son texto o que ningún formato reconoce pasan
+    por normalize_date, de modo que el resultado es el mismo celda a celda.
+    """
+    result = pd.Series([None] * len(column), index=column.index, dtype=object)
+    is_str = column.map(type).eq(str)
+
+    pending = column[is_str & column.ne("")].str.strip()
+    for fmt in FormatUtils.DATE_INPUT_FORMATS:
+        if pending.empty:
+            break
+        parsed = pd.to_datetime(pending, format=fmt, errors="coerce")
+        matched = parsed.notna()
+        if matched.any():
+            result[matched[matched].index] = parsed[matched].dt.strftime("%d/%m/%Y").astype(object)
+            pending = pending[~matched]
+
+    fallback = pending.index.union(column.index[~is_str])
+    if len(fallback):
+        result[fallback] = _map_cells(column[fallback], FormatUtils.normalize_date)
+    return result
+
+
+def finalize_column(column: pd.Series, key) -> pd.Series:
+    """sanitize_dict + camelCase de valores para una columna que no es de fecha."""
+    plain = column.map(type).isin(_PLAIN_TYPES)
+    if plain.all():
+        return column
+    result = column.copy()
+    result[~plain] = _map_cells(column[~plain], lambda v: _finalize_scalar(key, v))
+    return result
+
+
+def _process_columns(frame: pd.DataFrame, apply_rules: bool) -> pd.DataFrame:
+    processed = {}
+    for key in frame.columns:
+        column = frame[key]
+        if apply_rules:
+            column = format_column(column, key)
+        if _is_date_key(key):
+            # normalize_date es idempotente: sanitize_dict no cambia estas celdas
+            column = normalize_date_column(column)
+        else:
+            column = finalize_column(column, key)
+        processed[key] = column
+    return pd.DataFrame(processed, index=frame.index, dtype=object)
+
+
+def _rows_to_dicts(frame: pd.DataFrame, row_keys: list) -> list:
+    """
+    Arma un dict por fila respetando el orden de claves propio de cada fila.
+    Las filas se agrupan por firma de claves para traducir y seleccionar columnas una vez.
+    """
+    output = [None] * len(row_keys)
+    groups = {}
+    for position, keys in enumerate(row_keys):
+        groups.setdefault(keys, []).append(position)
+
+    for keys, positions in groups.items():
+        translated = [_translate_key(k) for k in keys]
+        values = frame.loc[positions, list(keys)].to_numpy().tolist() if keys else [[]] * len(positions)
+        for position, row in zip(positions, values):
+            # dict(zip) conserva la primera posición y el último valor ante claves traducidas repetidas
+            output[position] = dict(zip(translated, row))
+    return output
+
+
+# ─────────────────────────────────────────────
+# 🔹 INTEGRACIÓN POR LOTES
+# ─────────────────────────────────────────────
+def integrate_bulk(project_codes: list, soap_results: dict, excel_rows: dict) -> dict:
+    """
+    Integra muchos proyectos en una sola pasada.
+    - soap_results: código → resultado de SoapDataManager.get_project_data
+    - excel_rows: código (sin espacios) → fila del Excel (los ausentes integran sin campos Excel)
+    Retorna código → datos integrados, con la misma forma que IntegrationDataManager.integrate.
+    """
+    codes = list(dict.fromkeys(project_codes))
+    if not codes:
+        return {}
+
+    # 1️⃣ Unión SOAP + Excel en un DataFrame (el Excel prevalece en claves repetidas)
+    soap_infos = [soap_results[code].get("projectInfo", {}) for code in codes]
+    excel_infos = [excel_rows.get(code.strip()) or {} for code in codes]
+
+    soap_frame = pd.DataFrame(soap_infos, index=range(len(codes)), dtype=object)
+    excel_frame = pd.DataFrame(excel_infos, index=range(len(codes)), dtype=object)
+    merged = soap_frame.join(excel_frame, rsuffix=_EXCEL_SUFFIX)
+
+    has_excel = pd.Series([bool(row) for row in excel_infos], index=merged.index)
+    for key in excel_frame.columns:
+        if key in soap_frame.columns:
+            merged[key] = merged[key + _EXCEL_SUFFIX].where(has_excel, merged[key])
+            merged = merged.drop(columns=key + _EXCEL_SUFFIX)
+
+    row_keys = [
+        tuple(info) + tuple(k for k in excel if k not in info)
+        for info, excel in zip(soap_infos, excel_infos)
+    ]
+
+    # 2️⃣ Reglas de formato, fechas y limpieza por columna
+    project_infos = _rows_to_dicts(_process_columns(merged, apply_rules=True), row_keys)
+
+    # 3️⃣ Informes: un DataFrame con todos los informes tipo dict
+    report_records, report_keys, report_slots = [], [], []
+    reports_by_project = []
+    for position, code in enumerate(codes):
+        reports = list(soap_results[code].get("reports", []))
+        for index, report in enumerate(reports):
+            if isinstance(report, dict):
+                report_records.append(report)
+                report_keys.append(tuple(report))
+                report_slots.append((position, index))
+            else:
+                reports[index] = FormatUtils.normalize_keys_to_camel_case(FormatUtils.sanitize_dict(report))
+        reports_by_project.append(reports)
+
+    if report_records:
+        report_frame = pd.DataFrame(report_records, index=range(len(report_records)), dtype=object)
+        clean_reports = _rows_to_dicts(_process_columns(report_frame, apply_rules=False), report_keys)
+        for (position, index), report in zip(report_slots, clean_reports):
+            reports_by_project[position][index] = report
+
+    # 4️⃣ Estructura integrada con claves traducidas una sola vez
+    key_code, key_info, key_reports, key_metadata = (
+        _translate_key(k) for k in ("projectCode", "projectInfo", "reports", "metadata")
+    )
+    metadata = FormatUtils.normalize_keys_to_camel_case(
+        FormatUtils.sanitize_dict(FormatUtils.get_metadata("", ["SOAP", "Excel"]))
+    )
+    metadata_code_key = _translate_key("projectCode")
+
+    results = {}
+    for position, code in enumerate(codes):
+        project_metadata = {**metadata, metadata_code_key: code, "sources": list(metadata["sources"])}
+        results[code] = {
+            key_code: code,
+            key_info: project_infos[position],
+            key_reports: reports_by_project[position],
+            key_metadata: project_metadata
+        }
+    return results
@@ -0,0 +1,44 @@
+"""
+architecture/data_access/errors.py
+Errores tipados de la capa de datos. La capa de datos no muestra diálogos: lanza
+estos errores y cada borde (GUI, servidor HTTP, scripts) decide cómo informarlos.
+Heredan además de la excepción estándar equivalente, de modo que los
+'except FileNotFoundError / LookupError / ValueError' existentes siguen funcionando.
+"""
+
+
+class DataAccessError(Exception):
+    """Base de los errores de la capa de datos."""
+
+
+class ExcelFileNotFoundError(DataAccessError, FileNotFoundError):
+    """No se pudo ubicar el Excel institucional (datos_finales_cartasp.xlsx)."""
+
+    def __init__(self, message: str, searched: list | None = None, onedrive_found: bool = True):
+        super().__init__(message)
+        # Rutas revisadas, en orden, para mostrarlas o registrarlas en el borde
+        self.searched = searched or []
+        # False si ni siquiera existe la carpeta 'InnovaChile - General' de OneDrive
+        self.onedrive_found = onedrive_found
+
+
+class ExcelFormatError(DataAccessError, ValueError):
+    """El Excel institucional no tiene la estructura esperada."""
+
+
+class SoapUnavailableError(DataAccessError, ConnectionError):
+    """Una llamada SOAP al OSB falló (SoapClient retornó None): los datos estarían incompletos."""
+
+    def __init__(self, project_code: str, operation: str):
+        super().__init__(f"El OSB no respondió {operation} para el proyecto {project_code}.")
+        self.project_code = project_code
+        self.operation = operation
+
+
+class ProjectNotFoundError(DataAccessError, LookupError):
+    """El código de proyecto no existe en la fuente consultada."""
+
+    def __init__(self, project_code: str, source: str = "Excel"):
+        super().__init__(f"No se encontró el código {project_code} en {source}.")
+        self.project_code = project_code
+        self.source = source
@@ -1,58 +1,256 @@
 import os
+import json
+import hashlib
+import threading
+from dataclasses import dataclass, field
 import pandas as pd
-from tkinter import messagebox, filedialog
-from architecture.utils.path_utils import PathUtils
+from architecture.utils.path_utils import ExcelPathResolver, get_excel_path_resolver
+from architecture.data_access.errors import ExcelFileNotFoundError, ExcelFormatError, ProjectNotFoundError
+from architecture.data_access.excel_stream_loader import ExcelStreamLoader
 """
 architecture/data_access/excel_data_manager.py
 Lee el archivo Excel institucional 'datos_finales_cartasp.xlsx'
 y devuelve la información del proyecto filtrada por el código.
+Mantiene un índice en memoria (código → fila) que se refresca de forma
+incremental: solo se actualizan las filas cuyo hash cambió.
+No usa interfaz gráfica: se puede usar desde hilos, procesos y servidores.
 """
 
 
+# Campos que queremos incluir siempre
+SELECTED_FIELDS = [
+    "Código",
+    "Código Sistema",
+    "Nombre Ejecutivo Técnico",
+    "Subdirección",
+    "Subdirector",
+    "Email representante legal",
+    "Beneficiario correo",
+    "Director correo",
+    "pro_codigo",
+    "pro_resolucion",
+    "pro_resolucion_fecha"
+]
+
+# Nombre del proyecto: solo alimenta el índice de autocompletado, no los datos integrados
+PROJECT_NAME_FIELD = "Nombre Proyecto"
+INDEX_FIELDS = SELECTED_FIELDS + [PROJECT_NAME_FIELD]
+
+
+@dataclass
+class ExcelChangeLog:
+    """Resultado de un refresco: códigos agregados, modificados y eliminados."""
+
+    added: list = field(default_factory=list)
+    modified: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+
+    @property
+    def affected(self) -> list:
+        """Todos los códigos cuyo contenido cambió (para invalidar cachés)."""
+        return self.added + self.modified + self.removed
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.modified or self.removed)
 
 
 class ExcelDataManager:
     """Maneja la lectura y filtrado del archivo Excel institucional."""
 
-    def __init__(self):
-        # Obtiene ruta usando PathUtils
-        self.excel_path = PathUtils.get_cartasperentorias_excel_path()
+    _shared_instance = None
+    _shared_lock = threading.Lock()
 
-    def get_project_data(self, project_code: str):
+    def __init__(
+        self,
+        excel_path: str | None = None,
+        loader: str = "pandas",
+        path_resolver: ExcelPathResolver | None = None
+    ):
+        # Ruta explícita o la del resolvedor (por defecto el compartido del proceso)
+        self.excel_path = excel_path or (path_resolver or get_excel_path_resolver()).resolve()
+        # "pandas" (DataFrame completo) u "openpyxl" (streaming read-only)
+        self.loader = loader
+
+        # Índice en memoria: código → campos seleccionados / hash de la fila
+        self._index = {}
+        self._row_hashes = {}
+        self._names = {}
+        self._file_signature = None
+        self._listeners = []
+        self._lock = threading.RLock()
+
+        # Si un watcher mantiene el índice caliente, las consultas no releen el archivo
+        self.auto_refresh = True
+
+    @classmethod
+    def shared(cls):
         """
-        Lee el Excel y filtra por código de proyecto.
-        Retorna un diccionario con los campos relevantes.
+        Devuelve la instancia compartida del proceso (un único índice para
+        la GUI, los watchers y los flujos por lotes).
         """
-        if not os.path.exists(self.excel_path):
-            raise FileNotFoundError(f"No se encontró el archivo: {self.excel_path}")
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    # ─────────────────────────────────────────────
+    # 🔧 LECTURA E ÍNDICE
+    # ─────────────────────────────────────────────
+    @staticmethod
+    def _row_hash(row: dict) -> str:
+        """Hash estable de los campos seleccionados de una fila."""
+        payload = json.dumps(row, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
 
+    def _get_file_signature(self):
+        stat = os.stat(self.excel_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_rows(self):
+        """
+        Lee el Excel completo y retorna un dict código → campos seleccionados.
+        Si un código aparece repetido se conserva la primera fila (igual que el filtro original).
+        """
+        # openpyxl no lee el formato .xls antiguo: en ese caso se usa pandas
+        if self.loader == "openpyxl" and not self.excel_path.lower().endswith(".xls"):
+            return ExcelStreamLoader(self.excel_path, INDEX_FIELDS).build_index()
+        return self._read_rows_pandas()
+
+    def _read_rows_pandas(self):
+        """Lectura original con pandas (DataFrame completo de la primera hoja)."""
         df = pd.read_excel(self.excel_path)
 
         if "Código" not in df.columns:
-            raise ValueError("El archivo Excel no contiene la columna 'Código'.")
-
-        filtered = df[df["Código"].astype(str).str.strip() == project_code.strip()]
-        if filtered.empty:
-            messagebox.showinfo("Proyecto no encontrado", f"No se encontró el código: {project_code}")
-            return {}
-
-        # No eliminamos los NaN para mantener todas las columnas relevantes
-        data_dict = filtered.iloc[0].to_dict()
-
-        # Campos que queremos incluir siempre
-        selected_fields = [
-            "Código",
-            "Código Sistema",
-            "Nombre Ejecutivo Técnico",
-            "Subdirección",
-            "Subdirector",
-            "Email representante legal",
-            "Beneficiario correo",
-            "Director correo",
-            "pro_codigo",
-            "pro_resolucion",
-            "pro_resolucion_fecha"
-        ]
-
-        filtered_dict = {k: (None if pd.isna(v) else v) for k, v in data_dict.items() if k in selected_fields}
-        return filtered_dict
\ No newline at end of file
+            raise ExcelFormatError("El archivo Excel no contiene la columna 'Código'.")
+
+        columns = [c for c in df.columns if c in INDEX_FIELDS]
+        codes = df["Código"].astype(str).str.strip()
+
+        rows = {}
+        for code, values in zip(codes, df[columns].itertuples(index=False, name=None)):
+            if code in rows:
+                continue
+            # No eliminamos los NaN para mantener todas las columnas relevantes
+            rows[code] = {k: (None if pd.isna(v) else v) for k, v in zip(columns, values)}
+        return rows
+
+    def refresh(self, force: bool = False) -> ExcelChangeLog:
+        """
+        Relee el Excel y actualiza solo las entradas del índice cuyo hash cambió.
+        Si el archivo no cambió desde el último refresco (mtime + tamaño) no se relee.
+        Retorna el registro de cambios y lo notifica a los suscriptores.
+        """
+        if not os.path.exists(self.excel_path):
+            raise ExcelFileNotFoundError(f"No se encontró el archivo: {self.excel_path}", searched=[self.excel_path])
+
+        with self._lock:
+            signature = self._get_file_signature()
+            if not force and signature == self._file_signature:
+                return ExcelChangeLog()
+
+            rows = self._read_rows()
+            change_log = ExcelChangeLog()
+
+            for code, row in rows.items():
+                # El hash incluye el nombre para que un cambio de nombre también se notifique
+                row_hash = self._row_hash(row)
+                previous = self._row_hashes.get(code)
+                if previous == row_hash:
+                    continue
+                if previous is None:
+                    change_log.added.append(code)
+                else:
+                    change_log.modified.append(code)
+                self._names[code] = row.pop(PROJECT_NAME_FIELD, None)
+                self._index[code] = row
+                self._row_hashes[code] = row_hash
+
+            for code in [c for c in self._index if c not in rows]:
+                del self._index[code]
+                del self._row_hashes[code]
+                self._names.pop(code, None)
+                change_log.removed.append(code)
+
+            self._file_signature = signature
+
+        if not change_log.is_empty():
+            print(
+                f"📊 Excel refrescado: {len(change_log.added)} nuevos, "
+                f"{len(change_log.modified)} modificados, {len(change_log.removed)} eliminados."
+            )
+            self._notify(change_log)
+        return change_log
+
+    def is_loaded(self) -> bool:
+        return self._file_signature is not None
+
+    # ─────────────────────────────────────────────
+    # 🔔 SUSCRIPCIÓN A CAMBIOS
+    # ─────────────────────────────────────────────
+    def subscribe(self, callback):
+        """
+        Registra un callback(change_log) que se invoca tras cada refresco con cambios.
+        Permite que las cachés dependientes invaliden solo los proyectos afectados.
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, change_log: ExcelChangeLog):
+        for callback in list(self._listeners):
+            try:
+                callback(change_log)
+            except Exception as e:
+                print(f"⚠️ Error notificando cambios del Excel: {e}")
+
+    # ─────────────────────────────────────────────
+    # 🔹 CONSULTA
+    # ─────────────────────────────────────────────
+    def find_project(self, project_code: str):
+        """
+        Busca el código de proyecto en el índice sin interacción con la interfaz.
+        El refresco solo relee el archivo si cambió desde la última lectura;
+        con un watcher activo solo se lee si el índice aún no está cargado.
+        Retorna los campos relevantes o None si el código no existe.
+        """
+        if self.auto_refresh or not self.is_loaded():
+            self.refresh()
+
+        with self._lock:
+            row = self._index.get(project_code.strip())
+        return dict(row) if row is not None else None
+
+    def list_projects(self) -> list:
+        """Lista (código, nombre del proyecto) de todo el índice, para búsquedas por prefijo."""
+        with self._lock:
+            return [(code, self._names.get(code)) for code in self._index]
+
+    def find_projects(self, project_codes: list) -> dict:
+        """
+        Busca varios códigos con un único refresco y una sola toma del bloqueo (sin interfaz).
+        Retorna código (sin espacios) → campos relevantes; los códigos ausentes no se incluyen.
+        """
+        if self.auto_refresh or not self.is_loaded():
+            self.refresh()
+
+        with self._lock:
+            rows = {}
+            for code in project_codes:
+                code = code.strip()
+                row = self._index.get(code)
+                if row is not None:
+                    rows[code] = dict(row)
+        return rows
+
+    def get_project_data(self, project_code: str):
+        """
+        Busca el código de proyecto en el índice.
+        Retorna un diccionario con los campos relevantes; lanza ProjectNotFoundError si no está.
+        """
+        row = self.find_project(project_code)
+        if row is None:
+            raise ProjectNotFoundError(project_code, "el Excel institucional")
+
+        return row
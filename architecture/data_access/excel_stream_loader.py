@@ -0,0 +1,112 @@
+from datetime import datetime
+import pandas as pd
+from openpyxl import load_workbook
+from architecture.data_access.errors import ExcelFormatError
+
+"""
+architecture/data_access/excel_stream_loader.py
+Lector alternativo del Excel institucional basado en openpyxl (read_only / values_only).
+Recorre la hoja fila a fila leyendo solo el encabezado y las columnas necesarias,
+sin construir un DataFrame completo en memoria.
+Los valores se devuelven con la misma representación que el lector pandas
+(fechas como Timestamp, columnas numéricas con vacíos como float) para que el
+hash de fila no cambie al alternar entre lectores.
+"""
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _to_pandas_types(index: dict, fields: list) -> dict:
+    """
+    Ajusta los valores del índice a lo que entregaría pd.read_excel:
+    - fechas → pd.Timestamp;
+    - columnas solo numéricas con algún float o algún vacío → float (pandas
+      promueve la columna a float64 para representar NaN).
+    Las columnas mixtas (texto y números) quedan como object: se respetan los valores.
+    """
+    rows = list(index.values())
+    for name in fields:
+        values = [row.get(name) for row in rows]
+        present = [v for v in values if v is not None]
+        if not present:
+            continue
+        if all(_is_number(v) for v in present):
+            if len(present) < len(values) or any(isinstance(v, float) for v in present):
+                for row in rows:
+                    if row.get(name) is not None:
+                        row[name] = float(row[name])
+        elif all(isinstance(v, datetime) for v in present):
+            for row in rows:
+                if row.get(name) is not None:
+                    row[name] = pd.Timestamp(row[name])
+    return index
+
+
+class ExcelStreamLoader:
+    """Lee en streaming la primera hoja del Excel y extrae solo los campos pedidos."""
+
+    def __init__(self, excel_path: str, fields: list, key_field: str = "Código"):
+        self.excel_path = excel_path
+        self.fields = fields
+        self.key_field = key_field
+
+    # ─────────────────────────────────────────────
+    # 🔧 LECTURA
+    # ─────────────────────────────────────────────
+    def _iter_rows(self):
+        """
+        Genera (código, dict de campos) por cada fila de datos.
+        El libro se cierra al terminar o al abandonar el generador (early exit).
+        """
+        workbook = load_workbook(self.excel_path, read_only=True, data_only=True)
+        try:
+            # Igual que pd.read_excel: se usa la primera hoja
+            sheet = workbook.worksheets[0]
+            header = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+
+            positions = {}
+            for i, name in enumerate(header):
+                name = str(name) if name is not None else None
+                if name in self.fields and name not in positions:
+                    positions[name] = i
+
+            if self.key_field not in positions:
+                raise ExcelFormatError(f"El archivo Excel no contiene la columna '{self.key_field}'.")
+
+            # Solo se iteran las columnas entre la primera y la última necesaria
+            min_col = min(positions.values())
+            max_col = max(positions.values())
+            offsets = [(name, i - min_col) for name, i in sorted(positions.items(), key=lambda x: x[1])]
+            key_offset = positions[self.key_field] - min_col
+
+            for values in sheet.iter_rows(min_row=2, min_col=min_col + 1, max_col=max_col + 1, values_only=True):
+                if not values or all(v is None for v in values):
+                    continue
+                code = values[key_offset] if key_offset < len(values) else None
+                if code is None:
+                    continue
+                row = {name: (values[off] if off < len(values) else None) for name, off in offsets}
+                yield str(code).strip(), row
+        finally:
+            workbook.close()
+
+    # ─────────────────────────────────────────────
+    # 🔹 MODOS DE CONSULTA
+    # ─────────────────────────────────────────────
+    def find_project(self, project_code: str):
+        """Busca un único código y se detiene en la primera coincidencia."""
+        target = project_code.strip()
+        for code, row in self._iter_rows():
+            if code == target:
+                return row
+        return None
+
+    def build_index(self) -> dict:
+        """Construye el índice completo código → campos (se conserva la primera fila)."""
+        index = {}
+        for code, row in self._iter_rows():
+            if code not in index:
+                index[code] = row
+        return _to_pandas_types(index, self.fields)
@@ -0,0 +1,90 @@
+import os
+import threading
+from architecture.data_access.excel_data_manager import ExcelDataManager
+
+"""
+architecture/data_access/excel_watcher.py
+Hilo en segundo plano que precarga el Excel institucional al iniciar la app
+y lo recarga cuando cambia en OneDrive, para que las búsquedas nunca
+esperen la lectura del archivo.
+"""
+
+
+class ExcelFileWatcher:
+    """Mantiene caliente el índice de un ExcelDataManager sondeando el archivo."""
+
+    def __init__(self, excel_manager: ExcelDataManager, interval: float = 5.0):
+        self.excel_manager = excel_manager
+        self.interval = interval
+
+        self._stop_event = threading.Event()
+        self._ready_event = threading.Event()
+        self._thread = None
+        self._last_seen = None
+        self.last_error = None
+
+    # ─────────────────────────────────────────────
+    # 🔹 CICLO DE VIDA
+    # ─────────────────────────────────────────────
+    def start(self):
+        """Inicia el hilo (daemon): precarga el índice y luego sondea cambios."""
+        if self._thread and self._thread.is_alive():
+            return self
+
+        # Las consultas ya no releen el archivo: el watcher se encarga
+        self.excel_manager.auto_refresh = False
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ExcelFileWatcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None):
+        """Detiene el sondeo y devuelve el control de refresco a las consultas."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self.excel_manager.auto_refresh = True
+
+    def wait_until_ready(self, timeout: float | None = None) -> bool:
+        """Espera a que termine la precarga inicial."""
+        return self._ready_event.wait(timeout)
+
+    # ─────────────────────────────────────────────
+    # 🔧 SONDEO
+    # ─────────────────────────────────────────────
+    def _get_signature(self):
+        try:
+            stat = os.stat(self.excel_manager.excel_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _reload(self):
+        try:
+            self.excel_manager.refresh()
+            self.last_error = None
+        except Exception as e:
+            # OneDrive puede estar escribiendo el archivo; se reintenta en el próximo ciclo
+            self.last_error = e
+            self._last_seen = None
+            print(f"⚠️ No se pudo recargar el Excel: {e}")
+
+    def _run(self):
+        print(f"📥 Precargando Excel: {self.excel_manager.excel_path}")
+        self._last_seen = self._get_signature()
+        self._reload()
+        self._ready_event.set()
+
+        while not self._stop_event.wait(self.interval):
+            signature = self._get_signature()
+            if signature is None or signature == self._last_seen:
+                continue
+
+            # Se espera a que el archivo deje de cambiar (sincronización en curso)
+            self._last_seen = signature
+            if self._stop_event.wait(self.interval / 2):
+                break
+            if self._get_signature() != signature:
+                continue
+
+            self._reload()
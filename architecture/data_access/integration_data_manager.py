@@ -1,6 +1,11 @@
+from architecture.data_access import bulk_integration
 from architecture.data_access.soap_data_manager import SoapDataManager
 from architecture.data_access.excel_data_manager import ExcelDataManager
+from architecture.data_access.errors import ProjectNotFoundError
+from architecture.data_access.single_flight import SingleFlight
 from architecture.utils.format_utils import FormatUtils
+from architecture.utils.memory_report import memory_stage
+from architecture.utils.profiling import profiled
 import json
 
 """
@@ -13,24 +18,58 @@ y genera metadatos técnicos.
 class IntegrationDataManager:
     """Fusiona la información de SOAP y Excel para generar un JSON integrado."""
 
-    def __init__(self):
-        self.soap_manager = SoapDataManager()
-        self.excel_manager = ExcelDataManager()
+    # Compartido por todas las instancias: solicitudes simultáneas del mismo código
+    # comparten una única consulta SOAP + Excel
+    _inflight = SingleFlight()
+
+    def __init__(self, soap_manager: SoapDataManager | None = None, excel_manager: ExcelDataManager | None = None):
+        self.soap_manager = soap_manager or SoapDataManager()
+        # El Excel se consulta sobre el índice compartido del proceso
+        self.excel_manager = excel_manager or ExcelDataManager.shared()
 
     # ─────────────────────────────────────────────
     # 🔹 MÉTODO PRINCIPAL
     # ─────────────────────────────────────────────
+    @profiled("get_integrated_data")
     def get_integrated_data(self, project_code: str):
         """
         Obtiene datos desde SOAP y Excel, los integra y aplica reglas de formato y limpieza.
+        Si ya hay una consulta en curso para el mismo código, se espera y comparte su resultado.
         Retorna un diccionario listo para serialización JSON.
         """
+        return self._inflight.do(project_code.strip(), self._fetch_integrated_data, project_code)
+
+    @classmethod
+    def coalescing_stats(cls) -> dict:
+        """Contadores de consultas ejecutadas vs. coalescidas."""
+        return cls._inflight.stats()
+
+    def _fetch_integrated_data(self, project_code: str):
+        """Consulta ambas fuentes e integra el resultado (una ejecución real)."""
         print(f"\n🔍 Obteniendo datos integrados para proyecto {project_code}...")
 
         # 1️⃣ Obtener datos desde ambas fuentes
-        soap_data = self.soap_manager.get_project_data(project_code)
-        excel_data = self.excel_manager.get_project_data(project_code)
+        with memory_stage("soap"):
+            soap_data = self.soap_manager.get_project_data(project_code)
+        with memory_stage("excel"):
+            try:
+                excel_data = self.excel_manager.get_project_data(project_code)
+            except ProjectNotFoundError as e:
+                # Sin fila en el Excel se integra solo lo de SOAP (como en el flujo por lotes)
+                print(f"⚠️ {e}")
+                excel_data = {}
+
+        return self.integrate(project_code, soap_data, excel_data)
 
+    def integrate(self, project_code: str, soap_data: dict, excel_data: dict):
+        """
+        Integra datos SOAP y Excel ya obtenidos (sin E/S), aplicando las reglas
+        de formato, normalización de fechas y traducción de claves.
+        """
+        with memory_stage("integration"):
+            return self._integrate(project_code, soap_data, excel_data)
+
+    def _integrate(self, project_code: str, soap_data: dict, excel_data: dict):
         # 2️⃣ Fusionar datos base (prioriza Excel si hay claves repetidas)
         project_info = {**soap_data.get("projectInfo", {}), **excel_data}
 
@@ -70,6 +109,40 @@ class IntegrationDataManager:
         clean_data = FormatUtils.normalize_keys_to_camel_case(clean_data)
         return clean_data
 
+    # ─────────────────────────────────────────────
+    # 🔹 INTEGRACIÓN POR LOTES (VECTORIZADA)
+    # ─────────────────────────────────────────────
+    @profiled("get_integrated_data_bulk")
+    def get_integrated_data_bulk(self, project_codes: list) -> tuple[dict, dict]:
+        """
+        Integra muchos proyectos de una vez: consultas SOAP, una sola búsqueda en el
+        índice Excel (sin diálogos) y una integración por DataFrame.
+        Las consultas SOAP corren en el hilo que llama (sin pool propio): así quedan bajo
+        la prioridad del trabajo del planificador que las pidió y no compiten con lo
+        interactivo. Para más paralelismo se reparten los códigos en varios trabajos.
+        Retorna (código → datos integrados, código → mensaje de error SOAP).
+        """
+        codes = list(dict.fromkeys(c.strip() for c in project_codes if c and c.strip()))
+        soap_results, errors = {}, {}
+        with memory_stage("soap"):
+            for code in codes:
+                try:
+                    soap_results[code] = self.soap_manager.get_project_data(code)
+                except Exception as e:
+                    errors[code] = str(e)
+
+        with memory_stage("excel"):
+            excel_rows = self.excel_manager.find_projects(list(soap_results))
+        return self.integrate_bulk(list(soap_results), soap_results, excel_rows), errors
+
+    def integrate_bulk(self, project_codes: list, soap_results: dict, excel_rows: dict) -> dict:
+        """
+        Versión por lotes de integrate(): misma salida por proyecto, calculada
+        con operaciones por columna sobre un único DataFrame.
+        """
+        with memory_stage("integration"):
+            return bulk_integration.integrate_bulk(project_codes, soap_results, excel_rows)
+
     # ─────────────────────────────────────────────
     # 🔹 MÉTODO PARA EXPORTAR COMO JSON FORMATEADO
     # ─────────────────────────────────────────────
@@ -0,0 +1,148 @@
+import threading
+from bisect import bisect_left
+from architecture.utils.format_utils import FormatUtils
+
+"""
+architecture/data_access/project_code_index.py
+Índice de prefijos (arreglos ordenados + bisect) sobre los códigos y nombres
+de proyecto del Excel institucional. Alimenta el autocompletado de la GUI y
+permite rechazar códigos inexistentes antes de cualquier llamada SOAP.
+Se reconstruye en segundo plano cada vez que el Excel cambia.
+"""
+
+
+def _normalize_code(code: str) -> str:
+    return code.strip().upper()
+
+
+def _prefix_range(keys: list, prefix: str) -> tuple[int, int]:
+    """Rango [inicio, fin) de las claves ordenadas que empiezan con 'prefix'."""
+    start = bisect_left(keys, prefix)
+    # '\uffff' es mayor que cualquier carácter de los códigos y nombres
+    end = bisect_left(keys, prefix + "\uffff", start)
+    return start, end
+
+
+class _Snapshot:
+    """Arreglos inmutables de una versión del índice (se reemplazan completos)."""
+
+    def __init__(self, projects: list):
+        self.names = {}
+        self.name_words = {}
+        codes = []
+        words = []
+        for code, name in projects:
+            normalized = _normalize_code(code)
+            codes.append((normalized, code))
+            if isinstance(name, str) and name.strip():
+                self.names[code] = name.strip()
+                name_words = FormatUtils.normalize_key(name).split()
+                self.name_words[code] = name_words
+                for word in set(name_words):
+                    words.append((word, code))
+
+        codes.sort()
+        words.sort()
+        self.code_keys = [c[0] for c in codes]
+        self.code_values = [c[1] for c in codes]
+        self.word_keys = [w[0] for w in words]
+        self.word_values = [w[1] for w in words]
+        self.valid = set(self.code_keys)
+
+
+class ProjectCodeIndex:
+    """Autocompletado por prefijo de código o de palabras del nombre del proyecto."""
+
+    def __init__(self, projects: list | None = None):
+        self._snapshot = _Snapshot(projects or [])
+        self._loaded = projects is not None
+        self._excel_manager = None
+        self._rebuild_lock = threading.Lock()
+
+    @classmethod
+    def attach(cls, excel_manager):
+        """
+        Crea el índice ligado al ExcelDataManager: se reconstruye con cada cambio
+        notificado (típicamente desde el hilo del watcher). Suscribirse antes de
+        iniciar el watcher para recibir la carga inicial.
+        """
+        index = cls()
+        index._excel_manager = excel_manager
+        excel_manager.subscribe(index.on_excel_change)
+        if excel_manager.is_loaded():
+            index.rebuild()
+        return index
+
+    def detach(self):
+        if self._excel_manager is not None:
+            self._excel_manager.unsubscribe(self.on_excel_change)
+            self._excel_manager = None
+
+    # ─────────────────────────────────────────────
+    # 🔧 CONSTRUCCIÓN
+    # ─────────────────────────────────────────────
+    def rebuild(self, projects: list | None = None):
+        """Reconstruye los arreglos y los publica con una sola asignación."""
+        with self._rebuild_lock:
+            if projects is None:
+                projects = self._excel_manager.list_projects()
+            self._snapshot = _Snapshot(projects)
+            self._loaded = True
+
+    def on_excel_change(self, change_log):
+        self.rebuild()
+
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    # ─────────────────────────────────────────────
+    # 🔹 CONSULTA
+    # ─────────────────────────────────────────────
+    def is_valid(self, project_code: str) -> bool:
+        return _normalize_code(project_code) in self._snapshot.valid
+
+    def canonical_code(self, project_code: str):
+        """Código tal como figura en el Excel (sin importar mayúsculas), o None si no existe."""
+        snapshot = self._snapshot
+        normalized = _normalize_code(project_code)
+        start, end = _prefix_range(snapshot.code_keys, normalized)
+        for i in range(start, end):
+            if snapshot.code_keys[i] == normalized:
+                return snapshot.code_values[i]
+        return None
+
+    def suggest(self, query: str, limit: int = 8) -> list:
+        """
+        Sugerencias (código, nombre) para lo escrito: primero los códigos que empiezan
+        con el texto y luego los proyectos cuyo nombre tiene palabras que empiezan
+        con cada término escrito.
+        """
+        snapshot = self._snapshot
+        query = query.strip()
+        if not query:
+            return []
+
+        results = []
+        seen = set()
+
+        start, end = _prefix_range(snapshot.code_keys, _normalize_code(query))
+        for i in range(start, min(end, start + limit)):
+            code = snapshot.code_values[i]
+            seen.add(code)
+            results.append((code, snapshot.names.get(code)))
+
+        terms = FormatUtils.normalize_key(query).split()
+        if len(results) < limit and terms:
+            start, end = _prefix_range(snapshot.word_keys, terms[0])
+            for i in range(start, end):
+                code = snapshot.word_values[i]
+                if code in seen:
+                    continue
+                # Los demás términos también deben ser prefijo de alguna palabra del nombre
+                name_words = snapshot.name_words[code]
+                if all(any(word.startswith(term) for word in name_words) for term in terms[1:]):
+                    seen.add(code)
+                    results.append((code, snapshot.names[code]))
+                    if len(results) >= limit:
+                        break
+        return results
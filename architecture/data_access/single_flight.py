@@ -0,0 +1,78 @@
+import copy
+import threading
+
+"""
+architecture/data_access/single_flight.py
+Capa "single-flight": si varias solicitudes piden la misma clave al mismo tiempo,
+solo una ejecuta la consulta y las demás esperan y reciben su resultado (o su error).
+"""
+
+
+class _InFlightCall:
+    """Consulta en curso compartida por todas las solicitudes de una clave."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce llamadas concurrentes por clave y lleva contadores de uso."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        Ejecuta func(*args, **kwargs) salvo que ya exista una ejecución en curso
+        para la misma clave; en ese caso espera y retorna una copia de su resultado.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Cada solicitante recibe su propia copia (los resultados son dicts mutables)
+            return copy.deepcopy(call.result)
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        else:
+            call.result = result
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+                waiters = call.waiters
+            # Los que esperan copian una instantánea, no el objeto que recibe el líder
+            if waiters and call.error is None:
+                call.result = copy.deepcopy(call.result)
+            call.done.set()
+
+    def stats(self) -> dict:
+        """Contadores de consultas ejecutadas vs. coalescidas y claves en vuelo."""
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "inFlight": len(self._calls)
+            }
@@ -1,4 +1,5 @@
 from services.soap_client import SoapClient
+from architecture.data_access.errors import SoapUnavailableError
 import json
 
 """
@@ -7,12 +8,19 @@ Gestiona el consumo de los servicios SOAP y construye un JSON estructurado
 con información de proyectos e informes.
 """
 
+# Tipos de informe consultados en SEL_SNAPSHOT_INFORMES
+REPORT_TYPES = [
+    "INFORME DE AVANCE",
+    "INFORME DE GESTIÓN TÉCNICA",
+    "INFORME FINAL"
+]
+
 
 class SoapDataManager:
     """Controlador de alto nivel para obtener datos del proyecto desde SOAP."""
 
-    def __init__(self):
-        self.client = SoapClient()
+    def __init__(self, client: SoapClient | None = None):
+        self.client = client or SoapClient()
 
     # ─────────────────────────────────────────────
     # PARSEOS DE RESPUESTA SOAP
@@ -72,22 +80,33 @@ class SoapDataManager:
     # MÉTODOS PRINCIPALES
     # ─────────────────────────────────────────────
     def get_project_data(self, project_code: str):
-        """Obtiene datos generales del proyecto + informes asociados."""
+        """
+        Obtiene datos generales del proyecto + informes asociados.
+        SoapClient retorna None cuando una llamada falla: en ese caso se lanza
+        SoapUnavailableError en vez de entregar un proyecto sin informes.
+        """
         print(f"\n🔍 Consultando datos del proyecto {project_code}...")
 
-        project_info = self._parse_rows_to_dict(
-            self.client.get_snapshot_proyectos(project_code)
-        )
-
-        report_types = [
-            "INFORME DE AVANCE",
-            "INFORME DE GESTIÓN TÉCNICA",
-            "INFORME FINAL"
-        ]
+        serialized_project = self.client.get_snapshot_proyectos(project_code)
+        if serialized_project is None:
+            raise SoapUnavailableError(project_code, "SEL_SNAPSHOT_PROYECTOS")
+        serialized_reports = {}
+        for tipo in REPORT_TYPES:
+            serialized_reports[tipo] = self.client.get_snapshot_informes(project_code, tipo)
+            if serialized_reports[tipo] is None:
+                raise SoapUnavailableError(project_code, f"SEL_SNAPSHOT_INFORMES ({tipo})")
+        return self.build_project_data(serialized_project, serialized_reports)
+
+    def build_project_data(self, serialized_project, serialized_reports: dict):
+        """
+        Construye la estructura projectInfo + reports a partir de las respuestas
+        SOAP ya obtenidas (permite hacer las llamadas en paralelo fuera de esta clase).
+        """
+        project_info = self._parse_rows_to_dict(serialized_project)
 
         reports = []
-        for tipo in report_types:
-            serialized = self.client.get_snapshot_informes(project_code, tipo)
+        for tipo in REPORT_TYPES:
+            serialized = serialized_reports.get(tipo)
             items = self._parse_rows_to_list(serialized)
 
             if items:
@@ -1,7 +1,20 @@
+import hashlib
 import os
+import threading
+from io import BytesIO
 from datetime import datetime
 from docx import Document
-from architecture.utils.path_utils import generate_download_path
+from architecture.utils.path_utils import (
+    content_addressed_path,
+    letter_content_hash,
+    letter_identity,
+    remove_superseded_letters,
+    write_file_atomically
+)
+from architecture.utils.memory_report import memory_stage
+from architecture.utils.profiling import profiled
+from architecture.document_processing.fast_docx_renderer import RenderedLetter, compiled_template, renderable, slot
+from architecture.document_processing.letter_preflight import validate_letters
 
 # Mapa de meses en español (evitamos depender del locale del sistema)
 SPANISH_MONTHS = {
@@ -16,8 +29,14 @@ class DocumentProcessor:
     y datos integrados (dict).
     """
 
-    def __init__(self):
+    # Hash del contenido de cada plantilla, por (ruta, fecha de modificación, tamaño)
+    _template_versions = {}
+    _template_versions_lock = threading.Lock()
+
+    def __init__(self, fast_render: bool = True):
         self.template_dir = os.path.join(os.path.dirname(__file__), "..", "document_templates")
+        # Renderizado por sustitución sobre el document.xml precompilado (mismo resultado que python-docx)
+        self.fast_render = fast_render
 
     # -----------------------------
     # Util
@@ -32,6 +51,19 @@ class DocumentProcessor:
             raise ValueError(f"Tipo de carta no reconocido: {letter_type}")
         return os.path.join(self.template_dir, file_name)
 
+    def _template_version(self, template_path: str) -> str:
+        """Versión de la plantilla = hash de sus bytes (cambia si alguien edita el .docx)."""
+        stat = os.stat(template_path)
+        key = (os.path.abspath(template_path), stat.st_mtime_ns, stat.st_size)
+        with self._template_versions_lock:
+            version = self._template_versions.get(key)
+        if version is None:
+            with open(template_path, "rb") as f:
+                version = hashlib.sha256(f.read()).hexdigest()
+            with self._template_versions_lock:
+                self._template_versions[key] = version
+        return version
+
     def _fmt_fecha(self, fecha: datetime) -> tuple[str, str, int]:
         """Devuelve (día, mes_en_español, año)"""
         return str(fecha.day), SPANISH_MONTHS[fecha.month], fecha.year
@@ -113,10 +145,64 @@ class DocumentProcessor:
                         else:
                             cell.add_paragraph(new_text)
 
+    def _resolve_recipient(self, project: dict) -> str:
+        """Lógica jerárquica para determinar el correo de contacto."""
+        direccion = (
+            project.get("legalRepresentativeEmail")
+            or project.get("beneficiaryEmail")
+            or project.get("directorEmail")
+            or "SIN CORREO REGISTRADO"
+        )
+        return direccion.strip() if isinstance(direccion, str) else "SIN CORREO REGISTRADO"
+
     # -----------------------------
     # Público
     # -----------------------------
-    def generate_letter(self, data: dict, report_type: str, report_date: str | None, letter_type: str) -> str:
+    @profiled("render_letter")
+    def render_letter(self, data: dict, report_type: str, report_date: str | None, letter_type: str):
+        """
+        Construye la carta en memoria (sin guardarla).
+        Retorna (carta, info): carta es un Document de python-docx o, con fast_render,
+        un RenderedLetter; ambos se guardan con carta.save(ruta_o_stream).
+        info resume proyecto, informe y destinatario.
+        """
+        replacements, info = self._build_replacements(data, report_type, report_date, letter_type)
+        return self._render(letter_type, replacements), info
+
+    def _render(self, letter_type: str, replacements: dict):
+        with memory_stage("render"):
+            if self.fast_render:
+                letter = self._render_fast(letter_type, replacements)
+                if letter is not None:
+                    return letter
+            doc = Document(self._get_template_path(letter_type))
+            self._replace_everywhere(doc, replacements)
+            return doc
+
+    def _render_fast(self, letter_type: str, replacements: dict):
+        """
+        Sustituye los valores en la plantilla compilada. Retorna None (se usa python-docx)
+        si algún valor contiene otro marcador, ya que el reemplazo secuencial lo alteraría,
+        o si tiene caracteres no válidos en XML.
+        """
+        values = [str(v) for v in replacements.values()]
+        if not renderable(values) or any(key in value for value in values for key in replacements):
+            return None
+
+        template_path = self._get_template_path(letter_type)
+        key = (os.path.abspath(template_path), os.path.getmtime(template_path), tuple(replacements))
+        template = compiled_template(key, lambda: self._compile_document(template_path, replacements))
+        if template is None:
+            return None
+        return RenderedLetter(template, template.render(values))
+
+    def _compile_document(self, template_path: str, replacements: dict) -> Document:
+        """Plantilla con cada marcador reemplazado por su ranura, vía el mismo reemplazo robusto."""
+        doc = Document(template_path)
+        self._replace_everywhere(doc, {key: slot(i) for i, key in enumerate(replacements)})
+        return doc
+
+    def _build_replacements(self, data: dict, report_type: str, report_date: str | None, letter_type: str):
         # 1) Selección de informe
         reports = data.get("reports", [])
         print("🔍 report_type recibido:", report_type)
@@ -143,9 +229,8 @@ class DocumentProcessor:
             detalle_fecha = f" con fecha {report_date}" if report_date else ""
             raise ValueError(f"No se encontró el informe '{report_type}'{detalle_fecha} en los datos del proyecto.")
 
-        # 2) Carga de plantilla
+        # 2) Validación del tipo de carta
         template_path = self._get_template_path(letter_type)
-        doc = Document(template_path)
 
         # 3) Datos
         project = data["projectinfo"]
@@ -158,13 +243,7 @@ class DocumentProcessor:
         dia_res, mes_res, anio_res = self._fmt_fecha(fecha_resol)
 
         # 🔍 Lógica jerárquica para determinar el correo de contacto
-        direccion = (
-            project.get("legalRepresentativeEmail")
-            or project.get("beneficiaryEmail")
-            or project.get("directorEmail")
-            or "SIN CORREO REGISTRADO"
-        )
-        direccion = direccion.strip() if isinstance(direccion, str) else "SIN CORREO REGISTRADO"
+        direccion = self._resolve_recipient(project)
 
         # 4) Replacements
         tipo_informe = self._build_tipo_informe(reports, report)
@@ -197,11 +276,81 @@ class DocumentProcessor:
             "[EJECUTIVO TÉCNICO]": project.get("technicalExecutiveName", "").strip()
         }
 
-        # 5) Reemplazo robusto
-        self._replace_everywhere(doc, replacements)
+        info = {
+            "projectCode": project["projectCode"],
+            "letterType": letter_type,
+            "reportType": tipo_informe,
+            "scheduledDeliveryDate": report["scheduledDeliveryDate"],
+            "recipient": direccion,
+            # Mismas entradas (plantilla + valores) → mismo documento → misma ruta de salida
+            "letterId": letter_identity(project["projectCode"], letter_type, tipo_informe,
+                                        report["scheduledDeliveryDate"]),
+            "contentHash": letter_content_hash(self._template_version(template_path), replacements)
+        }
+        return replacements, info
+
+    @profiled("generate_letter")
+    def generate_letter(self, data: dict, report_type: str, report_date: str | None, letter_type: str, output=None):
+        """
+        Genera la carta. Sin 'output' se guarda en Descargas (ver save_letter) y se
+        retorna la ruta; con 'output' (BytesIO o cualquier stream binario) se escribe
+        ahí sin tocar disco y se retorna el mismo stream.
+        """
+        if output is None:
+            output_path, _, _ = self.save_letter(data, report_type, report_date, letter_type)
+            return output_path
+
+        doc, info = self.render_letter(data, report_type, report_date, letter_type)
 
         # 6) Exportación
-        output_path = generate_download_path(project["projectCode"], letter_type)
-        doc.save(output_path)
+        with memory_stage("save"):
+            doc.save(output)
+        return output
+
+    def save_letter(
+        self,
+        data: dict,
+        report_type: str,
+        report_date: str | None,
+        letter_type: str,
+        output_dir: str | None = None
+    ) -> tuple[str, dict, bool]:
+        """
+        Guarda la carta con nombre direccionado por contenido (ver content_addressed_path).
+        - Si ya existe un archivo con las mismas entradas se retorna sin renderizar.
+        - La escritura es atómica (temporal único + os.replace): seguro con varios workers.
+        - Al guardar una versión nueva se eliminan las anteriores de la misma carta.
+        Retorna (ruta, info, reutilizada).
+        """
+        replacements, info = self._build_replacements(data, report_type, report_date, letter_type)
+        output_path = content_addressed_path(
+            info["projectCode"], letter_type, info["letterId"], info["contentHash"], output_dir
+        )
+        if os.path.exists(output_path):
+            print(f"♻️ Carta sin cambios, se reutiliza: {output_path}")
+            return output_path, info, True
+
+        letter = self._render(letter_type, replacements)
+        with memory_stage("save"):
+            write_file_atomically(output_path, letter.save)
+        remove_superseded_letters(output_path)
         print(f"✅ Carta generada exitosamente: {output_path}")
-        return output_path
+        return output_path, info, False
+
+    def generate_letter_bytes(self, data: dict, report_type: str, report_date: str | None, letter_type: str) -> bytes:
+        """Genera la carta completamente en memoria y retorna los bytes del .docx."""
+        buffer = BytesIO()
+        self.generate_letter(data, report_type, report_date, letter_type, output=buffer)
+        return buffer.getvalue()
+
+    @profiled("validate_letters")
+    def validate_letters(self, data_by_code: dict, report_type: str, report_date: str | None, letter_type: str) -> dict:
+        """
+        Validación previa de un lote completo, sin abrir plantillas (ver letter_preflight).
+        Retorna código → lista de errores solo para los proyectos cuya carta fallaría.
+        """
+        try:
+            self._get_template_path(letter_type)
+        except ValueError as e:
+            return {code: [str(e)] for code in data_by_code}
+        return validate_letters(data_by_code, report_type, report_date)
@@ -0,0 +1,222 @@
+import re
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from io import BytesIO
+from xml.sax.saxutils import escape, unescape
+
+"""
+architecture/document_processing/fast_docx_renderer.py
+Renderizado rápido de .docx sin el modelo de objetos de python-docx por carta.
+Cada plantilla se compila una sola vez: se arma el documento con python-docx usando
+marcadores de posición como valores, se guarda y su word/document.xml queda como
+una plantilla de texto con ranuras. Renderizar es sustituir texto (con escape XML)
+y escribir el ZIP copiando byte a byte las demás partes, ya serializadas y comprimidas
+(solo document.xml se comprime en cada carta).
+
+El resultado es el mismo que produciría python-docx con los valores reales: los
+<w:t> con ranuras se regeneran con las mismas reglas que usa python-docx al asignar
+run.text (xml:space="preserve", tabulaciones y saltos de línea).
+"""
+
+DOCUMENT_PART = "word/document.xml"
+
+# Marcadores de uso privado: no aparecen en las plantillas ni los toca python-docx
+_SLOT_START = "\ue000"
+_SLOT_END = "\ue001"
+_SLOT_RE = re.compile(f"{_SLOT_START}(\\d+){_SLOT_END}")
+_TEXT_RE = re.compile(r'<w:t(?: xml:space="preserve")?>([^<]*)</w:t>')
+_SPECIAL_RE = re.compile(r"([\t\r\n])")
+_EMPTY_RUN_RE = re.compile(r"(<w:r(?: [^>]*)?)></w:r>")
+# Caracteres que lxml rechaza en texto XML (python-docx lanza ValueError con ellos)
+_INVALID_XML_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+# Estructuras ZIP (APPNOTE): cabecera local, entrada del directorio central y fin de directorio
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+_END_RECORD = struct.Struct("<4s4H2LH")
+_ZIP_VERSION = 20
+_EXTERNAL_ATTR = 0o600 << 16
+
+
+def slot(index: int) -> str:
+    """Marcador de la ranura 'index' para construir el documento de compilación."""
+    return f"{_SLOT_START}{index}{_SLOT_END}"
+
+
+def renderable(values) -> bool:
+    """True si todos los valores pueden ir por el camino rápido (texto XML válido)."""
+    return not any(_INVALID_XML_RE.search(value) for value in values)
+
+
+def _run_content(text: str) -> str:
+    """Contenido de un run para 'text', igual que _RunContentAppender de python-docx."""
+    parts = []
+    for piece in _SPECIAL_RE.split(text):
+        if not piece:
+            continue
+        if piece == "\t":
+            parts.append("<w:tab/>")
+        elif piece in "\r\n":
+            parts.append("<w:br/>")
+        elif len(piece.strip()) < len(piece):
+            parts.append(f'<w:t xml:space="preserve">{escape(piece)}</w:t>')
+        else:
+            parts.append(f"<w:t>{escape(piece)}</w:t>")
+    return "".join(parts)
+
+
+def _deflate(data: bytes) -> bytes:
+    # Mismos parámetros que zipfile con ZIP_DEFLATED
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+class _ZipMember:
+    """Parte del paquete ya comprimida, lista para copiarse tal cual al ZIP."""
+
+    def __init__(self, name: str, data: bytes):
+        self.name = name.encode("ascii")
+        self.crc = zlib.crc32(data)
+        self.size = len(data)
+        self.compressed = _deflate(data)
+
+
+def _dos_timestamp() -> tuple[int, int]:
+    # Hora local actual, igual que zipfile.writestr con un nombre de parte
+    t = time.localtime(time.time())
+    return (t[3] << 11) | (t[4] << 5) | (t[5] // 2), ((t[0] - 1980) << 9) | (t[1] << 5) | t[2]
+
+
+def _write_zip(stream, members: list):
+    """Escribe un ZIP secuencial (sin seek) con miembros ya comprimidos."""
+    dos_time, dos_date = _dos_timestamp()
+    offset = 0
+    central = []
+    for member in members:
+        header = _LOCAL_HEADER.pack(
+            b"PK\x03\x04", _ZIP_VERSION, 0, 0, zipfile.ZIP_DEFLATED, dos_time, dos_date,
+            member.crc, len(member.compressed), member.size, len(member.name), 0
+        )
+        stream.write(header)
+        stream.write(member.name)
+        stream.write(member.compressed)
+        central.append(_CENTRAL_HEADER.pack(
+            b"PK\x01\x02", _ZIP_VERSION, 0, _ZIP_VERSION, 0, 0, zipfile.ZIP_DEFLATED, dos_time, dos_date,
+            member.crc, len(member.compressed), member.size, len(member.name), 0, 0, 0, 0,
+            _EXTERNAL_ATTR, offset
+        ) + member.name)
+        offset += len(header) + len(member.name) + len(member.compressed)
+
+    directory = b"".join(central)
+    stream.write(directory)
+    stream.write(_END_RECORD.pack(b"PK\x05\x06", 0, 0, len(central), len(central), len(directory), offset, 0))
+
+
+class CompiledDocx:
+    """Plantilla compilada: partes del paquete + document.xml dividido en ranuras."""
+
+    def __init__(self, members: list, segments: list):
+        # members: [(nombre, bytes)] en el orden en que python-docx los escribe;
+        # las partes fijas se comprimen una sola vez aquí
+        self.members = [
+            name if name == DOCUMENT_PART else _ZipMember(name, data)
+            for name, data in members
+        ]
+        # segments: texto XML fijo (str) o texto de run con ranuras (tupla str/int alternados)
+        self.segments = segments
+
+    @classmethod
+    def from_document(cls, doc) -> "CompiledDocx":
+        """Compila un Document de python-docx cuyos valores variables son marcadores slot(i)."""
+        buffer = BytesIO()
+        doc.save(buffer)
+        with zipfile.ZipFile(buffer) as package:
+            members = [(info.filename, package.read(info)) for info in package.infolist()]
+
+        xml = dict(members)[DOCUMENT_PART].decode("utf-8")
+        segments = []
+        position = 0
+        for match in _TEXT_RE.finditer(xml):
+            if _SLOT_START not in match.group(1):
+                continue
+            segments.append(xml[position:match.start()])
+            pieces = _SLOT_RE.split(unescape(match.group(1)))
+            segments.append(tuple(int(p) if i % 2 else p for i, p in enumerate(pieces)))
+            position = match.end()
+        segments.append(xml[position:])
+
+        static = "".join(s for s in segments if isinstance(s, str))
+        if _SLOT_START in static or _SLOT_END in static:
+            raise ValueError("La plantilla tiene marcadores fuera del texto de un run.")
+        return cls(members, segments)
+
+    def render(self, values: list) -> bytes:
+        """document.xml con las ranuras reemplazadas por 'values' (textos)."""
+        output = []
+        emptied = False
+        for segment in self.segments:
+            if type(segment) is str:
+                output.append(segment)
+                continue
+            content = _run_content("".join(values[p] if type(p) is int else p for p in segment))
+            emptied = emptied or not content
+            output.append(content)
+        xml = "".join(output)
+        if emptied:
+            # lxml serializa como <w:r/> un run que quedó sin hijos
+            xml = _EMPTY_RUN_RE.sub(r"\1/>", xml)
+        return xml.encode("utf-8")
+
+    def save(self, target, document_xml: bytes):
+        """Escribe el .docx en 'target' (ruta o stream binario) con las mismas partes que python-docx."""
+        document = _ZipMember(DOCUMENT_PART, document_xml)
+        members = [document if m == DOCUMENT_PART else m for m in self.members]
+        if isinstance(target, (str, bytes)) or hasattr(target, "__fspath__"):
+            with open(target, "wb") as stream:
+                _write_zip(stream, members)
+        else:
+            _write_zip(target, members)
+
+
+class RenderedLetter:
+    """Carta renderizada por el camino rápido; se guarda igual que un Document (save)."""
+
+    def __init__(self, template: CompiledDocx, document_xml: bytes):
+        self.template = template
+        self.document_xml = document_xml
+
+    def save(self, target):
+        self.template.save(target, self.document_xml)
+
+
+# ─────────────────────────────────────────────
+# 🔹 CACHÉ DE PLANTILLAS COMPILADAS
+# ─────────────────────────────────────────────
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def compiled_template(key, build):
+    """
+    Plantilla compilada para 'key' (hashable; p. ej. ruta + fecha de modificación).
+    'build' arma el Document con marcadores; se llama una sola vez por clave.
+    Retorna None si la plantilla no se puede compilar (se usa python-docx).
+    """
+    with _compiled_lock:
+        if key in _compiled:
+            return _compiled[key]
+    try:
+        template = CompiledDocx.from_document(build())
+    except Exception as e:
+        print(f"⚠️ Plantilla sin renderizado rápido ({e}); se usará python-docx.")
+        template = None
+    with _compiled_lock:
+        return _compiled.setdefault(key, template)
+
+
+def clear_compiled_templates():
+    with _compiled_lock:
+        _compiled.clear()
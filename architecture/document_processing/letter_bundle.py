@@ -0,0 +1,95 @@
+import csv
+import io
+import zipfile
+from datetime import datetime
+from architecture.document_processing.document_processor import DocumentProcessor
+from architecture.utils.path_utils import build_letter_file_name
+
+"""
+architecture/document_processing/letter_bundle.py
+Empaqueta muchas cartas en un único ZIP escribiendo cada .docx directamente
+dentro del archivo comprimido (sin archivos intermedios en disco) y agrega
+un manifiesto CSV al cerrar. Evita que OneDrive sincronice cada carta por separado.
+"""
+
+MANIFEST_NAME = "manifiesto.csv"
+MANIFEST_COLUMNS = [
+    "archivo",
+    "codigo",
+    "tipo_carta",
+    "informe",
+    "fecha_informe",
+    "destinatario",
+    "generado"
+]
+
+
+class LetterBundleWriter:
+    """Escritor de ZIP con cartas + manifiesto. Úsese como context manager."""
+
+    def __init__(self, target, processor: DocumentProcessor | None = None):
+        """
+        target: ruta del .zip o stream binario (p. ej. BytesIO o respuesta HTTP).
+        """
+        self.processor = processor or DocumentProcessor()
+        self._zip = zipfile.ZipFile(target, mode="w", compression=zipfile.ZIP_DEFLATED)
+        self._manifest = []
+        self._names = set()
+
+    def _unique_name(self, file_name: str) -> str:
+        if file_name not in self._names:
+            self._names.add(file_name)
+            return file_name
+        stem = file_name[:-len(".docx")]
+        i = 2
+        while f"{stem}_{i}.docx" in self._names:
+            i += 1
+        unique = f"{stem}_{i}.docx"
+        self._names.add(unique)
+        return unique
+
+    # ─────────────────────────────────────────────
+    # 🔹 API
+    # ─────────────────────────────────────────────
+    def add_letter(self, data: dict, report_type: str, report_date: str | None, letter_type: str) -> str:
+        """Renderiza la carta y la escribe directamente como entrada del ZIP. Retorna su nombre."""
+        doc, info = self.processor.render_letter(data, report_type, report_date, letter_type)
+        arcname = self._unique_name(build_letter_file_name(info["projectCode"], letter_type))
+
+        # ZipInfo usa ZIP_STORED por defecto e ignora la compresión del ZipFile:
+        # se indica explícitamente para que la entrada quede comprimida
+        zinfo = zipfile.ZipInfo(arcname, date_time=datetime.now().timetuple()[:6])
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        with self._zip.open(zinfo, "w") as entry:
+            doc.save(entry)
+
+        self._manifest.append({
+            "archivo": arcname,
+            "codigo": info["projectCode"],
+            "tipo_carta": letter_type,
+            "informe": info["reportType"],
+            "fecha_informe": info["scheduledDeliveryDate"],
+            "destinatario": info["recipient"],
+            "generado": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        })
+        print(f"📦 Carta agregada al paquete: {arcname}")
+        return arcname
+
+    def close(self):
+        """Escribe el manifiesto CSV y cierra el ZIP."""
+        if self._zip is None:
+            return
+        with self._zip.open(MANIFEST_NAME, "w") as entry:
+            # utf-8-sig para que Excel abra correctamente tildes y eñes
+            with io.TextIOWrapper(entry, encoding="utf-8-sig", newline="") as text:
+                writer = csv.DictWriter(text, fieldnames=MANIFEST_COLUMNS, delimiter=";")
+                writer.writeheader()
+                writer.writerows(self._manifest)
+        self._zip.close()
+        self._zip = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,172 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+"""
+architecture/document_processing/letter_preflight.py
+Validación previa (pre-flight) de los datos integrados de todo un lote antes de
+abrir cualquier plantilla. Revisa en una pasada por columna (un DataFrame con los
+projectinfo y otro con todos los informes) los mismos campos que usa
+DocumentProcessor al armar los reemplazos, y retorna los errores por proyecto.
+Así un lote solo renderiza las cartas que pueden terminar bien.
+"""
+
+DATE_FORMAT = "%d/%m/%Y"
+
+# Campos de texto obligatorios: el renderizado hace project[campo].strip()
+REQUIRED_TEXT_FIELDS = {
+    "projectCode": "código del proyecto",
+    "projectName": "nombre del proyecto",
+    "beneficiaryName": "nombre de la beneficiaria",
+    "legalRepresentative": "representante legal"
+}
+# Campos opcionales: project.get(campo, "").strip() falla si existen pero no son texto
+OPTIONAL_TEXT_FIELDS = {
+    "subdirector": "subdirector",
+    "subdirection": "subdirección",
+    "technicalExecutiveName": "ejecutivo técnico"
+}
+
+
+def _is_text(column: pd.Series) -> pd.Series:
+    return column.map(lambda v: isinstance(v, str)).astype(bool)
+
+
+def _column(frame: pd.DataFrame, key: str) -> pd.Series:
+    if key in frame.columns:
+        return frame[key]
+    return pd.Series([None] * len(frame), index=frame.index, dtype=object)
+
+
+def _strptime_ok(value) -> bool:
+    try:
+        datetime.strptime(value, DATE_FORMAT)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _valid_dates(column: pd.Series) -> pd.Series:
+    """
+    Equivale a datetime.strptime(valor, '%d/%m/%Y') sin error, por columna.
+    Las celdas que pd.to_datetime rechaza se confirman con strptime (mismo criterio exacto).
+    """
+    is_text = _is_text(column)
+    valid = pd.Series(False, index=column.index)
+    if is_text.any():
+        parsed = pd.to_datetime(column[is_text], format=DATE_FORMAT, errors="coerce")
+        valid[is_text] = parsed.notna()
+    doubtful = is_text & ~valid
+    if doubtful.any():
+        valid[doubtful] = [_strptime_ok(v) for v in column[doubtful].tolist()]
+    return valid
+
+
+def _int_ok(value) -> bool:
+    try:
+        int(value)
+        return True
+    except (TypeError, ValueError, OverflowError):
+        return False
+
+
+def _valid_integers(column: pd.Series) -> pd.Series:
+    """Equivale a int(valor) sin error: números finitos directo, el resto celda a celda."""
+    kinds = column.map(type)
+    numeric = kinds.isin([int, float, bool, np.int64, np.float64])
+    valid = pd.Series(False, index=column.index)
+    if numeric.any():
+        values = pd.to_numeric(column[numeric].astype(float), errors="coerce")
+        valid[numeric] = np.isfinite(values.to_numpy(dtype=float))
+    others = ~numeric & column.notna()
+    if others.any():
+        valid[others] = [_int_ok(v) for v in column[others].tolist()]
+    return valid
+
+
+def _add_errors(errors: dict, codes: list, mask: pd.Series, message: str):
+    for position in np.flatnonzero(mask.to_numpy()):
+        errors.setdefault(codes[position], []).append(message)
+
+
+# ─────────────────────────────────────────────
+# 🔹 VALIDACIÓN DEL LOTE
+# ─────────────────────────────────────────────
+def validate_letters(data_by_code: dict, report_type: str, report_date: str | None) -> dict:
+    """
+    Revisa todos los proyectos del lote de una vez.
+    data_by_code: código → datos integrados (forma de IntegrationDataManager.integrate).
+    Retorna código → lista de errores, solo para los proyectos que fallarían al renderizar.
+    """
+    codes = list(data_by_code)
+    if not codes:
+        return {}
+    errors = {}
+
+    infos = []
+    for data in data_by_code.values():
+        info = data.get("projectinfo") if isinstance(data, dict) else None
+        infos.append(info if isinstance(info, dict) else None)
+    has_info = pd.Series([info is not None for info in infos])
+    _add_errors(errors, codes, ~has_info, "sin datos del proyecto (projectinfo)")
+
+    # 1️⃣ Campos del proyecto, una columna a la vez
+    frame = pd.DataFrame([info or {} for info in infos], index=range(len(codes)), dtype=object)
+    for key, label in REQUIRED_TEXT_FIELDS.items():
+        _add_errors(errors, codes, has_info & ~_is_text(_column(frame, key)), f"falta {label} o no es texto")
+    for key, label in OPTIONAL_TEXT_FIELDS.items():
+        present = pd.Series([info is not None and key in info for info in infos])
+        _add_errors(errors, codes, present & ~_is_text(_column(frame, key)), f"{label} no es texto")
+
+    _add_errors(errors, codes, has_info & ~_valid_dates(_column(frame, "resolutionDate")),
+                "fecha de resolución ausente o con formato distinto de dd/mm/aaaa")
+    _add_errors(errors, codes, has_info & ~_valid_integers(_column(frame, "resolutionNumber")),
+                "número de resolución ausente o no numérico")
+
+    # 2️⃣ Informes: un DataFrame con todos los informes del lote
+    records = []
+    for position, data in enumerate(data_by_code.values()):
+        reports = data.get("reports", []) if isinstance(data, dict) else []
+        for index, report in enumerate(reports or []):
+            if isinstance(report, dict):
+                records.append((position, index, True, report.get("reportType", ""), report.get("scheduledDeliveryDate")))
+            else:
+                records.append((position, index, False, None, None))
+    reports = pd.DataFrame(records, columns=["position", "index", "isDict", "reportType", "scheduledDeliveryDate"])
+    reports = reports.astype({"reportType": object, "scheduledDeliveryDate": object})
+
+    type_is_text = _is_text(reports["reportType"])
+    matches = type_is_text & reports["reportType"].where(type_is_text, "").str.strip().str.upper().eq(
+        report_type.strip().upper()
+    )
+    if report_date:
+        # Misma comparación que el renderizado: str(fecha).strip()
+        dates_text = reports["scheduledDeliveryDate"].map(str).str.strip()
+        matches &= dates_text.eq(str(report_date).strip())
+
+    first_match = reports[matches].groupby("position")["index"].min()
+    # El renderizado recorre los informes en orden: uno sin tipo de texto antes del elegido lo hace fallar
+    first_bad = reports[~type_is_text].groupby("position")["index"].min()
+
+    all_positions = pd.Series(range(len(codes)))
+    detalle_fecha = f" con fecha {report_date}" if report_date else ""
+    found = all_positions.isin(first_match.index)
+    _add_errors(errors, codes, has_info & ~found,
+                f"no se encontró el informe '{report_type}'{detalle_fecha}")
+
+    blocked = pd.Series(False, index=all_positions.index)
+    bad_before = first_bad.reindex(first_match.index).lt(first_match)
+    blocked[bad_before[bad_before].index] = True
+    # La numeración del tipo de informe recorre todos los informes: cualquiera que no sea dict falla
+    not_dicts = all_positions.isin(reports.loc[~reports["isDict"].astype(bool), "position"])
+    blocked |= found & not_dicts
+    _add_errors(errors, codes, has_info & blocked, "hay informes sin tipo o mal formados en los datos del proyecto")
+
+    selected = reports.set_index(["position", "index"]).loc[list(zip(first_match.index, first_match))]
+    selected_dates = pd.Series(selected["scheduledDeliveryDate"].to_numpy(), index=first_match.index, dtype=object)
+    invalid_delivery = pd.Series(False, index=all_positions.index)
+    bad_dates = ~_valid_dates(selected_dates)
+    invalid_delivery[bad_dates[bad_dates].index] = True
+    _add_errors(errors, codes, has_info & invalid_delivery & ~blocked,
+                "fecha de entrega del informe ausente o con formato distinto de dd/mm/aaaa")
+    return errors
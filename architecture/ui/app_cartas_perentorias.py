@@ -1,6 +1,16 @@
+import os
 import customtkinter as ctk
-from tkinter import StringVar, messagebox
+from tkinter import BooleanVar, Listbox, Menu, StringVar, filedialog, messagebox
 from core.logic import obtener_datos_proyecto
+from architecture.data_access.errors import ExcelFileNotFoundError
+from architecture.data_access.excel_data_manager import ExcelDataManager
+from architecture.data_access.excel_watcher import ExcelFileWatcher
+from architecture.data_access.project_code_index import ProjectCodeIndex
+from architecture.ui.portfolio_window import PortfolioWindow
+from architecture.utils.path_utils import EXCEL_FILE_NAME, PathUtils, get_excel_path_resolver
+from architecture.utils.profiling import enable_profiling, disable_profiling
+from architecture.utils.stall_detector import MainLoopStallDetector
+from core.work_scheduler import get_scheduler, INTERACTIVE
 
 # Configuración del tema general
 ctk.set_appearance_mode("dark")
@@ -21,6 +31,10 @@ class CartaPerentoriaApp(ctk.CTk):
                             font=ctk.CTkFont(size=20, weight="bold"), text_color="white")
         title.pack(pady=(20, 10))
 
+        # Menú de depuración (perfilado opcional)
+        self.profiling_var = BooleanVar(value=False)
+        self._build_debug_menu()
+
         # ─────────────────────────────────────────────
         # Sección de búsqueda
         # ─────────────────────────────────────────────
@@ -32,6 +46,20 @@ class CartaPerentoriaApp(ctk.CTk):
         self.codigo_entry.grid(row=0, column=1, padx=10, pady=10)
         ctk.CTkButton(search_frame, text="Buscar", command=self.buscar_proyecto).grid(row=0, column=2, padx=10, pady=10)
 
+        # Autocompletado: lista flotante bajo el campo de código
+        self.code_index = None
+        self._sugerencias = []
+        self.suggestions_list = Listbox(self, height=6, activestyle="none", exportselection=False,
+                                        bg="#2B2B2B", fg="white", selectbackground="#1F6AA5",
+                                        highlightthickness=1, highlightcolor="#1F6AA5", borderwidth=0)
+        self.suggestions_list.bind("<ButtonRelease-1>", self._aceptar_sugerencia)
+        self.suggestions_list.bind("<Return>", self._aceptar_sugerencia)
+        self.suggestions_list.bind("<Escape>", self._ocultar_sugerencias)
+        self.codigo_entry.bind("<KeyRelease>", self._actualizar_sugerencias)
+        self.codigo_entry.bind("<Down>", self._enfocar_sugerencias)
+        self.codigo_entry.bind("<Escape>", self._ocultar_sugerencias)
+        self.codigo_entry.bind("<Return>", lambda event: self.buscar_proyecto())
+
         # ─────────────────────────────────────────────
         # Información del proyecto
         # ─────────────────────────────────────────────
@@ -77,6 +105,12 @@ class CartaPerentoriaApp(ctk.CTk):
                                     command=self.generar_documento)
         generate_btn.pack(pady=(20, 10))
 
+        # Vista de cartera (todos los informes pendientes o atrasados)
+        self.portfolio_window = None
+        ctk.CTkButton(self, text="VER CARTERA DE INFORMES PENDIENTES", width=560, height=32,
+                      fg_color="#3F3F3F", hover_color="#221E7C",
+                      command=self.abrir_cartera).pack(pady=(0, 10))
+
         # ─────────────────────────────────────────────
         # Footer
         # ─────────────────────────────────────────────
@@ -84,38 +118,248 @@ class CartaPerentoriaApp(ctk.CTk):
                             font=ctk.CTkFont(size=12, slant="italic"), text_color="#72C7D5")
         footer.pack(pady=(20, 10))
 
+        # Precarga del Excel institucional en segundo plano
+        self.excel_watcher = None
+        self._start_excel_watcher()
+
+        # Watchdog del loop de eventos: registra la pila de cualquier bloqueo de la interfaz
+        self.stall_detector = MainLoopStallDetector(self).start()
+        self.protocol("WM_DELETE_WINDOW", self._cerrar)
+
     # ─────────────────────────────────────────────
-    # Lógica simulada
+    # Precarga del Excel (hilo en segundo plano)
     # ─────────────────────────────────────────────
-    def buscar_proyecto(self):
+    def _start_excel_watcher(self):
+        """
+        Resuelve la ruta del Excel en el hilo principal (si no se encuentra, se le
+        pregunta al usuario) y deja la lectura y las recargas a un hilo en segundo plano.
+        """
+        try:
+            try:
+                excel_manager = ExcelDataManager.shared()
+            except ExcelFileNotFoundError as e:
+                ruta = self._pedir_ruta_excel(e)
+                if not ruta:
+                    raise
+                # La ruta elegida queda en la configuración para los próximos inicios
+                get_excel_path_resolver().remember(ruta)
+                excel_manager = ExcelDataManager.shared()
+        except Exception as e:
+            print(f"⚠️ No se pudo precargar el Excel institucional: {e}")
+            return
+        # El índice de códigos se suscribe antes de la carga inicial del watcher
+        self.code_index = ProjectCodeIndex.attach(excel_manager)
+        self.excel_watcher = ExcelFileWatcher(excel_manager).start()
+
+    def _pedir_ruta_excel(self, error: ExcelFileNotFoundError) -> str | None:
+        """Diálogos para ubicar el Excel a mano (la capa de datos solo informa el error)."""
+        if not error.onedrive_found:
+            messagebox.showwarning("Ruta OneDrive no encontrada", "No se encontró la carpeta 'InnovaChile - General'.")
+        else:
+            revisadas = "\n".join(error.searched) or EXCEL_FILE_NAME
+            if not messagebox.askyesno(
+                "Archivo no encontrado",
+                f"No se encontró el archivo {EXCEL_FILE_NAME} en:\n\n{revisadas}\n\n¿Deseas buscarlo manualmente?"
+            ):
+                return None
+        return filedialog.askopenfilename(
+            title=f"Seleccionar archivo {EXCEL_FILE_NAME}",
+            filetypes=[("Excel Files", "*.xlsx *.xls")]
+        ) or None
+
+    # ─────────────────────────────────────────────
+    # Autocompletado de códigos (índice de prefijos en memoria)
+    # ─────────────────────────────────────────────
+    def _actualizar_sugerencias(self, event=None):
+        if event is not None and event.keysym in ("Down", "Up", "Return", "Escape", "Tab"):
+            return
+        if self.code_index is None or not self.code_index.is_loaded():
+            return
+
+        sugerencias = self.code_index.suggest(self.codigo_entry.get())
         codigo = self.codigo_entry.get().strip()
-        if not codigo:
-            messagebox.showwarning("Atención", "Ingrese un código de proyecto.")
+        # Si lo escrito ya es exactamente la única sugerencia, no hace falta la lista
+        if not sugerencias or (len(sugerencias) == 1 and sugerencias[0][0].upper() == codigo.upper()):
+            self._ocultar_sugerencias()
             return
 
-        # Aquí llamas a tu lógica real (SOAP o JSON)
-        # Ejemplo de integración:
-        from core.logic import obtener_datos_proyecto  # <-- debes tener esta función en tu capa lógica
+        self._sugerencias = sugerencias
+        self.suggestions_list.delete(0, "end")
+        for code, name in sugerencias:
+            self.suggestions_list.insert("end", f"{code}  —  {name}" if name else code)
+        self.suggestions_list.configure(height=len(sugerencias))
+
+        x = self.codigo_entry.winfo_rootx() - self.winfo_rootx()
+        y = self.codigo_entry.winfo_rooty() - self.winfo_rooty() + self.codigo_entry.winfo_height()
+        self.suggestions_list.place(x=x, y=y, width=420)
+        self.suggestions_list.lift()
+
+    def _enfocar_sugerencias(self, event=None):
+        if self.suggestions_list.winfo_ismapped():
+            self.suggestions_list.focus_set()
+            self.suggestions_list.selection_clear(0, "end")
+            self.suggestions_list.selection_set(0)
+            self.suggestions_list.activate(0)
+
+    def _aceptar_sugerencia(self, event=None):
+        seleccion = self.suggestions_list.curselection()
+        if not seleccion:
+            return
+        codigo = self._sugerencias[seleccion[0]][0]
+        self.codigo_entry.delete(0, "end")
+        self.codigo_entry.insert(0, codigo)
+        self._ocultar_sugerencias()
+        self.codigo_entry.focus_set()
+
+    def _ocultar_sugerencias(self, event=None):
+        self.suggestions_list.place_forget()
+
+    def _validar_codigo(self, codigo: str):
+        """
+        Valida el código contra el índice antes de cualquier llamada de red.
+        Retorna el código tal como figura en el Excel, o None (con aviso) si no existe.
+        Si el índice aún no terminó de cargar, se deja pasar el código sin validar.
+        """
+        if self.code_index is None or not self.code_index.is_loaded():
+            return codigo
+        canonico = self.code_index.canonical_code(codigo)
+        if canonico is None:
+            messagebox.showwarning("Código no encontrado",
+                                   f"El código '{codigo}' no existe en la base de proyectos.")
+            return None
+        if canonico != codigo:
+            self.codigo_entry.delete(0, "end")
+            self.codigo_entry.insert(0, canonico)
+        return canonico
+
+    # ─────────────────────────────────────────────
+    # Menú Depuración: perfilado de la sesión
+    # ─────────────────────────────────────────────
+    def _build_debug_menu(self):
+        menubar = Menu(self)
+        debug_menu = Menu(menubar, tearoff=0)
+        debug_menu.add_checkbutton(label="Perfilar operaciones", variable=self.profiling_var,
+                                   command=self._toggle_profiling)
+        debug_menu.add_command(label="Bloqueos de la interfaz", command=self._mostrar_bloqueos)
+        menubar.add_cascade(label="Depuración", menu=debug_menu)
+        self.configure(menu=menubar)
+
+    def _toggle_profiling(self):
+        """Al activar, perfila búsquedas y generación; al desactivar, escribe los archivos."""
+        if self.profiling_var.get():
+            enable_profiling(label="gui")
+            return
 
+        profiler = disable_profiling()
+        if profiler is None:
+            return
+        output_dir = os.path.join(PathUtils.get_downloads_folder(), "perfiles_cartas")
         try:
-            project_info = obtener_datos_proyecto(codigo)
-
-            # Rellenar campos de texto
-            self.nombre_proyecto_var.set(project_info.get("nombreProyecto", ""))
-            self.beneficiario_var.set(project_info.get("beneficiario", ""))
-            self.responsable_var.set(project_info.get("representanteLegal", ""))
-
-            # Limpiar y actualizar informes disponibles
-            informes_disponibles = project_info.get("informesDisponibles", [])
-            if informes_disponibles:
-                self.informe_combo.configure(values=informes_disponibles)
-                self.informe_combo.set(informes_disponibles[0])
-            else:
-                self.informe_combo.configure(values=["No hay informes disponibles"])
-                self.informe_combo.set("No hay informes disponibles")
+            paths = profiler.write(output_dir)
+        except OSError as e:
+            messagebox.showerror("Error", f"No se pudo escribir el perfil.\n\n{e}")
+            return
+        messagebox.showinfo("Perfil", "Perfil escrito en:\n" + "\n".join(paths.values()))
+
+    def _mostrar_bloqueos(self):
+        """Resumen de bloqueos del loop de eventos en lo que va de la sesión."""
+        resumen = self.stall_detector.summary()
+        sitios = "\n".join(
+            f"• {site} — {entry['count']}×, máx. {entry['maxSeconds']:.2f} s"
+            for site, entry in list(resumen["sites"].items())[:5]
+        )
+        messagebox.showinfo(
+            "Bloqueos de la interfaz",
+            f"Bloqueos de más de {resumen['thresholdSeconds']:.1f} s: {resumen['stalls']} "
+            f"(total {resumen['totalStallSeconds']:.2f} s, máx. {resumen['maxStallSeconds']:.2f} s)"
+            + (f"\n\n{sitios}" if sitios else "")
+        )
+
+    def _cerrar(self):
+        """Al cerrar, deja el resumen de bloqueos de la sesión (y el detalle si hubo alguno)."""
+        self.stall_detector.stop()
+        resumen = self.stall_detector.summary()
+        print(f"🐢 Bloqueos de la GUI en la sesión: {resumen['stalls']} "
+              f"(total {resumen['totalStallSeconds']:.2f} s, máx. {resumen['maxStallSeconds']:.2f} s)")
+        if resumen["stalls"]:
+            try:
+                path = self.stall_detector.write(os.path.join(PathUtils.get_downloads_folder(), "perfiles_cartas"))
+                print(f"📝 Detalle de bloqueos: {path}")
+            except OSError as e:
+                print(f"⚠️ No se pudo escribir el detalle de bloqueos: {e}")
+        self.destroy()
 
+    # ─────────────────────────────────────────────
+    # Cartera de informes pendientes
+    # ─────────────────────────────────────────────
+    def abrir_cartera(self):
+        """Abre (o trae al frente) la ventana de cartera; una sola instancia a la vez."""
+        if self.portfolio_window is not None and self.portfolio_window.winfo_exists():
+            self.portfolio_window.focus()
+            return
+        self.portfolio_window = PortfolioWindow(self)
+
+    # ─────────────────────────────────────────────
+    # Ejecución en segundo plano (planificador compartido)
+    # ─────────────────────────────────────────────
+    def _esperar_resultado(self, future, on_success, on_error):
+        """Revisa el Future con after() para no bloquear el loop de Tk."""
+        if not future.done():
+            self.after(50, self._esperar_resultado, future, on_success, on_error)
+            return
+        try:
+            result = future.result()
         except Exception as e:
-            messagebox.showerror("Error", f"No se pudo obtener información del proyecto.\n\n{e}")
+            on_error(e)
+            return
+        on_success(result)
+
+    # ─────────────────────────────────────────────
+    # Lógica simulada
+    # ─────────────────────────────────────────────
+    def buscar_proyecto(self):
+        codigo = self.codigo_entry.get().strip()
+        if not codigo:
+            messagebox.showwarning("Atención", "Ingrese un código de proyecto.")
+            return
+        self._ocultar_sugerencias()
+        codigo = self._validar_codigo(codigo)
+        if codigo is None:
+            return
+
+        # La consulta (SOAP + Excel) se encola como trabajo interactivo:
+        # pasa delante de cualquier lote en curso
+        future = get_scheduler().submit(self._consultar_proyecto, codigo, priority=INTERACTIVE)
+        self._esperar_resultado(future, self._mostrar_proyecto, self._error_busqueda)
+
+    @staticmethod
+    def _consultar_proyecto(codigo: str) -> tuple[str, dict, bool]:
+        """Corre en el hilo de trabajo: datos integrados y si el código existe en el Excel."""
+        project_info = obtener_datos_proyecto(codigo)
+        return codigo, project_info, ExcelDataManager.shared().find_project(codigo) is not None
+
+    def _mostrar_proyecto(self, resultado: tuple[str, dict, bool]):
+        codigo, project_info, en_excel = resultado
+        if not en_excel:
+            # La capa de datos no muestra diálogos; el aviso se da aquí, en el hilo principal
+            messagebox.showinfo("Proyecto no encontrado", f"No se encontró el código: {codigo}")
+
+        # Rellenar campos de texto
+        self.nombre_proyecto_var.set(project_info.get("nombreProyecto", ""))
+        self.beneficiario_var.set(project_info.get("beneficiario", ""))
+        self.responsable_var.set(project_info.get("representanteLegal", ""))
+
+        # Limpiar y actualizar informes disponibles
+        informes_disponibles = project_info.get("informesDisponibles", [])
+        if informes_disponibles:
+            self.informe_combo.configure(values=informes_disponibles)
+            self.informe_combo.set(informes_disponibles[0])
+        else:
+            self.informe_combo.configure(values=["No hay informes disponibles"])
+            self.informe_combo.set("No hay informes disponibles")
+
+    def _error_busqueda(self, e: Exception):
+        messagebox.showerror("Error", f"No se pudo obtener información del proyecto.\n\n{e}")
 
 
     def _parse_informe_selection(self, selection: str) -> tuple[str, str | None]:
@@ -144,77 +388,99 @@ class CartaPerentoriaApp(ctk.CTk):
                 "No hay informes disponibles para generar el documento."
             )
             return
+        codigo = self._validar_codigo(codigo)
+        if codigo is None:
+            return
+
+        # ─────────────────────────────────────────────
+        # ✅ Detección de tipo de carta (comparación exacta)
+        # ─────────────────────────────────────────────
+        accion_normalizada = accion.lower().strip()
+        if "incumplimiento" in accion_normalizada:
+            tipo_carta = "incumplimiento"
+        elif "perentoria" in accion_normalizada:
+            tipo_carta = "perentoria"
+        else:
+            tipo_carta = "perentoria"  # fallback por defecto
+        # ─────────────────────────────────────────────
 
+        # 🔍 Debug opcional
+        informe, fecha_informe = self._parse_informe_selection(informe_seleccion)
+        print(f"📄 Código proyecto: {codigo}")
+        print(f"🧾 Tipo carta: {tipo_carta}")
+        print(f"📨 Informe seleccionado: {informe} ({fecha_informe or 'SIN FECHA'})")
+
+        future = get_scheduler().submit(
+            self._generar_documento_job, codigo, tipo_carta, informe, fecha_informe,
+            priority=INTERACTIVE
+        )
+        self._esperar_resultado(
+            future,
+            lambda result: self._documento_generado(result, informe_seleccion),
+            self._error_generacion
+        )
+
+    def _generar_documento_job(self, codigo: str, tipo_carta: str, informe: str, fecha_informe: str | None):
+        """
+        Trabajo en segundo plano: integra los datos y genera la carta.
+        Retorna (ruta, informe_usado) donde informe_usado indica el fallback aplicado (o None).
+        """
+        # 🔹 Importaciones necesarias
+        from architecture.document_processing.document_processor import DocumentProcessor
+        from architecture.data_access.integration_data_manager import IntegrationDataManager
+
+        # 🔹 Obtener la data completa desde IntegrationDataManager (SOAP + Excel)
+        integration = IntegrationDataManager()
+        data = integration.get_integrated_data(codigo)
+
+        # 🔹 Crear instancia del procesador de documentos
+        processor = DocumentProcessor()
+        print(f"📋 Informes disponibles en data: {[r.get('reportType') for r in data.get('reports', [])]}")
+
+        # 🔹 Llamar al generador
         try:
-            # 🔹 Importaciones necesarias
-            from architecture.document_processing.document_processor import DocumentProcessor
-            from architecture.data_access.integration_data_manager import IntegrationDataManager
-
-            # 🔹 Obtener la data completa desde IntegrationDataManager (SOAP + Excel)
-            integration = IntegrationDataManager()
-            data = integration.get_integrated_data(codigo)
-
-            # 🔹 Crear instancia del procesador de documentos
-            processor = DocumentProcessor()
-
-            # ─────────────────────────────────────────────
-            # ✅ Detección de tipo de carta (comparación exacta)
-            # ─────────────────────────────────────────────
-            accion_normalizada = accion.lower().strip()
-            if "incumplimiento" in accion_normalizada:
-                tipo_carta = "incumplimiento"
-            elif "perentoria" in accion_normalizada:
-                tipo_carta = "perentoria"
-            else:
-                tipo_carta = "perentoria"  # fallback por defecto
-            # ─────────────────────────────────────────────
-
-            # 🔍 Debug opcional
-            informe, fecha_informe = self._parse_informe_selection(informe_seleccion)
-            print(f"📄 Código proyecto: {codigo}")
-            print(f"🧾 Tipo carta: {tipo_carta}")
-            print(f"📨 Informe seleccionado: {informe} ({fecha_informe or 'SIN FECHA'})")
-            print(f"📋 Informes disponibles en data: {[r.get('reportType') for r in data.get('reports', [])]}")
-
-            # 🔹 Llamar al generador
-            try:
-                output_path = processor.generate_letter(
-                    data=data,
-                    report_type=informe,
-                    report_date=fecha_informe,
-                    letter_type=tipo_carta
-                )
-            except ValueError as err:
-                # 🔸 Fallback automático si no encuentra el informe
-                reports = data.get("reports", [])
-                if reports:
-                    default_report = reports[0].get("reportType", "").strip()
-                    default_date = reports[0].get("scheduledDeliveryDate")
-                    messagebox.showwarning(
-                        "Aviso",
-                        f"No se encontró el informe '{informe_seleccion}'. "
-                        f"Se generará la carta utilizando '{default_report} - {default_date or 'SIN FECHA'}'."
-                    )
-                    output_path = processor.generate_letter(
-                        data=data,
-                        report_type=default_report,
-                        report_date=default_date,
-                        letter_type=tipo_carta
-                    )
-                else:
-                    raise err
-
-            # 🔹 Confirmación
-            messagebox.showinfo(
-                "Éxito",
-                f"Carta generada exitosamente:\n{output_path}"
+            output_path = processor.generate_letter(
+                data=data,
+                report_type=informe,
+                report_date=fecha_informe,
+                letter_type=tipo_carta
+            )
+            return output_path, None
+        except ValueError as err:
+            # 🔸 Fallback automático si no encuentra el informe
+            reports = data.get("reports", [])
+            if not reports:
+                raise err
+            default_report = reports[0].get("reportType", "").strip()
+            default_date = reports[0].get("scheduledDeliveryDate")
+            output_path = processor.generate_letter(
+                data=data,
+                report_type=default_report,
+                report_date=default_date,
+                letter_type=tipo_carta
             )
+            return output_path, f"{default_report} - {default_date or 'SIN FECHA'}"
 
-        except Exception as e:
-            messagebox.showerror(
-                "Error",
-                f"Ocurrió un problema al generar la carta.\n\n{e}"
+    def _documento_generado(self, result: tuple, informe_seleccion: str):
+        output_path, informe_usado = result
+        if informe_usado:
+            messagebox.showwarning(
+                "Aviso",
+                f"No se encontró el informe '{informe_seleccion}'. "
+                f"Se generó la carta utilizando '{informe_usado}'."
             )
+
+        # 🔹 Confirmación
+        messagebox.showinfo(
+            "Éxito",
+            f"Carta generada exitosamente:\n{output_path}"
+        )
+
+    def _error_generacion(self, e: Exception):
+        messagebox.showerror(
+            "Error",
+            f"Ocurrió un problema al generar la carta.\n\n{e}"
+        )
 # ─────────────────────────────────────────────
 # Lanzamiento de la app
 # ─────────────────────────────────────────────
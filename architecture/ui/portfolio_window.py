@@ -0,0 +1,193 @@
+import customtkinter as ctk
+from tkinter import messagebox
+from architecture.document_processing.document_processor import DocumentProcessor
+from architecture.ui.virtual_table import VirtualTable
+from core.report_portfolio import PortfolioLoader, PortfolioTableModel, STATUS_OVERDUE, STATUS_PENDING
+from core.work_scheduler import get_scheduler, BATCH
+
+"""
+architecture/ui/portfolio_window.py
+Ventana de cartera: todos los proyectos con informes pendientes o atrasados en una
+tabla virtualizada, con filtro, orden por columna y selección múltiple para generar
+cartas en bloque. Las filas aparecen a medida que llega cada tramo de datos.
+"""
+
+POLL_MS = 150
+
+STATUS_FILTERS = {
+    "Todos": None,
+    "Atrasados": STATUS_OVERDUE,
+    "Pendientes": STATUS_PENDING
+}
+
+COLUMNS = [
+    ("projectCode", "Código", 130, None),
+    ("projectName", "Proyecto", 300, None),
+    ("beneficiary", "Beneficiario", 220, None),
+    ("reportType", "Informe", 200, None),
+    ("scheduledDeliveryDate", "Entrega", 95, lambda v: v or "SIN FECHA"),
+    ("daysOverdue", "Días atraso", 95, lambda v: str(v) if v else ""),
+    ("status", "Estado", 90, None)
+]
+
+
+def _row_key(row: dict) -> tuple:
+    return row["projectCode"], row["reportType"], row["scheduledDeliveryDate"]
+
+
+class PortfolioWindow(ctk.CTkToplevel):
+    """Cartera de informes pendientes/atrasados con generación de cartas en bloque."""
+
+    def __init__(self, master=None, loader: PortfolioLoader | None = None):
+        super().__init__(master)
+        self.title("Cartera de informes pendientes")
+        self.geometry("1180x680")
+
+        self.model = PortfolioTableModel()
+        self.loader = loader or PortfolioLoader()
+        self.processor = DocumentProcessor()
+        self._poll_job = None
+        self._pending_letters = []
+        self._letter_results = {"ok": 0, "errores": []}
+
+        # ─────────────────────────────────────────────
+        # Filtros y acciones
+        # ─────────────────────────────────────────────
+        toolbar = ctk.CTkFrame(self, corner_radius=10)
+        toolbar.pack(fill="x", padx=15, pady=(15, 5))
+
+        ctk.CTkLabel(toolbar, text="Filtrar:").pack(side="left", padx=(10, 5), pady=8)
+        self.filter_entry = ctk.CTkEntry(toolbar, width=260, placeholder_text="código, proyecto, beneficiario…")
+        self.filter_entry.pack(side="left", padx=5)
+        self.filter_entry.bind("<KeyRelease>", lambda event: self._aplicar_filtro())
+
+        self.status_combo = ctk.CTkComboBox(toolbar, values=list(STATUS_FILTERS), width=130,
+                                            command=lambda value: self._aplicar_filtro())
+        self.status_combo.set("Todos")
+        self.status_combo.pack(side="left", padx=5)
+
+        self.generate_btn = ctk.CTkButton(toolbar, text="Generar cartas seleccionadas", width=220,
+                                          fg_color="#221E7C", hover_color="#3F3F3F",
+                                          command=self.generar_seleccionadas)
+        self.generate_btn.pack(side="right", padx=10)
+        self.letter_combo = ctk.CTkComboBox(toolbar, values=["perentoria", "incumplimiento"], width=140)
+        self.letter_combo.set("perentoria")
+        self.letter_combo.pack(side="right", padx=5)
+
+        # ─────────────────────────────────────────────
+        # Tabla
+        # ─────────────────────────────────────────────
+        self.table = VirtualTable(self, COLUMNS, _row_key, on_sort=self._ordenar,
+                                  on_selection_change=lambda count: self._actualizar_estado())
+        self.table.pack(fill="both", expand=True, padx=15, pady=5)
+        self.table.set_model(self.model)
+        self.table.set_sort_indicator(self.model.sort_column, self.model.sort_descending)
+
+        self.status_var = ctk.StringVar(value="Cargando cartera…")
+        ctk.CTkLabel(self, textvariable=self.status_var, anchor="w").pack(fill="x", padx=20, pady=(0, 10))
+
+        self.protocol("WM_DELETE_WINDOW", self._cerrar)
+        self.loader.start()
+        self._poll()
+
+    # ─────────────────────────────────────────────
+    # Carga progresiva
+    # ─────────────────────────────────────────────
+    def _poll(self):
+        rows = self.loader.drain()
+        if rows:
+            self.model.add_rows(rows)
+            self.table.refresh()
+
+        self._revisar_cartas()
+        self._actualizar_estado()
+        if self.loader.is_done() and not rows and not self._pending_letters:
+            self._poll_job = None
+            return
+        self._poll_job = self.after(POLL_MS, self._poll)
+
+    def _actualizar_estado(self):
+        counts = self.model.counts()
+        partes = [
+            f"{counts['visible']} de {counts['total']} informes",
+            f"{counts['overdue']} atrasados",
+            f"{len(self.table.selected)} seleccionados"
+        ]
+        if self.loader.load_error:
+            partes.append(f"error al cargar: {self.loader.load_error}")
+        elif not self.loader.is_done():
+            partes.append(f"cargando {self.loader.processed}/{self.loader.total} proyectos…")
+        elif self.loader.errors:
+            partes.append(f"{len(self.loader.errors)} proyectos sin datos SOAP")
+        if self._pending_letters:
+            partes.append(f"generando {len(self._pending_letters)} cartas…")
+        self.status_var.set(" · ".join(partes))
+
+    # ─────────────────────────────────────────────
+    # Filtro y orden
+    # ─────────────────────────────────────────────
+    def _aplicar_filtro(self):
+        self.model.set_filter(self.filter_entry.get(), STATUS_FILTERS.get(self.status_combo.get()))
+        self.table.first_row = 0
+        self.table.refresh()
+        self._actualizar_estado()
+
+    def _ordenar(self, column: str):
+        self.model.sort_by(column)
+        self.table.set_sort_indicator(self.model.sort_column, self.model.sort_descending)
+        self.table.refresh()
+
+    # ─────────────────────────────────────────────
+    # Generación en bloque
+    # ─────────────────────────────────────────────
+    def generar_seleccionadas(self):
+        rows = self.table.selected_rows()
+        if not rows:
+            messagebox.showwarning("Atención", "Seleccione uno o más informes de la tabla.", parent=self)
+            return
+        letter_type = self.letter_combo.get().strip().lower()
+        if not messagebox.askyesno("Confirmar", f"¿Generar {len(rows)} cartas {letter_type}?", parent=self):
+            return
+
+        self._letter_results = {"ok": 0, "errores": []}
+        for row in rows:
+            data = self.loader.data_for(row["projectCode"])
+            future = get_scheduler().submit(
+                self.processor.generate_letter, data, row["reportType"],
+                row["scheduledDeliveryDate"], letter_type, priority=BATCH
+            )
+            self._pending_letters.append((row, future))
+        self.generate_btn.configure(state="disabled")
+        if self._poll_job is None:
+            self._poll()
+
+    def _revisar_cartas(self):
+        if not self._pending_letters:
+            return
+        pendientes = []
+        for row, future in self._pending_letters:
+            if not future.done():
+                pendientes.append((row, future))
+            elif future.exception() is not None:
+                self._letter_results["errores"].append(f"{row['projectCode']}: {future.exception()}")
+            else:
+                self._letter_results["ok"] += 1
+        self._pending_letters = pendientes
+        if not pendientes:
+            self.generate_btn.configure(state="normal")
+            self._resumen_cartas()
+
+    def _resumen_cartas(self):
+        errores = self._letter_results["errores"]
+        mensaje = f"Cartas generadas: {self._letter_results['ok']}\nCon error: {len(errores)}"
+        if errores:
+            mensaje += "\n\n" + "\n".join(errores[:10])
+            if len(errores) > 10:
+                mensaje += f"\n… y {len(errores) - 10} más"
+        messagebox.showinfo("Generación en bloque", mensaje, parent=self)
+
+    def _cerrar(self):
+        self.loader.cancel()
+        if self._poll_job is not None:
+            self.after_cancel(self._poll_job)
+        self.destroy()
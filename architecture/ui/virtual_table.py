@@ -0,0 +1,247 @@
+import math
+import tkinter as tk
+
+"""
+architecture/ui/virtual_table.py
+Tabla virtualizada sobre un Canvas de Tk: solo existen los elementos gráficos de
+las filas visibles (un conjunto fijo que se reutiliza al desplazarse), así que
+decenas de miles de filas se recorren con fluidez.
+El modelo debe ofrecer len(model) y model.row_at(posición) → dict.
+"""
+
+ROW_HEIGHT = 24
+HEADER_HEIGHT = 28
+
+COLORS = {
+    "background": "#242424",
+    "row": "#2B2B2B",
+    "row_alt": "#303030",
+    "selected": "#1F6AA5",
+    "header": "#1F1F1F",
+    "text": "#FFFFFF",
+    "header_text": "#72C7D5"
+}
+
+
+class VirtualTable(tk.Frame):
+    """
+    Tabla con encabezado clicable (ordenar), rueda/scrollbar y selección múltiple
+    (clic, Ctrl+clic, Shift+clic, Ctrl+A). La selección se guarda por clave de fila,
+    de modo que se conserva al ordenar o filtrar.
+    """
+
+    def __init__(self, master, columns: list, row_key, on_sort=None, on_selection_change=None, **kwargs):
+        """
+        columns: lista de (clave, título, ancho_px, formateador o None)
+        row_key: función fila → clave estable para la selección
+        """
+        super().__init__(master, bg=COLORS["background"], **kwargs)
+        self.columns = columns
+        self.row_key = row_key
+        self.on_sort = on_sort
+        self.on_selection_change = on_selection_change
+
+        self.model = None
+        self.first_row = 0
+        self.selected = set()
+        self._anchor = None
+        self._slots = []
+        self._sort_state = (None, False)
+
+        self.header = tk.Canvas(self, height=HEADER_HEIGHT, bg=COLORS["header"], highlightthickness=0)
+        self.canvas = tk.Canvas(self, bg=COLORS["background"], highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+
+        self.header.grid(row=0, column=0, sticky="ew")
+        self.canvas.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, rowspan=2, sticky="ns")
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self._draw_header()
+        self.header.bind("<Button-1>", self._on_header_click)
+        self.canvas.bind("<Configure>", lambda event: self._build_slots())
+        # En Windows la rueda llega al widget con foco
+        self.canvas.bind("<Enter>", lambda event: self.canvas.focus_set())
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda event: self.scroll_rows(-3))
+        self.canvas.bind("<Button-5>", lambda event: self.scroll_rows(3))
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Control-Button-1>", lambda event: self._on_click(event, toggle=True))
+        self.canvas.bind("<Shift-Button-1>", lambda event: self._on_click(event, extend=True))
+        self.canvas.bind("<Control-a>", lambda event: self.select_all())
+        self.canvas.bind("<Up>", lambda event: self.scroll_rows(-1))
+        self.canvas.bind("<Down>", lambda event: self.scroll_rows(1))
+        self.canvas.bind("<Prior>", lambda event: self.scroll_rows(-self._visible_count()))
+        self.canvas.bind("<Next>", lambda event: self.scroll_rows(self._visible_count()))
+
+    # ─────────────────────────────────────────────
+    # 🔧 DIBUJO
+    # ─────────────────────────────────────────────
+    def _column_positions(self):
+        x = 0
+        for key, title, width, _ in self.columns:
+            yield key, title, x, width
+            x += width
+
+    def _draw_header(self):
+        self.header.delete("all")
+        sort_key, descending = self._sort_state
+        for key, title, x, width in self._column_positions():
+            arrow = (" ▼" if descending else " ▲") if key == sort_key else ""
+            self.header.create_text(x + 6, HEADER_HEIGHT // 2, anchor="w", text=title + arrow,
+                                    fill=COLORS["header_text"], font=("Segoe UI", 10, "bold"))
+            self.header.create_line(x + width - 1, 4, x + width - 1, HEADER_HEIGHT - 4, fill="#3F3F3F")
+
+    def _visible_count(self) -> int:
+        """Filas que caben completas en pantalla."""
+        return max(1, self.canvas.winfo_height() // ROW_HEIGHT)
+
+    def _build_slots(self):
+        """Crea el conjunto fijo de elementos para las filas que caben en pantalla."""
+        self.canvas.delete("all")
+        self._slots = []
+        total_width = sum(c[2] for c in self.columns)
+        # Una ranura extra para la fila parcialmente visible al pie
+        for slot in range(math.ceil(self.canvas.winfo_height() / ROW_HEIGHT) + 1):
+            y = slot * ROW_HEIGHT
+            rect = self.canvas.create_rectangle(0, y, max(total_width, self.canvas.winfo_width()), y + ROW_HEIGHT,
+                                                width=0, fill=COLORS["row"])
+            texts = [
+                self.canvas.create_text(x + 6, y + ROW_HEIGHT // 2, anchor="w", fill=COLORS["text"],
+                                        font=("Segoe UI", 10))
+                for _, _, x, width in self._column_positions()
+            ]
+            self._slots.append((rect, texts))
+        self.refresh()
+
+    def _cell_text(self, row: dict, key: str, formatter, width: int) -> str:
+        value = row.get(key)
+        text = formatter(value) if formatter is not None else ("" if value is None else str(value))
+        # Recorte aproximado al ancho de la columna (sin medir la fuente en cada celda)
+        max_chars = max(3, (width - 12) // 7)
+        return text if len(text) <= max_chars else text[:max_chars - 1] + "…"
+
+    def refresh(self):
+        """Vuelve a pintar solo las filas visibles (llamar tras cambios del modelo)."""
+        total = len(self.model) if self.model is not None else 0
+        visible = self._visible_count()
+        self.first_row = max(0, min(self.first_row, total - visible))
+
+        for slot, (rect, texts) in enumerate(self._slots):
+            position = self.first_row + slot
+            if position >= total:
+                self.canvas.itemconfigure(rect, state="hidden")
+                for text in texts:
+                    self.canvas.itemconfigure(text, state="hidden")
+                continue
+
+            row = self.model.row_at(position)
+            if self.row_key(row) in self.selected:
+                fill = COLORS["selected"]
+            else:
+                fill = COLORS["row_alt"] if position % 2 else COLORS["row"]
+            self.canvas.itemconfigure(rect, state="normal", fill=fill)
+            for text, (key, _, width, formatter) in zip(texts, self.columns):
+                self.canvas.itemconfigure(text, state="normal", text=self._cell_text(row, key, formatter, width))
+
+        self._update_scrollbar(total, visible)
+
+    def _update_scrollbar(self, total: int, visible: int):
+        if total <= 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        first = self.first_row / total
+        last = min(1.0, (self.first_row + visible) / total)
+        self.scrollbar.set(first, last)
+
+    # ─────────────────────────────────────────────
+    # 🔹 API
+    # ─────────────────────────────────────────────
+    def set_model(self, model):
+        self.model = model
+        self.first_row = 0
+        self.refresh()
+
+    def set_sort_indicator(self, key: str, descending: bool):
+        self._sort_state = (key, descending)
+        self._draw_header()
+
+    def scroll_rows(self, delta: int):
+        self.first_row += delta
+        self.refresh()
+
+    def selected_rows(self) -> list:
+        """Filas seleccionadas en el orden de la vista actual."""
+        if self.model is None:
+            return []
+        return [
+            self.model.row_at(position) for position in range(len(self.model))
+            if self.row_key(self.model.row_at(position)) in self.selected
+        ]
+
+    def select_all(self):
+        if self.model is None:
+            return
+        self.selected = {self.row_key(self.model.row_at(p)) for p in range(len(self.model))}
+        self._selection_changed()
+
+    def clear_selection(self):
+        self.selected.clear()
+        self._selection_changed()
+
+    def _selection_changed(self):
+        self.refresh()
+        if self.on_selection_change:
+            self.on_selection_change(len(self.selected))
+
+    # ─────────────────────────────────────────────
+    # 🔹 EVENTOS
+    # ─────────────────────────────────────────────
+    def _on_scrollbar(self, action, value, units=None):
+        total = len(self.model) if self.model is not None else 0
+        if action == "moveto":
+            self.first_row = int(float(value) * total)
+        elif action == "scroll":
+            step = self._visible_count() if units == "pages" else 1
+            self.first_row += int(value) * step
+        self.refresh()
+
+    def _on_mousewheel(self, event):
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+
+    def _on_header_click(self, event):
+        for key, _, x, width in self._column_positions():
+            if x <= event.x < x + width:
+                if self.on_sort:
+                    self.on_sort(key)
+                return
+
+    def _on_click(self, event, toggle: bool = False, extend: bool = False):
+        self.canvas.focus_set()
+        if self.model is None:
+            return
+        position = self.first_row + int(event.y // ROW_HEIGHT)
+        if position >= len(self.model):
+            return
+        key = self.row_key(self.model.row_at(position))
+
+        if extend and self._anchor is not None:
+            anchor_position = self._position_of(self._anchor)
+            if anchor_position is not None:
+                low, high = sorted((anchor_position, position))
+                self.selected |= {self.row_key(self.model.row_at(p)) for p in range(low, high + 1)}
+                self._selection_changed()
+                return
+        if toggle:
+            self.selected ^= {key}
+        else:
+            self.selected = {key}
+        self._anchor = key
+        self._selection_changed()
+
+    def _position_of(self, key):
+        for position in range(len(self.model)):
+            if self.row_key(self.model.row_at(position)) == key:
+                return position
+        return None
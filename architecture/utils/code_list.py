@@ -0,0 +1,20 @@
+"""
+architecture/utils/code_list.py
+Lectura de listas de códigos de proyecto (un código por línea) compartida por
+los scripts de lotes, cola de trabajo y consulta SOAP.
+"""
+
+
+def leer_codigos(path: str, unique: bool = False) -> list:
+    """
+    Lee un código de proyecto por línea, ignorando líneas vacías y comentarios '#'
+    (también si el '#' viene precedido de espacios). Con unique=True descarta
+    duplicados conservando el orden de aparición.
+    """
+    codigos = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                codigos.append(line)
+    return list(dict.fromkeys(codigos)) if unique else codigos
@@ -14,6 +14,16 @@ conversiones seguras a JSON.
 class FormatUtils:
     """Funciones estáticas de utilidad para formateo, fechas y compatibilidad de datos."""
 
+    # Formatos de fecha de entrada aceptados, en orden de prioridad
+    DATE_INPUT_FORMATS = [
+        "%b %d %Y %I:%M%p",  # Aug 29 2024 11:56AM
+        "%b %d %Y",          # Aug 29 2024
+        "%Y-%m-%d",          # 2024-11-28
+        "%d-%m-%Y",          # 28-11-2024
+        "%d/%m/%Y",          # 28/11/2024
+        "%Y/%m/%d"           # 2024/11/28
+    ]
+
     # ─────────────────────────────────────────────
     # 📅 NORMALIZACIÓN DE FECHAS
     # ─────────────────────────────────────────────
@@ -35,16 +45,7 @@ class FormatUtils:
             return value.strftime("%d/%m/%Y")
 
         # Si viene como string (diversos formatos)
-        possible_formats = [
-            "%b %d %Y %I:%M%p",  # Aug 29 2024 11:56AM
-            "%b %d %Y",          # Aug 29 2024
-            "%Y-%m-%d",          # 2024-11-28
-            "%d-%m-%Y",          # 28-11-2024
-            "%d/%m/%Y",          # 28/11/2024
-            "%Y/%m/%d"           # 2024/11/28
-        ]
-
-        for fmt in possible_formats:
+        for fmt in FormatUtils.DATE_INPUT_FORMATS:
             try:
                 parsed = datetime.strptime(str(value).strip(), fmt)
                 return parsed.strftime("%d/%m/%Y")
@@ -0,0 +1,263 @@
+import json
+import os
+import platform
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+"""
+architecture/utils/memory_report.py
+Modo de contabilidad de memoria para corridas grandes (--memory-report).
+Usa snapshots de tracemalloc para atribuir memoria pico y retenida por etapa del
+flujo (SOAP, Excel, integración, renderizado, guardado) y por módulo (pandas, zeep,
+docx, lxml, código propio), y marca crecimiento sostenido entre iteraciones
+(p. ej. árboles de plantilla que no se liberan). El reporte JSON se puede comparar
+entre versiones.
+"""
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def module_of(filename: str) -> str:
+    """Agrupa un archivo fuente en un 'módulo' legible: paquete externo o ruta del proyecto."""
+    normalized = filename.replace("\\", "/")
+    for marker in ("site-packages/", "dist-packages/"):
+        if marker in normalized:
+            return normalized.split(marker, 1)[1].split("/", 1)[0]
+    root = _PROJECT_ROOT.replace("\\", "/")
+    if normalized.startswith(root):
+        return normalized[len(root):].lstrip("/")
+    if "/lib/python" in normalized or "\\lib\\" in filename.lower():
+        return "stdlib:" + os.path.basename(filename)
+    return filename
+
+
+def _by_module(diffs) -> dict:
+    totals = {}
+    for diff in diffs:
+        module = module_of(diff.traceback[0].filename)
+        totals[module] = totals.get(module, 0) + diff.size_diff
+    return totals
+
+
+def _top(totals: dict, limit: int = 10) -> list:
+    ordered = sorted(totals.items(), key=lambda x: abs(x[1]), reverse=True)[:limit]
+    return [{"module": module, "bytes": size} for module, size in ordered if size]
+
+
+class MemoryReporter:
+    """Recolecta métricas de tracemalloc por etapa e iteración."""
+
+    _FILTERS = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<unknown>")
+    ]
+
+    def __init__(self, label: str = "", growth_threshold: int = 256 * 1024, growth_window: int = 5):
+        self.label = label
+        self.growth_threshold = growth_threshold
+        self.growth_window = growth_window
+
+        self._lock = threading.RLock()
+        self._stack = []
+        self._stages = {}
+        self._iterations = []
+        self._baseline_snapshot = None
+        self._global_peak = 0
+        self._started_tracing = False
+        self.started_at = None
+
+    # ─────────────────────────────────────────────
+    # 🔹 CICLO DE VIDA
+    # ─────────────────────────────────────────────
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(1)
+            self._started_tracing = True
+        self.started_at = datetime.now()
+        return self
+
+    def stop(self):
+        """Detiene tracemalloc (el reporte debe escribirse antes)."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(self._FILTERS)
+
+    # ─────────────────────────────────────────────
+    # 📊 ETAPAS
+    # ─────────────────────────────────────────────
+    def _propagate_peak(self):
+        """Lleva el pico acumulado hasta ahora a todas las etapas abiertas antes de reiniciarlo."""
+        _, peak = tracemalloc.get_traced_memory()
+        self._global_peak = max(self._global_peak, peak)
+        for frame in self._stack:
+            frame["peak"] = max(frame["peak"], peak)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Mide la memoria pico (sobre el inicio) y retenida (al salir) de un bloque."""
+        with self._lock:
+            self._propagate_peak()
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            frame = {"name": name, "start": current, "peak": current, "snapshot": self._snapshot()}
+            self._stack.append(frame)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._propagate_peak()
+                self._stack.remove(frame)
+                current, _ = tracemalloc.get_traced_memory()
+                diffs = self._snapshot().compare_to(frame["snapshot"], "filename")
+                tracemalloc.reset_peak()
+                self._record_stage(name, frame["peak"] - frame["start"], current - frame["start"], diffs)
+
+    def _record_stage(self, name: str, peak: int, retained: int, diffs):
+        stats = self._stages.setdefault(name, {
+            "calls": 0, "peakMax": 0, "peakTotal": 0, "retainedTotal": 0, "modules": {}
+        })
+        stats["calls"] += 1
+        stats["peakMax"] = max(stats["peakMax"], peak)
+        stats["peakTotal"] += peak
+        stats["retainedTotal"] += retained
+        for module, size in _by_module(diffs).items():
+            stats["modules"][module] = stats["modules"].get(module, 0) + size
+
+    # ─────────────────────────────────────────────
+    # 🔁 ITERACIONES
+    # ─────────────────────────────────────────────
+    def end_iteration(self, label: str = ""):
+        """Registra la memoria retenida al terminar una iteración (p. ej. un proyecto del lote)."""
+        with self._lock:
+            current, _ = tracemalloc.get_traced_memory()
+            self._iterations.append({"label": label, "retained": current})
+            # La primera iteración es el calentamiento: la base se toma al terminarla
+            if len(self._iterations) == 1:
+                self._baseline_snapshot = self._snapshot()
+
+    def _growth_analysis(self) -> dict:
+        retained = [it["retained"] for it in self._iterations]
+        result = {"iterations": len(retained), "flagged": False, "growthBytes": 0, "modules": []}
+        if len(retained) < 2:
+            return result
+
+        result["growthBytes"] = retained[-1] - retained[0]
+        window = retained[-(self.growth_window + 1):]
+        steadily_growing = len(window) > 2 and all(b > a for a, b in zip(window, window[1:]))
+        result["flagged"] = steadily_growing and result["growthBytes"] > self.growth_threshold
+
+        if self._baseline_snapshot is not None:
+            diffs = self._snapshot().compare_to(self._baseline_snapshot, "filename")
+            result["modules"] = [
+                m for m in _top(_by_module(diffs)) if m["bytes"] > 0
+            ]
+        return result
+
+    # ─────────────────────────────────────────────
+    # 🧾 REPORTE
+    # ─────────────────────────────────────────────
+    def report(self) -> dict:
+        with self._lock:
+            current, peak = tracemalloc.get_traced_memory()
+            # Las etapas reinician el pico de tracemalloc: se combina con el máximo acumulado
+            peak = max(peak, self._global_peak)
+            stages = {
+                name: {
+                    "calls": s["calls"],
+                    "peakMaxBytes": s["peakMax"],
+                    "peakAvgBytes": s["peakTotal"] // s["calls"],
+                    "retainedTotalBytes": s["retainedTotal"],
+                    "topModules": _top(s["modules"])
+                }
+                for name, s in self._stages.items()
+            }
+            growth = self._growth_analysis()
+        return {
+            "label": self.label,
+            "startedAt": self.started_at.strftime("%Y-%m-%d %H:%M:%S") if self.started_at else None,
+            "python": sys.version.split()[0],
+            "environment": platform.node(),
+            "tracedCurrentBytes": current,
+            "tracedPeakBytes": peak,
+            "stages": stages,
+            "iterationGrowth": growth
+        }
+
+    def write(self, path: str) -> dict:
+        """Escribe el reporte JSON y lo retorna."""
+        report = self.report()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+        print(f"🧠 Reporte de memoria escrito en {path}")
+        if report["iterationGrowth"].get("flagged"):
+            print("⚠️ Crecimiento sostenido de memoria entre iteraciones (posible fuga).")
+        return report
+
+
+# ─────────────────────────────────────────────
+# 🌐 REPORTERO ACTIVO DEL PROCESO
+# ─────────────────────────────────────────────
+_active_reporter = None
+
+
+def enable_memory_report(label: str = "") -> MemoryReporter:
+    """Activa el modo de contabilidad de memoria para todo el proceso."""
+    global _active_reporter
+    _active_reporter = MemoryReporter(label).start()
+    return _active_reporter
+
+
+def disable_memory_report():
+    """Desactiva el modo y detiene tracemalloc. Retorna el reportero que estaba activo."""
+    global _active_reporter
+    reporter, _active_reporter = _active_reporter, None
+    if reporter is not None:
+        reporter.stop()
+    return reporter
+
+
+def memory_stage(name: str):
+    """Context manager de etapa; no hace nada si el modo no está activo."""
+    if _active_reporter is None:
+        return nullcontext()
+    return _active_reporter.stage(name)
+
+
+def memory_iteration(label: str = ""):
+    """Marca el fin de una iteración; no hace nada si el modo no está activo."""
+    if _active_reporter is not None:
+        _active_reporter.end_iteration(label)
+
+
+def compare_memory_reports(old: dict, new: dict) -> dict:
+    """Diferencias de pico y retenido por etapa entre dos reportes (nuevo − anterior)."""
+    comparison = {}
+    for name in sorted(set(old.get("stages", {})) | set(new.get("stages", {}))):
+        before = old.get("stages", {}).get(name, {})
+        after = new.get("stages", {}).get(name, {})
+        comparison[name] = {
+            key: after.get(key, 0) - before.get(key, 0)
+            for key in ("peakMaxBytes", "peakAvgBytes", "retainedTotalBytes")
+        }
+    return {
+        "tracedPeakBytes": new.get("tracedPeakBytes", 0) - old.get("tracedPeakBytes", 0),
+        "stages": comparison
+    }
+
+
+# ─────────────────────────────────────────────
+# USO DESDE CONSOLA: comparar dos reportes
+# ─────────────────────────────────────────────
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Uso: python -m architecture.utils.memory_report reporte_anterior.json reporte_nuevo.json")
+        sys.exit(1)
+    with open(sys.argv[1], encoding="utf-8") as f_old, open(sys.argv[2], encoding="utf-8") as f_new:
+        print(json.dumps(compare_memory_reports(json.load(f_old), json.load(f_new)), indent=4))
@@ -1,13 +1,26 @@
 from datetime import datetime
+import hashlib
+import json
 import os
+import re
 import sys
-from tkinter import filedialog, messagebox
+import tempfile
+import threading
+from architecture.data_access.errors import ExcelFileNotFoundError
 """
 architecture/utils/path_utils.py
 Utilidades para la gestión de rutas institucionales y locales.
 Compatible con OneDrive CORFO, modo desarrollo y ejecutable PyInstaller.
+Sin interfaz gráfica: si una ruta no se encuentra se lanza un error tipado y
+la GUI decide si pregunta al usuario (ver ExcelPathResolver.remember).
 """
 
+EXCEL_FILE_NAME = "datos_finales_cartasp.xlsx"
+# Variable de entorno con la ruta del Excel (servidores y trabajos sin usuario)
+EXCEL_PATH_ENV = "CARTAS_EXCEL_PATH"
+CONFIG_DIR_NAME = ".cartas_perentorias"
+CONFIG_FILE_NAME = "config.json"
+
 
 class PathUtils:
     """Clase de utilidades para obtener rutas institucionales y de sistema."""
@@ -58,35 +71,16 @@ class PathUtils:
     @staticmethod
     def get_cartasperentorias_excel_path():
         """
-        Devuelve la ruta al archivo institucional 'datos_finales_cartasp.xlsx'.
-        Si no se encuentra, permite al usuario seleccionarlo manualmente.
+        Devuelve la ruta al archivo institucional 'datos_finales_cartasp.xlsx'
+        según el resolvedor del proceso (ver get_excel_path_resolver).
+        Lanza ExcelFileNotFoundError si no se encuentra; no muestra diálogos.
         """
-        base_folder = PathUtils.get_innovachile_folder()
-        if not base_folder:
-            messagebox.showwarning("Ruta OneDrive no encontrada", "No se encontró la carpeta 'InnovaChile - General'.")
-            return filedialog.askopenfilename(
-                title="Seleccionar archivo datos_finales_cartasp.xlsx",
-                filetypes=[("Excel Files", "*.xlsx *.xls")]
-            )
-
-        ruta_excel = os.path.join(base_folder, "Base Cartas Perentorias", "datos_finales_cartasp.xlsx")
-        if os.path.exists(ruta_excel):
-            return ruta_excel
-
-        # Si no existe, permitir selección manual
-        respuesta = messagebox.askyesno(
-            "Archivo no encontrado",
-            f"No se encontró el archivo datos_finales_cartasp.xlsx en:\n\n{ruta_excel}\n\n¿Deseas buscarlo manualmente?"
-        )
-        if respuesta:
-            ruta = filedialog.askopenfilename(
-                title="Seleccionar archivo datos_finales_cartasp.xlsx",
-                filetypes=[("Excel Files", "*.xlsx *.xls")]
-            )
-            if ruta:
-                return ruta
-
-        raise FileNotFoundError("No se pudo localizar el archivo datos_finales_cartasp.xlsx.")
+        return get_excel_path_resolver().resolve()
+
+    @staticmethod
+    def get_config_path():
+        """Archivo de configuración local del usuario (ruta del Excel recordada, etc.)."""
+        return os.path.join(PathUtils.get_user_folder(), CONFIG_DIR_NAME, CONFIG_FILE_NAME)
 
     # ─────────────────────────────────────────────
     # 📥 CARPETA DESCARGAS Y ASSETS
@@ -102,11 +96,120 @@ class PathUtils:
         return os.path.join(PathUtils.get_base_dir(), "assets")
 
 
+# ─────────────────────────────────────────────
+# 📊 RESOLUCIÓN DE LA RUTA DEL EXCEL INSTITUCIONAL
+# ─────────────────────────────────────────────
+class ExcelPathResolver:
+    """
+    Resuelve la ruta del Excel institucional sin interfaz (seguro entre hilos y procesos).
+    Orden: variable de entorno CARTAS_EXCEL_PATH, ruta guardada en el archivo de
+    configuración y, por último, la ubicación estándar en OneDrive. La ruta resuelta
+    queda en memoria y en el archivo de configuración, así los demás procesos y los
+    próximos inicios no vuelven a buscarla.
+    """
+
+    def __init__(self, config_path: str | None = None):
+        self.config_path = config_path or PathUtils.get_config_path()
+        self._lock = threading.Lock()
+        self._resolved = None
+
+    def _read_config(self) -> dict:
+        try:
+            with open(self.config_path, encoding="utf-8") as f:
+                config = json.load(f)
+            return config if isinstance(config, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _write_config(self, excel_path: str):
+        config = self._read_config()
+        if config.get("excelPath") == excel_path:
+            return
+        config["excelPath"] = excel_path
+        directory = os.path.dirname(self.config_path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix=".config.", suffix=".json", dir=directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(config, f, indent=4, ensure_ascii=False)
+            os.replace(temp_path, self.config_path)
+        except OSError as e:
+            # Sin configuración escribible se sigue funcionando con la ruta en memoria
+            print(f"⚠️ No se pudo guardar la ruta del Excel en {self.config_path}: {e}")
+
+    def _candidates(self) -> tuple[list, bool]:
+        candidates = [os.environ.get(EXCEL_PATH_ENV), self._read_config().get("excelPath")]
+        base_folder = PathUtils.get_innovachile_folder()
+        if base_folder:
+            candidates.append(os.path.join(base_folder, "Base Cartas Perentorias", EXCEL_FILE_NAME))
+        return [c for c in candidates if isinstance(c, str) and c.strip()], base_folder is not None
+
+    def resolve(self) -> str:
+        """Ruta del Excel; lanza ExcelFileNotFoundError con las rutas revisadas si no existe."""
+        with self._lock:
+            if self._resolved and os.path.isfile(self._resolved):
+                return self._resolved
+            candidates, onedrive_found = self._candidates()
+            for candidate in candidates:
+                if os.path.isfile(candidate):
+                    self._resolved = candidate
+                    if candidate != os.environ.get(EXCEL_PATH_ENV):
+                        self._write_config(candidate)
+                    return candidate
+
+        if not onedrive_found:
+            message = f"No se encontró la carpeta 'InnovaChile - General' ni una ruta configurada para {EXCEL_FILE_NAME}."
+        else:
+            message = f"No se pudo localizar el archivo {EXCEL_FILE_NAME}."
+        raise ExcelFileNotFoundError(message, searched=candidates, onedrive_found=onedrive_found)
+
+    def remember(self, excel_path: str) -> str:
+        """Fija la ruta (p. ej. elegida por el usuario en la GUI) y la guarda en la configuración."""
+        if not os.path.isfile(excel_path):
+            raise ExcelFileNotFoundError(f"No existe el archivo: {excel_path}", searched=[excel_path])
+        excel_path = os.path.abspath(excel_path)
+        with self._lock:
+            self._resolved = excel_path
+            self._write_config(excel_path)
+        return excel_path
+
+
+_excel_path_resolver = None
+_excel_path_resolver_lock = threading.Lock()
+
+
+def get_excel_path_resolver() -> ExcelPathResolver:
+    """Resolvedor compartido del proceso (se crea al primer uso)."""
+    global _excel_path_resolver
+    with _excel_path_resolver_lock:
+        if _excel_path_resolver is None:
+            _excel_path_resolver = ExcelPathResolver()
+        return _excel_path_resolver
+
+
+def set_excel_path_resolver(resolver: ExcelPathResolver):
+    """Reemplaza el resolvedor del proceso (pruebas, servidores con otra configuración)."""
+    global _excel_path_resolver
+    with _excel_path_resolver_lock:
+        _excel_path_resolver = resolver
+
+
 # ─────────────────────────────────────────────
 # 📝 RUTAS DE DESCARGA DE CARTAS GENERADAS
 # ─────────────────────────────────────────────
 
-def generate_download_path(project_code: str, letter_type: str) -> str:
+def build_letter_file_name(project_code: str, letter_type: str, suffix: str | None = None) -> str:
+    """
+    Nombre estructurado de una carta: <project_code>_Carta_<letter_type>[_<suffix>].docx
+    (usado tanto para Descargas como para entradas dentro de un ZIP).
+    """
+    base = f"{project_code}_Carta_{letter_type.capitalize()}"
+    if suffix:
+        base = f"{base}_{suffix}"
+    return f"{base}.docx"
+
+
+def generate_download_path(project_code: str, letter_type: str, output_dir: str | None = None) -> str:
     """
     Genera una ruta de salida en la carpeta 'Descargas' con nombre estructurado:
     <project_code>_Carta_<letter_type>_<fecha>.docx
@@ -114,6 +217,7 @@ def generate_download_path(project_code: str, letter_type: str) -> str:
     Args:
         project_code (str): Código del proyecto (ej. "24CVI-264677")
         letter_type (str): Tipo de carta (ej. "perentoria" o "incumplimiento")
+        output_dir (str, opcional): Carpeta de salida alternativa (ej. carpeta compartida del lote)
 
     Returns:
         str: Ruta completa donde se guardará el documento generado.
@@ -121,8 +225,98 @@ def generate_download_path(project_code: str, letter_type: str) -> str:
     # Fecha y hora exacta para evitar sobrescribir
     date_str = datetime.now().strftime("%Y%m%d_%H%M%S")
     # Nombre del archivo
-    file_name = f"{project_code}_Carta_{letter_type.capitalize()}_{date_str}.docx"
-    # Carpeta Descargas del usuario
-    downloads_dir = os.path.join(os.path.expanduser("~"), "Downloads")
+    file_name = build_letter_file_name(project_code, letter_type, date_str)
+    # Carpeta Descargas del usuario (o la carpeta indicada)
+    downloads_dir = output_dir or os.path.join(os.path.expanduser("~"), "Downloads")
     # Ruta completa del archivo
-    return os.path.join(downloads_dir, file_name)
\ No newline at end of file
+    return os.path.join(downloads_dir, file_name)
+
+# ─────────────────────────────────────────────
+# 🔐 SALIDA DIRECCIONADA POR CONTENIDO
+# ─────────────────────────────────────────────
+CONTENT_HASH_LENGTH = 12
+LETTER_ID_LENGTH = 8
+
+
+def letter_content_hash(template_version: str, replacements: dict) -> str:
+    """Hash de (versión de plantilla, valores de reemplazo): mismas entradas → mismo documento."""
+    payload = json.dumps(
+        [template_version, [[key, str(value)] for key, value in replacements.items()]],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:CONTENT_HASH_LENGTH]
+
+
+def letter_identity(project_code: str, letter_type: str, report_type: str, report_date: str) -> str:
+    """Identifica 'la misma carta' (proyecto, tipo, informe y fecha) aunque cambie su contenido."""
+    payload = "|".join([project_code, letter_type.lower(), report_type, report_date])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:LETTER_ID_LENGTH]
+
+
+def content_addressed_path(
+    project_code: str,
+    letter_type: str,
+    letter_id: str,
+    content_hash: str,
+    output_dir: str | None = None
+) -> str:
+    """
+    Ruta determinística de una carta:
+    <project_code>_Carta_<letter_type>_<id_carta>_<hash_contenido>.docx
+    Regenerar con las mismas entradas da la misma ruta; una versión nueva de la
+    misma carta comparte el prefijo hasta <id_carta> y difiere en el hash.
+    """
+    downloads_dir = output_dir or os.path.join(os.path.expanduser("~"), "Downloads")
+    file_name = build_letter_file_name(project_code, letter_type, f"{letter_id}_{content_hash}")
+    return os.path.join(downloads_dir, file_name)
+
+
+def write_file_atomically(path: str, write) -> bool:
+    """
+    Escribe con write(ruta_temporal) en un archivo temporal único de la misma carpeta
+    y lo publica con os.replace: otros procesos nunca ven un archivo a medio escribir.
+    Retorna False si otro proceso publicó la misma ruta primero (mismo contenido).
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    os.close(fd)
+    try:
+        write(temp_path)
+        try:
+            os.replace(temp_path, path)
+        except PermissionError:
+            # Windows no reemplaza un archivo abierto: si ya existe, es la misma carta
+            if not os.path.exists(path):
+                raise
+            os.remove(temp_path)
+            return False
+        return True
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def remove_superseded_letters(path: str) -> list:
+    """
+    Elimina las versiones anteriores de la carta en 'path' (mismo prefijo hasta el
+    id de carta, otro hash). Las que no se pueden borrar (p. ej. abiertas en Word)
+    se dejan y se informa. Retorna las rutas eliminadas.
+    """
+    directory, file_name = os.path.split(path)
+    stem = file_name[:-len(".docx")]
+    prefix = stem[:-(CONTENT_HASH_LENGTH + 1)]
+    pattern = re.compile(rf"{re.escape(prefix)}_[0-9a-f]{{{CONTENT_HASH_LENGTH}}}\.docx")
+
+    removed = []
+    for candidate in os.listdir(directory or "."):
+        if candidate == file_name or not pattern.fullmatch(candidate):
+            continue
+        candidate_path = os.path.join(directory, candidate)
+        try:
+            os.remove(candidate_path)
+            removed.append(candidate_path)
+        except OSError as e:
+            print(f"⚠️ No se pudo eliminar la versión anterior {candidate}: {e}")
+    return removed
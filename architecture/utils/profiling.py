@@ -0,0 +1,252 @@
+import cProfile
+import functools
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from architecture.utils.memory_report import module_of
+
+"""
+architecture/utils/profiling.py
+Modo de perfilado opcional (menú Depuración en la GUI y --profile en los scripts).
+Envuelve las operaciones pesadas (datos integrados, renderizado y generación de cartas)
+con dos colectores:
+  - un muestreador de pilas en un hilo aparte (bajo costo) que produce un archivo
+    de pilas colapsadas para flame graphs (flamegraph.pl, speedscope);
+  - cProfile por llamada, acumulado en un archivo .pstats.
+Así se ve si el tiempo se va en zeep/lxml, openpyxl/pandas o python-docx.
+"""
+
+
+def _frame_label(code) -> str:
+    return f"{module_of(code.co_filename)}:{code.co_name}"
+
+
+class RunProfiler:
+    """Perfilador de una corrida: muestreo de pilas + cProfile de las llamadas envueltas."""
+
+    def __init__(self, label: str = "", interval: float = 0.005, use_cprofile: bool = True):
+        self.label = label or "perfil"
+        self.interval = interval
+        self.use_cprofile = use_cprofile
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # ident del hilo → (nombre de la operación, frame del envoltorio)
+        self._active = {}
+        self._stacks = {}
+        self._calls = {}
+        self._stats = None
+        self._cprofile_skipped = 0
+        self.samples = 0
+
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.started_at = None
+        self.elapsed = 0.0
+
+    # ─────────────────────────────────────────────
+    # 🔹 CICLO DE VIDA
+    # ─────────────────────────────────────────────
+    def start(self):
+        self.started_at = datetime.now()
+        self._start_time = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self.elapsed = time.perf_counter() - self._start_time
+
+    # ─────────────────────────────────────────────
+    # 🔹 COLECTORES
+    # ─────────────────────────────────────────────
+    @contextmanager
+    def call(self, name: str, wrapper_frame):
+        """
+        Registra una llamada envuelta. Solo la más externa de cada hilo se perfila;
+        las anidadas (p. ej. render_letter dentro de generate_letter) quedan en su pila.
+        """
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        if depth > 0:
+            try:
+                yield
+            finally:
+                self._local.depth = depth
+            return
+
+        ident = threading.get_ident()
+        profile = self._enable_cprofile()
+        with self._lock:
+            self._active[ident] = (name, wrapper_frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._active.pop(ident, None)
+            if profile is not None:
+                profile.disable()
+            self._record_call(name, elapsed, profile)
+            self._local.depth = depth
+
+    def _enable_cprofile(self):
+        if not self.use_cprofile:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Desde Python 3.12 solo un cProfile puede estar activo a la vez en el proceso;
+            # las llamadas concurrentes quedan cubiertas por el muestreador
+            with self._lock:
+                self._cprofile_skipped += 1
+            return None
+        return profile
+
+    def _record_call(self, name: str, elapsed: float, profile):
+        with self._lock:
+            entry = self._calls.setdefault(name, {"count": 0, "totalSeconds": 0.0, "maxSeconds": 0.0})
+            entry["count"] += 1
+            entry["totalSeconds"] += elapsed
+            entry["maxSeconds"] = max(entry["maxSeconds"], elapsed)
+            if profile is not None:
+                if self._stats is None:
+                    self._stats = pstats.Stats(profile)
+                else:
+                    self._stats.add(profile)
+
+    def _sample_loop(self):
+        own_ident = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            with self._lock:
+                active = dict(self._active)
+            if not active:
+                continue
+            frames = sys._current_frames()
+            for ident, (name, wrapper_frame) in active.items():
+                frame = frames.get(ident)
+                if frame is None or ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None and frame is not wrapper_frame:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(name)
+                key = ";".join(reversed(stack))
+                with self._lock:
+                    self._stacks[key] = self._stacks.get(key, 0) + 1
+                    self.samples += 1
+            del frames
+
+    # ─────────────────────────────────────────────
+    # 🔹 SALIDA
+    # ─────────────────────────────────────────────
+    def summary(self) -> dict:
+        with self._lock:
+            calls = {
+                name: {
+                    "count": entry["count"],
+                    "totalSeconds": round(entry["totalSeconds"], 3),
+                    "avgSeconds": round(entry["totalSeconds"] / entry["count"], 3),
+                    "maxSeconds": round(entry["maxSeconds"], 3)
+                }
+                for name, entry in self._calls.items()
+            }
+            return {
+                "label": self.label,
+                "samples": self.samples,
+                "intervalSeconds": self.interval,
+                "cprofileSkipped": self._cprofile_skipped,
+                "calls": calls
+            }
+
+    def write(self, directory: str) -> dict:
+        """
+        Escribe los archivos de la corrida en 'directory' y retorna sus rutas:
+        .collapsed (flame graph), .pstats (cProfile) y .txt (resumen legible).
+        """
+        os.makedirs(directory, exist_ok=True)
+        stamp = (self.started_at or datetime.now()).strftime("%Y%m%d_%H%M%S")
+        base = os.path.join(directory, f"{self.label}_{stamp}")
+        paths = {"collapsed": base + ".collapsed", "summary": base + ".txt"}
+
+        with self._lock:
+            stacks = sorted(self._stacks.items(), key=lambda item: item[1], reverse=True)
+            stats = self._stats
+
+        with open(paths["collapsed"], "w", encoding="utf-8") as f:
+            for stack, count in stacks:
+                f.write(f"{stack} {count}\n")
+
+        text = io.StringIO()
+        summary = self.summary()
+        text.write(f"Perfil '{summary['label']}' — {summary['samples']} muestras cada {self.interval * 1000:.0f} ms\n\n")
+        for name, entry in summary["calls"].items():
+            text.write(
+                f"{name}: {entry['count']} llamadas, total {entry['totalSeconds']} s, "
+                f"promedio {entry['avgSeconds']} s, máximo {entry['maxSeconds']} s\n"
+            )
+        if summary["cprofileSkipped"]:
+            text.write(f"\n{summary['cprofileSkipped']} llamadas concurrentes sin cProfile (solo muestreo).\n")
+
+        if stats is not None:
+            paths["pstats"] = base + ".pstats"
+            stats.dump_stats(paths["pstats"])
+            text.write("\n")
+            stats.stream = text
+            stats.sort_stats("cumulative").print_stats(30)
+
+        with open(paths["summary"], "w", encoding="utf-8") as f:
+            f.write(text.getvalue())
+        return paths
+
+
+# ─────────────────────────────────────────────
+# 🌐 PERFILADOR ACTIVO DEL PROCESO
+# ─────────────────────────────────────────────
+_active_profiler = None
+
+
+def enable_profiling(label: str = "", interval: float = 0.005) -> RunProfiler:
+    """Activa el perfilado para todo el proceso."""
+    global _active_profiler
+    _active_profiler = RunProfiler(label, interval).start()
+    return _active_profiler
+
+
+def disable_profiling():
+    """Desactiva el perfilado y detiene el muestreador. Retorna el perfilador que estaba activo."""
+    global _active_profiler
+    profiler, _active_profiler = _active_profiler, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def is_profiling():
+    return _active_profiler is not None
+
+
+def profiled(name: str):
+    """Decorador de operaciones perfilables; sin perfilado activo solo agrega una comparación."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active_profiler
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.call(name, sys._getframe()):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,222 @@
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from architecture.utils.memory_report import module_of
+
+"""
+architecture/utils/stall_detector.py
+Detector de bloqueos del loop de eventos de Tk (watchdog de la GUI).
+Un latido se programa con widget.after(): si llega tarde más que el umbral, el loop
+estuvo bloqueado. Como al llegar el latido el bloqueo ya terminó, un hilo vigilante
+revisa en paralelo si el latido está atrasado y, apenas supera el umbral, captura la
+pila del hilo principal (lo que está bloqueando, p. ej. una llamada síncrona a
+obtener_datos_proyecto o generate_letter). Al final de la sesión queda un resumen
+con cantidad y duración de bloqueos por sitio, para medir regresiones de respuesta.
+No importa tkinter: sirve con cualquier objeto que tenga after() y after_cancel().
+"""
+
+# Diálogos modales: esperan al usuario dentro de su propio loop, no son bloqueos
+MODAL_MODULES = ("stdlib:messagebox.py", "stdlib:filedialog.py", "stdlib:simpledialog.py",
+                 "stdlib:commondialog.py")
+# Tramos del histograma de duraciones (segundos)
+STALL_BUCKETS = [(0.5, "<0.5s"), (1.0, "0.5-1s"), (5.0, "1-5s"), (float("inf"), ">5s")]
+
+
+def _stack_labels(frame) -> list:
+    """Pila como 'módulo:función:línea', de la más externa a la más interna."""
+    return [f"{module_of(f.filename)}:{f.name}:{f.lineno}" for f in traceback.extract_stack(frame)]
+
+
+def _stall_site(stack: list) -> str:
+    """Sitio del bloqueo: el frame más interno del propio proyecto (o el más interno si no hay)."""
+    for label in reversed(stack):
+        module = label.split(":", 1)[0]
+        if module.endswith(".py") and not os.path.isabs(module):
+            return label
+    return stack[-1] if stack else "desconocido"
+
+
+class MainLoopStallDetector:
+    """Mide cuánto se atrasa un latido de after() y registra la pila de los bloqueos."""
+
+    def __init__(
+        self,
+        widget,
+        interval_ms: int = 50,
+        threshold: float = 0.2,
+        max_recent: int = 100,
+        verbose: bool = True
+    ):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.threshold = threshold
+        self.verbose = verbose
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._after_id = None
+        self._main_ident = None
+        # Momento en que se espera el próximo latido (None entre latido y reprogramación)
+        self._expected = None
+        # Pila capturada por el vigilante durante el atraso en curso
+        self._captured = None
+
+        self.beats = 0
+        self.max_lateness = 0.0
+        self.modal_waits = 0
+        self._durations = []
+        self._sites = {}
+        self._recent = deque(maxlen=max_recent)
+        self.started_at = None
+        self._start_time = None
+        self.elapsed = 0.0
+
+    # ─────────────────────────────────────────────
+    # 🔹 CICLO DE VIDA
+    # ─────────────────────────────────────────────
+    def start(self):
+        """Debe llamarse desde el hilo del loop de Tk (el que se vigila)."""
+        self._main_ident = threading.get_ident()
+        self.started_at = datetime.now()
+        self._start_time = time.perf_counter()
+        self._stop_event.clear()
+        self._schedule()
+        self._thread = threading.Thread(target=self._watch_loop, name="gui-stall-watchdog", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass  # la ventana ya pudo haberse destruido
+            self._after_id = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self.elapsed = time.perf_counter() - self._start_time
+
+    # ─────────────────────────────────────────────
+    # 🔧 LATIDO (HILO PRINCIPAL) Y VIGILANTE
+    # ─────────────────────────────────────────────
+    def _schedule(self):
+        with self._lock:
+            self._expected = time.perf_counter() + self.interval_ms / 1000
+        self._after_id = self.widget.after(self.interval_ms, self._beat)
+
+    def _beat(self):
+        now = time.perf_counter()
+        with self._lock:
+            lateness = now - self._expected if self._expected is not None else 0.0
+            captured, self._captured = self._captured, None
+            self._expected = None
+            self.beats += 1
+            self.max_lateness = max(self.max_lateness, lateness)
+        if lateness >= self.threshold:
+            self._record(lateness, captured)
+        if not self._stop_event.is_set():
+            self._schedule()
+
+    def _watch_loop(self):
+        poll = max(self.threshold / 4, 0.01)
+        while not self._stop_event.wait(poll):
+            with self._lock:
+                overdue = time.perf_counter() - self._expected if self._expected is not None else 0.0
+                pending = overdue >= self.threshold and self._captured is None
+            if not pending:
+                continue
+            frame = sys._current_frames().get(self._main_ident)
+            stack = _stack_labels(frame) if frame is not None else []
+            del frame
+            with self._lock:
+                # El latido pudo haber llegado mientras se capturaba la pila
+                if self._captured is None and self._expected is not None:
+                    self._captured = {"stack": stack, "capturedAfter": overdue}
+
+    def _record(self, duration: float, captured: dict | None):
+        stack = captured["stack"] if captured else []
+        modal = any(label.startswith(MODAL_MODULES) for label in stack)
+        site = _stall_site(stack)
+        stall = {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "seconds": round(duration, 3),
+            "site": site,
+            "modal": modal,
+            "stack": stack
+        }
+        with self._lock:
+            self._recent.append(stall)
+            if modal:
+                self.modal_waits += 1
+                return
+            self._durations.append(duration)
+            entry = self._sites.setdefault(site, {"count": 0, "totalSeconds": 0.0, "maxSeconds": 0.0})
+            entry["count"] += 1
+            entry["totalSeconds"] += duration
+            entry["maxSeconds"] = max(entry["maxSeconds"], duration)
+
+        if self.verbose:
+            print(f"🐢 Loop de la GUI bloqueado {duration:.2f} s en {site}")
+            if stack:
+                print("    " + "\n    ".join(stack[-12:]))
+
+    # ─────────────────────────────────────────────
+    # 🔹 SALIDA
+    # ─────────────────────────────────────────────
+    def summary(self) -> dict:
+        """Resumen de la sesión: cantidad, duración y percentiles de bloqueos, y sitios."""
+        with self._lock:
+            durations = sorted(self._durations)
+            sites = {
+                site: {
+                    "count": entry["count"],
+                    "totalSeconds": round(entry["totalSeconds"], 3),
+                    "maxSeconds": round(entry["maxSeconds"], 3)
+                }
+                for site, entry in sorted(self._sites.items(), key=lambda item: -item[1]["totalSeconds"])
+            }
+            beats, max_lateness, modal_waits = self.beats, self.max_lateness, self.modal_waits
+
+        def percentile(p: float):
+            return round(durations[min(len(durations) - 1, int(p / 100 * len(durations)))], 3) if durations else None
+
+        buckets = {label: 0 for _, label in STALL_BUCKETS}
+        for duration in durations:
+            buckets[next(label for limit, label in STALL_BUCKETS if duration < limit)] += 1
+        session = time.perf_counter() - self._start_time if self._thread is not None else self.elapsed
+        return {
+            "startedAt": self.started_at.isoformat(timespec="seconds") if self.started_at else None,
+            "sessionSeconds": round(session, 1),
+            "thresholdSeconds": self.threshold,
+            "beats": beats,
+            "maxLatenessSeconds": round(max_lateness, 3),
+            "stalls": len(durations),
+            "totalStallSeconds": round(sum(durations), 3),
+            "maxStallSeconds": round(durations[-1], 3) if durations else 0.0,
+            "p50StallSeconds": percentile(50),
+            "p95StallSeconds": percentile(95),
+            "buckets": buckets,
+            "modalWaits": modal_waits,
+            "sites": sites
+        }
+
+    def recent_stalls(self) -> list:
+        with self._lock:
+            return list(self._recent)
+
+    def write(self, directory: str) -> str:
+        """Escribe el resumen y los últimos bloqueos (con pila) en un JSON; retorna la ruta."""
+        os.makedirs(directory, exist_ok=True)
+        stamp = (self.started_at or datetime.now()).strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(directory, f"bloqueos_gui_{stamp}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"summary": self.summary(), "recent": self.recent_stalls()}, f, indent=4, ensure_ascii=False)
+        return path
@@ -0,0 +1,157 @@
+import asyncio
+from architecture.data_access.soap_data_manager import SoapDataManager, REPORT_TYPES
+from architecture.data_access.excel_data_manager import ExcelDataManager
+from architecture.data_access.integration_data_manager import IntegrationDataManager
+from architecture.document_processing.document_processor import DocumentProcessor
+from core.work_scheduler import WorkScheduler, get_scheduler, BATCH
+
+"""
+core/async_pipeline.py
+API asíncrona (asyncio) de punta a punta: integración SOAP + Excel y generación de cartas.
+Los managers se crean una sola vez y se comparten entre todas las solicitudes:
+- las llamadas SOAP (bloqueantes, zeep) se encolan en el planificador compartido,
+  limitadas por un semáforo,
+- el Excel se consulta sobre el índice compartido del proceso,
+- el trabajo de python-docx se encola en el planificador o en un executor inyectado
+  (p. ej. un ProcessPoolExecutor).
+Todo el trabajo usa la prioridad BATCH por defecto, de modo que las solicitudes
+interactivas de la GUI pasan primero.
+"""
+
+
+class AsyncLetterPipeline:
+    """Mantiene cientos de proyectos en vuelo desde un único proceso."""
+
+    def __init__(
+        self,
+        soap_concurrency: int = 8,
+        render_executor=None,
+        soap_manager: SoapDataManager | None = None,
+        excel_manager: ExcelDataManager | None = None,
+        document_processor: DocumentProcessor | None = None,
+        scheduler: WorkScheduler | None = None,
+        priority: int = BATCH
+    ):
+        self.soap_concurrency = soap_concurrency
+        self.soap_manager = soap_manager or SoapDataManager()
+        self.excel_manager = excel_manager or ExcelDataManager.shared()
+        self.integration = IntegrationDataManager(self.soap_manager, self.excel_manager)
+        self.processor = document_processor or DocumentProcessor()
+
+        self.scheduler = scheduler or get_scheduler()
+        self.priority = priority
+        # Renderizado docx: se puede inyectar un ProcessPoolExecutor para usar varios núcleos
+        self._render_executor = render_executor
+        self._soap_semaphore = None
+
+    # ─────────────────────────────────────────────
+    # 🔧 EJECUCIÓN EN EXECUTORS
+    # ─────────────────────────────────────────────
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._soap_semaphore is None:
+            self._soap_semaphore = asyncio.Semaphore(self.soap_concurrency)
+        return self._soap_semaphore
+
+    async def _schedule(self, func, *args):
+        """Encola el trabajo en el planificador compartido y lo espera sin bloquear el loop."""
+        return await asyncio.wrap_future(self.scheduler.submit(func, *args, priority=self.priority))
+
+    async def _soap_call(self, func, *args):
+        """Ejecuta una llamada SOAP respetando el límite de concurrencia."""
+        async with self._get_semaphore():
+            return await self._schedule(func, *args)
+
+    async def _excel_lookup(self, project_code: str) -> dict:
+        row = await self._schedule(self.excel_manager.find_project, project_code)
+        if row is None:
+            print(f"⚠️ Código {project_code} no encontrado en el Excel institucional.")
+            return {}
+        return row
+
+    # ─────────────────────────────────────────────
+    # 🔹 API PÚBLICA
+    # ─────────────────────────────────────────────
+    async def get_integrated_data(self, project_code: str) -> dict:
+        """Equivalente asíncrono de IntegrationDataManager.get_integrated_data."""
+        client = self.soap_manager.client
+
+        # Las 4 llamadas SOAP y la consulta Excel se lanzan en paralelo
+        project_task = self._soap_call(client.get_snapshot_proyectos, project_code)
+        report_tasks = [
+            self._soap_call(client.get_snapshot_informes, project_code, tipo)
+            for tipo in REPORT_TYPES
+        ]
+        excel_task = self._excel_lookup(project_code)
+
+        serialized_project, excel_data, *serialized_reports = await asyncio.gather(
+            project_task, excel_task, *report_tasks
+        )
+
+        soap_data = self.soap_manager.build_project_data(
+            serialized_project, dict(zip(REPORT_TYPES, serialized_reports))
+        )
+        return self.integration.integrate(project_code, soap_data, excel_data)
+
+    async def generate_letter(
+        self, project_code: str, letter_type: str, report_type: str, report_date: str | None = None
+    ) -> str:
+        """Integra los datos del proyecto y genera la carta en el executor de renderizado."""
+        data = await self.get_integrated_data(project_code)
+        if self._render_executor is None:
+            return await self._schedule(
+                self.processor.generate_letter, data, report_type, report_date, letter_type
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._render_executor,
+            self.processor.generate_letter,
+            data, report_type, report_date, letter_type
+        )
+
+    async def generate_letters(
+        self, codes: list, letter_type: str, report_type: str, report_date: str | None = None
+    ) -> list:
+        """
+        Genera cartas para varios proyectos de forma concurrente.
+        Retorna una lista de dicts {projectCode, outputPath, error} en el mismo orden de entrada.
+        """
+        results = await asyncio.gather(
+            *(self.generate_letter(code, letter_type, report_type, report_date) for code in codes),
+            return_exceptions=True
+        )
+
+        summary = []
+        for code, result in zip(codes, results):
+            if isinstance(result, BaseException):
+                summary.append({"projectCode": code, "outputPath": None, "error": str(result)})
+            else:
+                summary.append({"projectCode": code, "outputPath": result, "error": None})
+        return summary
+
+    # ─────────────────────────────────────────────
+    # 🔧 CIERRE
+    # ─────────────────────────────────────────────
+    def close(self):
+        # El planificador es compartido y el executor inyectado pertenece a quien lo creó
+        self._soap_semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# ─────────────────────────────────────────────
+# USO DESDE CONSOLA
+# ─────────────────────────────────────────────
+if __name__ == "__main__":
+    import sys
+    import json
+
+    async def _main(codes):
+        async with AsyncLetterPipeline() as pipeline:
+            results = await pipeline.generate_letters(codes, "perentoria", "INFORME DE AVANCE")
+        print(json.dumps(results, indent=4, ensure_ascii=False))
+
+    asyncio.run(_main(sys.argv[1:] or ["24PATI-272023"]))
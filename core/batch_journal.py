@@ -0,0 +1,158 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+"""
+core/batch_journal.py
+Bitácora SQLite local para corridas por lotes reanudables.
+Registra por proyecto el estado (pendiente, datos obtenidos, renderizada, guardada, fallida),
+los datos integrados ya consultados, la ruta de salida y el error, de modo que una corrida
+reiniciada omite lo completado y reintenta solo lo fallido o pendiente.
+"""
+
+STATUS_PENDING = "pending"
+STATUS_FETCHED = "fetched"
+STATUS_RENDERED = "rendered"
+STATUS_SAVED = "saved"
+STATUS_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batch_items (
+    project_code TEXT NOT NULL,
+    letter_type  TEXT NOT NULL,
+    report_type  TEXT NOT NULL,
+    report_date  TEXT NOT NULL DEFAULT '',
+    status       TEXT NOT NULL,
+    data_json    TEXT,
+    output_path  TEXT,
+    recipient    TEXT,
+    error        TEXT,
+    error_stage  TEXT,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    updated_at   TEXT NOT NULL,
+    PRIMARY KEY (project_code, letter_type, report_type, report_date)
+)
+"""
+
+
+class BatchJournal:
+    """Acceso seguro entre hilos a la bitácora de una corrida por lotes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+
+    @staticmethod
+    def make_key(project_code: str, letter_type: str, report_type: str, report_date: str | None) -> tuple:
+        return project_code.strip(), letter_type, report_type, report_date or ""
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # ─────────────────────────────────────────────
+    # 🔹 REGISTRO DE ESTADOS
+    # ─────────────────────────────────────────────
+    def register(self, keys: list):
+        """Agrega como pendientes los ítems que aún no están en la bitácora."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO batch_items "
+                "(project_code, letter_type, report_type, report_date, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(*key, STATUS_PENDING, self._now()) for key in keys]
+            )
+
+    def reset(self, keys: list):
+        """
+        Vuelve a pendiente (sin datos ni ruta de salida) los ítems indicados, para
+        regenerar cartas ya guardadas. Se registran si aún no estaban.
+        """
+        self.register(keys)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE batch_items SET status = ?, data_json = NULL, output_path = NULL, recipient = NULL, "
+                "error = NULL, error_stage = NULL, updated_at = ? WHERE project_code = ? AND letter_type = ? "
+                "AND report_type = ? AND report_date = ?",
+                [(STATUS_PENDING, self._now(), *key) for key in keys]
+            )
+
+    def get(self, key: tuple) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM batch_items WHERE project_code = ? AND letter_type = ? "
+                "AND report_type = ? AND report_date = ?",
+                key
+            ).fetchone()
+        if row is None:
+            return None
+        item = dict(row)
+        item["data"] = json.loads(item["data_json"]) if item["data_json"] else None
+        return item
+
+    def _update(self, key: tuple, **fields):
+        fields["updated_at"] = self._now()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE batch_items SET {assignments} WHERE project_code = ? AND letter_type = ? "
+                "AND report_type = ? AND report_date = ?",
+                (*fields.values(), *key)
+            )
+
+    def mark_fetched(self, key: tuple, data: dict):
+        """Guarda los datos integrados para no volver a consultar SOAP al reintentar."""
+        self._update(key, status=STATUS_FETCHED, data_json=json.dumps(data, ensure_ascii=False),
+                     error=None, error_stage=None)
+
+    def mark_rendered(self, key: tuple):
+        self._update(key, status=STATUS_RENDERED)
+
+    def mark_saved(self, key: tuple, output_path: str, recipient: str | None = None):
+        self._update(key, status=STATUS_SAVED, output_path=output_path, recipient=recipient,
+                     error=None, error_stage=None)
+
+    def mark_failed(self, key: tuple, stage: str, error: str, discard_data: bool = False):
+        """
+        Registra el error. Con discard_data=True se borran los datos guardados para que
+        el reintento vuelva a consultar SOAP en vez de repetir el mismo fallo.
+        """
+        discard = ", data_json = NULL" if discard_data else ""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE batch_items SET status = ?, error = ?, error_stage = ?, attempts = attempts + 1, "
+                f"updated_at = ?{discard} WHERE project_code = ? AND letter_type = ? AND report_type = ? "
+                "AND report_date = ?",
+                (STATUS_FAILED, error, stage, self._now(), *key)
+            )
+
+    # ─────────────────────────────────────────────
+    # 📋 CONSULTAS
+    # ─────────────────────────────────────────────
+    def summary(self) -> dict:
+        """Cantidad de ítems por estado."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM batch_items GROUP BY status"
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    def items(self, status: str | None = None) -> list:
+        query = "SELECT project_code, letter_type, report_type, report_date, status, output_path, " \
+                "recipient, error, error_stage, attempts, updated_at FROM batch_items"
+        params = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query + " ORDER BY project_code", params)]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,235 @@
+import os
+import time
+from concurrent.futures import wait
+from architecture.data_access.integration_data_manager import IntegrationDataManager
+from architecture.document_processing.document_processor import DocumentProcessor
+from architecture.utils.memory_report import memory_iteration
+from core.batch_journal import BatchJournal, STATUS_SAVED
+from core.results_workbook import ResultsWorkbookWriter
+from core.work_scheduler import WorkScheduler, get_scheduler, BATCH
+
+"""
+core/batch_runner.py
+Generación de cartas por lotes con puntos de control (checkpoints).
+Cada proyecto avanza por: pendiente → datos obtenidos → renderizada → guardada,
+y cada paso queda en la bitácora SQLite. Entre los datos y el renderizado se valida
+todo el lote de una vez: los proyectos con datos incompletos fallan en la etapa
+'validate' sin abrir ninguna plantilla. Al reiniciar una corrida interrumpida
+se omiten las cartas ya guardadas y se reutilizan los datos SOAP ya obtenidos,
+salvo los de proyectos que fallaron al validar o renderizar (se vuelven a consultar).
+Si el OSB no responde, el proyecto falla en 'fetch' y no se guardan datos incompletos.
+"""
+
+
+class BatchRunner:
+    """Ejecuta un lote de cartas sobre el planificador compartido (prioridad BATCH)."""
+
+    def __init__(
+        self,
+        journal_path: str,
+        letter_type: str,
+        report_type: str,
+        report_date: str | None = None,
+        scheduler: WorkScheduler | None = None,
+        integration: IntegrationDataManager | None = None,
+        processor: DocumentProcessor | None = None,
+        refetch: bool = False,
+        regenerate: bool = False,
+        results_writer: ResultsWorkbookWriter | None = None
+    ):
+        self.journal = BatchJournal(journal_path)
+        self.letter_type = letter_type
+        self.report_type = report_type
+        self.report_date = report_date
+        self.scheduler = scheduler or get_scheduler()
+        self.integration = integration or IntegrationDataManager()
+        self.processor = processor or DocumentProcessor()
+        # Si es True, se vuelve a consultar SOAP aunque la bitácora tenga los datos
+        self.refetch = refetch
+        # Si es True, run() reinicia en la bitácora los códigos pedidos: se vuelven a consultar
+        # y generar aunque la carta ya esté guardada (p. ej. tras una reprogramación de informes)
+        self.regenerate = regenerate
+        # Planilla de resultados: una fila por carta apenas termina
+        self.results_writer = results_writer
+
+    # ─────────────────────────────────────────────
+    # 🔧 PASOS POR PROYECTO
+    # ─────────────────────────────────────────────
+    def _is_done(self, item: dict) -> bool:
+        return (
+            item["status"] == STATUS_SAVED
+            and bool(item["output_path"])
+            and os.path.exists(item["output_path"])
+        )
+
+    def _fetch(self, key: tuple, item: dict) -> dict:
+        if item["data"] is not None and not self.refetch:
+            return item["data"]
+        data = self.integration.get_integrated_data(key[0])
+        self.journal.mark_fetched(key, data)
+        return data
+
+    def _save(self, key: tuple, data: dict) -> tuple[str, str]:
+        # Ruta por contenido: si la carta no cambió se reutiliza el archivo existente
+        output_path, info, _ = self.processor.save_letter(
+            data, self.report_type, self.report_date, self.letter_type
+        )
+        self.journal.mark_rendered(key)
+        self.journal.mark_saved(key, output_path, info["recipient"])
+        return output_path, info["recipient"]
+
+    def _failed(self, key: tuple, stage: str, error: str, timings: dict, total: float) -> dict:
+        # Datos que no validan o no renderizan pueden venir de un OSB degradado:
+        # no se reutilizan en el próximo intento
+        self.journal.mark_failed(key, stage, error, discard_data=stage in ("validate", "render"))
+        print(f"❌ {key[0]}: falló en etapa '{stage}': {error}")
+        return {"projectCode": key[0], "status": "failed", "stage": stage, "error": error,
+                **timings, "totalSeconds": total}
+
+    def _finish(self, result: dict) -> dict:
+        """Cierra un proyecto: reporte de memoria y fila en la planilla de resultados."""
+        if result["status"] != "skipped":
+            memory_iteration(result["projectCode"])
+        writer = self.results_writer
+        # Al retomar la planilla, las cartas omitidas ya tienen su fila de la corrida anterior
+        if writer is not None and not (writer.resumed and result["status"] == "skipped"):
+            writer.append({
+                **result,
+                "reportType": self.report_type,
+                "reportDate": self.report_date,
+                "letterType": self.letter_type
+            })
+        return result
+
+    def _prepare(self, project_code: str) -> tuple[dict | None, dict | None]:
+        """
+        Etapa 1: bitácora y datos. Retorna (pendiente, None) con la clave, los datos y
+        el tiempo de obtención, o (None, resultado) si el proyecto ya terminó aquí.
+        """
+        key = BatchJournal.make_key(project_code, self.letter_type, self.report_type, self.report_date)
+        item = self.journal.get(key)
+        if item is None:
+            self.journal.register([key])
+            item = self.journal.get(key)
+
+        if self._is_done(item):
+            return None, {"projectCode": key[0], "status": "skipped", "outputPath": item["output_path"],
+                          "recipient": item["recipient"]}
+
+        start = time.perf_counter()
+        try:
+            data = self._fetch(key, item)
+        except Exception as e:
+            return None, self._failed(key, "fetch", str(e), {}, time.perf_counter() - start)
+        return {"key": key, "data": data, "fetchSeconds": time.perf_counter() - start}, None
+
+    def _render(self, pending: dict) -> dict:
+        """Etapa 3: renderiza y guarda una carta que ya pasó la validación previa."""
+        key = pending["key"]
+        timings = {"fetchSeconds": pending["fetchSeconds"]}
+        start = time.perf_counter()
+        try:
+            output_path, recipient = self._save(key, pending["data"])
+        except Exception as e:
+            return self._failed(key, "render", str(e), timings,
+                                timings["fetchSeconds"] + time.perf_counter() - start)
+        timings["renderSeconds"] = time.perf_counter() - start
+        return {"projectCode": key[0], "status": "saved", "outputPath": output_path, "recipient": recipient,
+                **timings, "totalSeconds": timings["fetchSeconds"] + timings["renderSeconds"]}
+
+    def _validate(self, pending: list) -> tuple[list, list]:
+        """
+        Etapa 2: valida de una vez los datos de todos los proyectos pendientes.
+        Retorna (válidos, resultados de los inválidos); estos quedan en la etapa 'validate'.
+        """
+        if not pending:
+            return [], []
+        errors = self.processor.validate_letters(
+            {p["key"][0]: p["data"] for p in pending}, self.report_type, self.report_date, self.letter_type
+        )
+        valid, failed = [], []
+        for p in pending:
+            project_errors = errors.get(p["key"][0])
+            if project_errors:
+                failed.append(self._failed(p["key"], "validate", "; ".join(project_errors),
+                                           {"fetchSeconds": p["fetchSeconds"]}, p["fetchSeconds"]))
+            else:
+                valid.append(p)
+        return valid, failed
+
+    def process(self, project_code: str) -> dict:
+        """Procesa un proyecto retomando desde el último paso registrado."""
+        pending, result = self._prepare(project_code)
+        if pending is not None:
+            valid, failed = self._validate([pending])
+            result = self._render(valid[0]) if valid else failed[0]
+        return self._finish(result)
+
+    # ─────────────────────────────────────────────
+    # 🔹 CORRIDA COMPLETA
+    # ─────────────────────────────────────────────
+    def run(self, codes: list) -> dict:
+        """
+        Procesa todos los códigos (únicos, en orden) en paralelo sobre el planificador.
+        Retorna un resumen con los resultados por proyecto y el estado de la bitácora.
+        """
+        codes = list(dict.fromkeys(c.strip() for c in codes if c and c.strip()))
+        keys = [
+            BatchJournal.make_key(code, self.letter_type, self.report_type, self.report_date)
+            for code in codes
+        ]
+        # Al regenerar se reinician las filas al comienzo: si la corrida se interrumpe,
+        # basta con repetir el comando sin --regenerar para retomarla
+        if self.regenerate:
+            self.journal.reset(keys)
+        else:
+            self.journal.register(keys)
+
+        print(f"🚀 Iniciando lote de {len(codes)} proyectos ({self.letter_type} / {self.report_type})...")
+        start = time.perf_counter()
+        results = {}
+
+        # 1️⃣ Datos de todos los proyectos (en paralelo)
+        futures = {code: self.scheduler.submit(self._prepare, code, priority=BATCH) for code in codes}
+        wait(futures.values())
+        pending = []
+        for code, future in futures.items():
+            prepared, result = future.result()
+            if prepared is None:
+                results[code] = self._finish(result)
+            else:
+                pending.append(prepared)
+
+        # 2️⃣ Validación previa de todo el lote antes de abrir plantillas
+        valid, failed = self._validate(pending)
+        for result in failed:
+            results[result["projectCode"]] = self._finish(result)
+        if failed:
+            print(f"🔎 Validación previa: {len(failed)} proyectos no se renderizan (ver etapa 'validate').")
+
+        # 3️⃣ Solo se renderizan las cartas que pueden terminar bien
+        futures = {
+            p["key"][0]: self.scheduler.submit(lambda p=p: self._finish(self._render(p)), priority=BATCH)
+            for p in valid
+        }
+        wait(futures.values())
+        for code, future in futures.items():
+            results[code] = future.result()
+
+        results = [results[code] for code in codes]
+        elapsed = time.perf_counter() - start
+
+        counts = {}
+        for result in results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+        print(f"🏁 Lote terminado en {elapsed:.1f} s: {counts}")
+
+        return {
+            "results": results,
+            "counts": counts,
+            "elapsedSeconds": round(elapsed, 2),
+            "journal": self.journal.summary()
+        }
+
+    def close(self):
+        self.journal.close()
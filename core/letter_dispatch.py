@@ -0,0 +1,450 @@
+import hashlib
+import mimetypes
+import os
+import queue
+import smtplib
+import sqlite3
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from email.message import EmailMessage
+from email.utils import make_msgid
+
+"""
+core/letter_dispatch.py
+Envío masivo por correo de las cartas ya generadas.
+- SMTPConnectionPool: conexiones SMTP reutilizadas entre envíos (una sesión sirve
+  muchos mensajes en vez de conectar y autenticar por carta).
+- RateLimiter: espaciado mínimo entre envíos para respetar el límite del servidor.
+- SendLog: bitácora SQLite persistente; una carta se reclama antes de enviarla y
+  nunca se vuelve a enviar una vez aceptada por el servidor.
+- LetterDispatcher: workers concurrentes que combinan los tres.
+Se puede probar contra un servidor SMTP local (p. ej. python -m aiosmtpd -n -l localhost:8025);
+scripts/letter_dispatch_check.py lo hace con un servidor SMTP de prueba incluido.
+"""
+
+STATUS_SENDING = "sending"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+# El servidor pudo haber aceptado el mensaje antes de cortarse la conexión
+STATUS_UNCONFIRMED = "unconfirmed"
+STATUS_SKIPPED = "skipped"
+
+NO_RECIPIENT = "SIN CORREO REGISTRADO"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+DEFAULT_SUBJECT = "Carta {tipo_carta} – Proyecto {codigo}"
+DEFAULT_BODY = (
+    "Estimado(a):\n\n"
+    "Junto con saludar, se adjunta carta {tipo_carta} asociada al {informe} "
+    "del proyecto {codigo}.\n\n"
+    "Saludos cordiales,\n"
+    "Subdirección de Operaciones y Mejora Continua\n"
+    "Gerencia de Innovación – CORFO\n"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sent_letters (
+    file_name    TEXT NOT NULL,
+    recipient    TEXT NOT NULL,
+    project_code TEXT NOT NULL,
+    status       TEXT NOT NULL,
+    message_id   TEXT,
+    error        TEXT,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    updated_at   TEXT NOT NULL,
+    PRIMARY KEY (file_name, recipient)
+)
+"""
+
+
+# ─────────────────────────────────────────────
+# 📋 BITÁCORA DE ENVÍOS
+# ─────────────────────────────────────────────
+class SendLog:
+    """
+    Bitácora de envíos. La clave es (nombre del archivo, destinatario): con la salida
+    direccionada por contenido, una carta nueva o modificada tiene otro nombre.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def claim(self, file_name: str, recipient: str, project_code: str, retry_unconfirmed: bool = False) -> bool:
+        """
+        Reserva el envío (estado 'sending'). Retorna False si ya fue enviado, está en
+        curso o quedó sin confirmar (salvo retry_unconfirmed). Los fallidos se reintentan.
+        """
+        retryable = (STATUS_FAILED, STATUS_UNCONFIRMED, STATUS_SENDING) if retry_unconfirmed else (STATUS_FAILED,)
+        placeholders = ", ".join("?" for _ in retryable)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO sent_letters (file_name, recipient, project_code, status, attempts, updated_at) "
+                "VALUES (?, ?, ?, ?, 1, ?) "
+                "ON CONFLICT (file_name, recipient) DO UPDATE SET status = excluded.status, "
+                "attempts = attempts + 1, error = NULL, updated_at = excluded.updated_at "
+                f"WHERE status IN ({placeholders})",
+                (file_name, recipient, project_code, STATUS_SENDING, self._now(), *retryable)
+            )
+            return cursor.rowcount == 1
+
+    def _update(self, file_name: str, recipient: str, **fields):
+        fields["updated_at"] = self._now()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE sent_letters SET {assignments} WHERE file_name = ? AND recipient = ?",
+                (*fields.values(), file_name, recipient)
+            )
+
+    def mark_sent(self, file_name: str, recipient: str, message_id: str):
+        self._update(file_name, recipient, status=STATUS_SENT, message_id=message_id, error=None)
+
+    def mark_failed(self, file_name: str, recipient: str, error: str, unconfirmed: bool = False):
+        self._update(file_name, recipient, status=STATUS_UNCONFIRMED if unconfirmed else STATUS_FAILED, error=error)
+
+    def summary(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM sent_letters GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def items(self, status: str | None = None) -> list:
+        query = "SELECT * FROM sent_letters"
+        params = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query + " ORDER BY project_code", params)]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ─────────────────────────────────────────────
+# 🔌 POOL DE CONEXIONES SMTP
+# ─────────────────────────────────────────────
+class _TrackedSession:
+    """
+    Marca en la sesión si ya se inició DATA en el envío actual (desde ahí un corte deja
+    el mensaje sin confirmar) y si la sesión venía reutilizada del pool.
+    """
+
+    data_started = False
+    reused = False
+
+    def data(self, msg):
+        self.data_started = True
+        return super().data(msg)
+
+
+class _TrackedSMTP(_TrackedSession, smtplib.SMTP):
+    pass
+
+
+class _TrackedSMTPSSL(_TrackedSession, smtplib.SMTP_SSL):
+    pass
+
+
+class SMTPConnectionPool:
+    """Hasta 'size' sesiones SMTP autenticadas que se prestan y devuelven entre envíos."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 587,
+        username: str | None = None,
+        password: str | None = None,
+        starttls: bool = True,
+        use_ssl: bool = False,
+        timeout: float = 30.0,
+        size: int = 2,
+        max_messages: int = 100,
+        idle_check: float = 30.0
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self.size = size
+        # Muchos servidores cortan la sesión tras N mensajes: se renueva antes
+        self.max_messages = max_messages
+        # Una conexión inactiva por más de esto se verifica con NOOP antes de usarla
+        self.idle_check = idle_check
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._stats_lock = threading.Lock()
+        self.connections_opened = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.use_ssl:
+            smtp = _TrackedSMTPSSL(self.host, self.port, timeout=self.timeout,
+                                    context=ssl.create_default_context())
+        else:
+            smtp = _TrackedSMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                smtp.starttls(context=ssl.create_default_context())
+        if self.username:
+            smtp.login(self.username, self.password or "")
+        with self._stats_lock:
+            self.connections_opened += 1
+        return smtp
+
+    @staticmethod
+    def _discard(smtp: smtplib.SMTP):
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+
+    def _checkout(self, fresh: bool = False) -> list:
+        """
+        Conexión del pool (verificada si estuvo inactiva) o una nueva: [smtp, mensajes, último_uso].
+        Con fresh=True se abre siempre una conexión nueva.
+        """
+        while True:
+            try:
+                if fresh:
+                    raise queue.Empty
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                smtp = self._connect()
+                smtp.reused = False
+                return [smtp, 0, time.monotonic()]
+            entry[0].reused = True
+            if time.monotonic() - entry[2] < self.idle_check:
+                return entry
+            try:
+                entry[0].noop()
+                return entry
+            except OSError:
+                # SMTPException es subclase de OSError
+                self._discard(entry[0])
+
+    @contextmanager
+    def connection(self, fresh: bool = False):
+        """Presta una sesión SMTP; si falla la conexión se descarta en lugar de devolverla."""
+        with self._slots:
+            entry = self._checkout(fresh)
+            entry[0].data_started = False
+            try:
+                yield entry[0]
+            except smtplib.SMTPServerDisconnected:
+                self._discard(entry[0])
+                raise
+            except smtplib.SMTPException:
+                # Rechazo del servidor (smtplib ya hizo RSET): la sesión sigue siendo válida
+                self._release(entry)
+                raise
+            except BaseException:
+                self._discard(entry[0])
+                raise
+            else:
+                self._release(entry)
+
+    def _release(self, entry: list):
+        entry[1] += 1
+        entry[2] = time.monotonic()
+        if entry[1] >= self.max_messages:
+            self._discard(entry[0])
+        else:
+            self._idle.put(entry)
+
+    def close(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait()[0])
+            except queue.Empty:
+                return
+
+
+# ─────────────────────────────────────────────
+# ⏱️ LÍMITE DE ENVÍOS
+# ─────────────────────────────────────────────
+class RateLimiter:
+    """Espacia los envíos para no superar 'per_minute' mensajes por minuto (entre todos los hilos)."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute and per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# ─────────────────────────────────────────────
+# 📬 DESPACHO
+# ─────────────────────────────────────────────
+def items_from_journal(journal) -> list:
+    """Cartas guardadas de una BatchJournal, en el formato que espera LetterDispatcher."""
+    return [
+        {
+            "projectCode": item["project_code"],
+            "letterType": item["letter_type"],
+            "reportType": item["report_type"],
+            "recipient": item["recipient"],
+            "path": item["output_path"]
+        }
+        for item in journal.items(status="saved")
+    ]
+
+
+class _UnconfirmedSend(Exception):
+    """La conexión se cortó después de iniciar DATA: el servidor pudo haber aceptado el mensaje."""
+
+
+class LetterDispatcher:
+    """Envía cartas .docx adjuntas con workers concurrentes sobre un pool SMTP compartido."""
+
+    def __init__(
+        self,
+        pool: SMTPConnectionPool,
+        send_log: SendLog,
+        sender: str,
+        workers: int | None = None,
+        rate_per_minute: float = 60.0,
+        subject: str = DEFAULT_SUBJECT,
+        body: str = DEFAULT_BODY,
+        retry_unconfirmed: bool = False
+    ):
+        self.pool = pool
+        self.send_log = send_log
+        self.sender = sender
+        # Más workers que conexiones solo los dejaría esperando un cupo del pool
+        self.workers = workers or pool.size
+        self.limiter = RateLimiter(rate_per_minute)
+        self.subject = subject
+        self.body = body
+        self.retry_unconfirmed = retry_unconfirmed
+
+    def build_message(self, item: dict, message_id: str) -> EmailMessage:
+        fields = {
+            "codigo": item["projectCode"],
+            "tipo_carta": item.get("letterType", ""),
+            "informe": item.get("reportType", "")
+        }
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = item["recipient"]
+        message["Subject"] = self.subject.format(**fields)
+        message["Message-ID"] = message_id
+        message.set_content(self.body.format(**fields))
+
+        with open(item["path"], "rb") as f:
+            content = f.read()
+        mime_type = DOCX_MIME if item["path"].lower().endswith(".docx") else (
+            mimetypes.guess_type(item["path"])[0] or "application/octet-stream"
+        )
+        maintype, subtype = mime_type.split("/", 1)
+        message.add_attachment(content, maintype=maintype, subtype=subtype,
+                               filename=os.path.basename(item["path"]))
+        return message
+
+    def _message_id(self, file_name: str, recipient: str) -> str:
+        # Determinístico: un reenvío manual del mismo mensaje es detectable por el cliente
+        digest = hashlib.sha256(f"{file_name}|{recipient}".encode("utf-8")).hexdigest()[:24]
+        domain = self.sender.rsplit("@", 1)[-1] if "@" in self.sender else None
+        return make_msgid(idstring=digest, domain=domain)
+
+    def _send(self, message: EmailMessage):
+        """
+        Envía por una sesión del pool. Si una sesión reutilizada resulta estar cortada antes
+        de DATA (p. ej. el servidor la cerró por inactividad) nada salió: se reintenta una vez
+        con una conexión nueva. Un corte después de iniciar DATA lanza _UnconfirmedSend.
+        """
+        for fresh in (False, True):
+            smtp = None
+            try:
+                with self.pool.connection(fresh=fresh) as smtp:
+                    smtp.send_message(message)
+                return
+            except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+                raise
+            except OSError as e:
+                if smtp is not None and smtp.data_started:
+                    raise _UnconfirmedSend(str(e)) from e
+                if fresh or smtp is None or not smtp.reused:
+                    raise
+                print(f"♻️ Sesión SMTP reutilizada cortada ({e}); se reintenta con una conexión nueva.")
+
+    def send_one(self, item: dict) -> dict:
+        recipient = (item.get("recipient") or "").strip()
+        file_name = os.path.basename(item.get("path") or "")
+        result = {"projectCode": item["projectCode"], "recipient": recipient, "file": file_name}
+
+        if not recipient or recipient == NO_RECIPIENT or "@" not in recipient:
+            return {**result, "status": STATUS_SKIPPED, "error": "sin destinatario válido"}
+        if not item.get("path") or not os.path.exists(item["path"]):
+            return {**result, "status": STATUS_SKIPPED, "error": "archivo no encontrado"}
+        if not self.send_log.claim(file_name, recipient, item["projectCode"], self.retry_unconfirmed):
+            return {**result, "status": STATUS_SKIPPED, "error": "ya enviado o sin confirmar"}
+
+        message_id = self._message_id(file_name, recipient)
+        try:
+            message = self.build_message(item, message_id)
+            self.limiter.acquire()
+            self._send(message)
+        except _UnconfirmedSend as e:
+            # Corte después de iniciar DATA: no se sabe si el mensaje salió
+            self.send_log.mark_failed(file_name, recipient, str(e), unconfirmed=True)
+            return {**result, "status": STATUS_UNCONFIRMED, "error": str(e)}
+        except smtplib.SMTPResponseException as e:
+            # El servidor rechazó el mensaje: se puede reintentar en otra corrida
+            error = f"{e.smtp_code} {e.smtp_error!r}"
+            self.send_log.mark_failed(file_name, recipient, error)
+            return {**result, "status": STATUS_FAILED, "error": error}
+        except smtplib.SMTPRecipientsRefused as e:
+            self.send_log.mark_failed(file_name, recipient, str(e.recipients))
+            return {**result, "status": STATUS_FAILED, "error": str(e.recipients)}
+        except OSError as e:
+            # No se pudo conectar, leer el archivo o la sesión se cortó antes de DATA: nada salió
+            self.send_log.mark_failed(file_name, recipient, str(e))
+            return {**result, "status": STATUS_FAILED, "error": str(e)}
+        except Exception as e:
+            self.send_log.mark_failed(file_name, recipient, str(e))
+            return {**result, "status": STATUS_FAILED, "error": str(e)}
+
+        self.send_log.mark_sent(file_name, recipient, message_id)
+        print(f"📧 Carta enviada a {recipient}: {file_name}")
+        return {**result, "status": STATUS_SENT}
+
+    def dispatch(self, items: list) -> dict:
+        """Envía todas las cartas; retorna resultados por carta y el resumen de la bitácora."""
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(self.send_one, items))
+        elapsed = time.perf_counter() - started
+        sent = sum(1 for r in results if r["status"] == STATUS_SENT)
+        return {
+            "results": results,
+            "sent": sent,
+            "elapsedSeconds": round(elapsed, 2),
+            "connectionsOpened": self.pool.connections_opened,
+            "log": self.send_log.summary()
+        }
@@ -2,6 +2,7 @@ import os
 from datetime import datetime
 from docx import Document
 from docx.shared import Pt
+from architecture.document_processing.fast_docx_renderer import RenderedLetter, compiled_template, renderable, slot
 
 """
 core/letter_generator.py
@@ -12,7 +13,9 @@ utilizando los datos obtenidos desde la interfaz.
 class LetterGenerator:
     """Generador básico de cartas perentorias e incumplimiento."""
 
-    def __init__(self):
+    def __init__(self, fast_render: bool = True):
+        # Sin python-docx por carta: variantes precompiladas y sustitución de texto
+        self.fast_render = fast_render
         # Carpeta de salida (Descargas del usuario)
         self.output_folder = os.path.join(os.path.expanduser("~/Downloads"), "Cartas Generadas")
         os.makedirs(self.output_folder, exist_ok=True)
@@ -29,26 +32,66 @@ class LetterGenerator:
         :param datos_proyecto: dict (opcional: con nombreProyecto, beneficiario, responsable)
         :return: ruta del archivo generado
         """
+        # Textos variables de la carta (el resto del documento es fijo por variante)
+        valores = {
+            "titulo": "Carta " + tipo_carta.replace("Generar ", ""),
+            "fecha": datetime.now().strftime("%d/%m/%Y"),
+            "codigo": f"{codigo_proyecto}",
+            "informe": f"{informe_asociado}"
+        }
+        if datos_proyecto:
+            valores["nombreProyecto"] = f"{datos_proyecto.get('nombreProyecto', '')}"
+            valores["beneficiario"] = f"{datos_proyecto.get('beneficiario', '')}"
+            valores["representanteLegal"] = f"{datos_proyecto.get('representanteLegal', '')}"
+        incumplimiento = "incumplimiento" in tipo_carta.lower()
+
+        carta = self._render_fast(valores, incumplimiento) if self.fast_render else None
+        if carta is None:
+            carta = self._build_document(valores, incumplimiento)
+
+        # Guardar archivo
+        nombre_archivo = f"{tipo_carta.replace('Generar ', '').replace(' ', '_')}_{codigo_proyecto}.docx"
+        ruta_salida = os.path.join(self.output_folder, nombre_archivo)
+        carta.save(ruta_salida)
+
+        return ruta_salida
+
+    # ─────────────────────────────────────────────
+    # 🔧 CONSTRUCCIÓN DEL DOCUMENTO
+    # ─────────────────────────────────────────────
+    def _render_fast(self, valores: dict, incumplimiento: bool):
+        """Sustitución sobre la variante precompilada; None si hay que usar python-docx."""
+        if not renderable(valores.values()):
+            return None
+        # Una plantilla por combinación de campos presentes y tipo de cuerpo
+        key = ("letter_generator", tuple(valores), incumplimiento)
+        template = compiled_template(
+            key,
+            lambda: self._build_document({k: slot(i) for i, k in enumerate(valores)}, incumplimiento)
+        )
+        if template is None:
+            return None
+        return RenderedLetter(template, template.render(list(valores.values())))
 
+    def _build_document(self, valores: dict, incumplimiento: bool):
         # Crear documento base
         doc = Document()
 
         # Encabezado
-        doc.add_heading("Carta " + tipo_carta.replace("Generar ", ""), level=1)
+        doc.add_heading(valores["titulo"], level=1)
 
         # Fecha
-        fecha_actual = datetime.now().strftime("%d/%m/%Y")
-        doc.add_paragraph(f"Santiago, {fecha_actual}")
+        doc.add_paragraph(f"Santiago, {valores['fecha']}")
 
         # Cuerpo del documento
-        doc.add_paragraph(f"Código del proyecto: {codigo_proyecto}")
+        doc.add_paragraph(f"Código del proyecto: {valores['codigo']}")
 
-        if datos_proyecto:
-            doc.add_paragraph(f"Nombre del Proyecto: {datos_proyecto.get('nombreProyecto', '')}")
-            doc.add_paragraph(f"Beneficiario: {datos_proyecto.get('beneficiario', '')}")
-            doc.add_paragraph(f"Representante Legal: {datos_proyecto.get('representanteLegal', '')}")
+        if "nombreProyecto" in valores:
+            doc.add_paragraph(f"Nombre del Proyecto: {valores['nombreProyecto']}")
+            doc.add_paragraph(f"Beneficiario: {valores['beneficiario']}")
+            doc.add_paragraph(f"Representante Legal: {valores['representanteLegal']}")
 
-        doc.add_paragraph(f"Informe asociado: {informe_asociado}")
+        doc.add_paragraph(f"Informe asociado: {valores['informe']}")
 
         # Cuerpo principal según tipo de carta
         cuerpo = (
@@ -56,7 +99,7 @@ class LetterGenerator:
             "se encuentra pendiente de entrega dentro de los plazos establecidos por CORFO."
         )
 
-        if "incumplimiento" in tipo_carta.lower():
+        if incumplimiento:
             cuerpo = (
                 "De acuerdo con los antecedentes revisados, se constata un incumplimiento "
                 "en la entrega del informe indicado, conforme a lo establecido en la resolución vigente."
@@ -75,9 +118,4 @@ class LetterGenerator:
                 run.font.name = "Calibri"
                 run.font.size = Pt(11)
 
-        # Guardar archivo
-        nombre_archivo = f"{tipo_carta.replace('Generar ', '').replace(' ', '_')}_{codigo_proyecto}.docx"
-        ruta_salida = os.path.join(self.output_folder, nombre_archivo)
-        doc.save(ruta_salida)
-
-        return ruta_salida
\ No newline at end of file
+        return doc
@@ -0,0 +1,288 @@
+import queue
+import threading
+from datetime import date, datetime
+from architecture.data_access.excel_data_manager import ExcelDataManager
+from architecture.data_access.integration_data_manager import IntegrationDataManager
+from architecture.utils.format_utils import FormatUtils
+from core.work_scheduler import WorkScheduler, get_scheduler, BATCH
+
+"""
+core/report_portfolio.py
+Cartera de informes pendientes y atrasados para la vista de tabla de la GUI.
+- report_rows: convierte los datos integrados de un proyecto en filas (una por informe).
+- PortfolioLoader: carga la cartera por tramos en el planificador (prioridad BATCH)
+  y entrega las filas a medida que llegan, sin bloquear la interfaz.
+- PortfolioTableModel: filas + vista filtrada/ordenada (lista de índices) que
+  la tabla virtualizada recorre solo en la porción visible.
+"""
+
+STATUS_OVERDUE = "Atrasado"
+STATUS_PENDING = "Pendiente"
+
+# Columnas que se muestran como texto pero se ordenan por otro campo
+SORT_FIELDS = {"scheduledDeliveryDate": "dueDate"}
+
+
+def _parse_due_date(value):
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        return datetime.strptime(value.strip(), "%d/%m/%Y").date()
+    except ValueError:
+        return None
+
+
+def report_rows(data: dict, today: date | None = None) -> list:
+    """
+    Filas de la cartera para un proyecto integrado: una por informe con tipo.
+    Un informe con fecha de entrega anterior a hoy queda 'Atrasado'; el resto, 'Pendiente'
+    (mismo criterio que los informes disponibles de la GUI).
+    """
+    today = today or date.today()
+    info = data.get("projectinfo", {}) or data.get("projectInfo", {})
+    code = data.get("projectCode", "")
+    rows = []
+    for report in data.get("reports", []):
+        if not isinstance(report, dict):
+            continue
+        report_type = str(report.get("reportType") or "").strip()
+        if not report_type:
+            continue
+        scheduled = report.get("scheduledDeliveryDate")
+        due = _parse_due_date(scheduled)
+        days_overdue = (today - due).days if due and due < today else 0
+        rows.append({
+            "projectCode": code,
+            "projectName": info.get("projectName") or "",
+            "beneficiary": info.get("beneficiaryName") or "",
+            "reportType": report_type,
+            "scheduledDeliveryDate": scheduled if isinstance(scheduled, str) and scheduled.strip() else None,
+            "dueDate": due,
+            "daysOverdue": days_overdue,
+            "status": STATUS_OVERDUE if days_overdue > 0 else STATUS_PENDING
+        })
+    return rows
+
+
+class PortfolioLoader:
+    """
+    Carga la cartera por tramos de códigos con la integración vectorizada.
+    Cada tramo consulta SOAP dentro de su propio trabajo BATCH, así que el paralelismo
+    de la carga es la cantidad de tramos en vuelo; se mantienen pocos para que otros
+    trabajos (p. ej. generar cartas) no queden detrás de toda la carga en la cola.
+    """
+
+    def __init__(
+        self,
+        codes: list | None = None,
+        chunk_size: int = 25,
+        max_in_flight: int = 4,
+        integration: IntegrationDataManager | None = None,
+        scheduler: WorkScheduler | None = None
+    ):
+        self.codes = codes
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight
+        self.integration = integration or IntegrationDataManager()
+        self.scheduler = scheduler or get_scheduler()
+
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._chunks = []
+        self._next_chunk = 0
+        self._in_flight = set()
+        self._data = {}
+        self.errors = {}
+        self.processed = 0
+        self.total = 0
+        self.cancelled = False
+        self.load_error = None
+        self.finished = threading.Event()
+
+    # ─────────────────────────────────────────────
+    # 🔹 CICLO DE VIDA
+    # ─────────────────────────────────────────────
+    def start(self):
+        """Inicia la carga sin bloquear: sin códigos explícitos, la lista sale del Excel en segundo plano."""
+        if self.codes is None:
+            self.scheduler.submit(self._prepare, priority=BATCH)
+        else:
+            self._prepare()
+        return self
+
+    def _prepare(self):
+        try:
+            if self.codes is None:
+                excel_manager = ExcelDataManager.shared()
+                if not excel_manager.is_loaded():
+                    excel_manager.refresh()
+                self.codes = [code for code, _ in excel_manager.list_projects()]
+        except Exception as e:
+            self.load_error = str(e)
+            print(f"⚠️ No se pudo obtener la lista de proyectos: {e}")
+            self.finished.set()
+            return
+
+        codes = list(dict.fromkeys(self.codes))
+        with self._lock:
+            self.total = len(codes)
+            self._chunks = [codes[i:i + self.chunk_size] for i in range(0, len(codes), self.chunk_size)]
+        if not self._chunks:
+            self.finished.set()
+        self._submit_more()
+
+    def cancel(self):
+        """Descarta los tramos aún no iniciados; los que están en curso terminan normalmente."""
+        with self._lock:
+            self.cancelled = True
+            in_flight = list(self._in_flight)
+        for future in in_flight:
+            future.cancel()
+        self.finished.set()
+
+    def _submit_more(self):
+        submitted = []
+        with self._lock:
+            while (
+                not self.cancelled
+                and len(self._in_flight) < self.max_in_flight
+                and self._next_chunk < len(self._chunks)
+            ):
+                chunk = self._chunks[self._next_chunk]
+                self._next_chunk += 1
+                future = self.scheduler.submit(self._load_chunk, chunk, priority=BATCH)
+                self._in_flight.add(future)
+                submitted.append(future)
+        # Fuera del bloqueo: si el tramo ya terminó, el callback corre en este mismo hilo
+        for future in submitted:
+            future.add_done_callback(self._chunk_done)
+
+    def _load_chunk(self, chunk: list):
+        integrated, errors = self.integration.get_integrated_data_bulk(chunk)
+        rows = []
+        for code in chunk:
+            data = integrated.get(code)
+            if data is not None:
+                rows.extend(report_rows(data))
+        return chunk, integrated, errors, rows
+
+    def _chunk_done(self, future):
+        with self._lock:
+            self._in_flight.discard(future)
+        if not future.cancelled():
+            try:
+                chunk, integrated, errors, rows = future.result()
+            except Exception as e:
+                print(f"⚠️ Error cargando la cartera: {e}")
+            else:
+                with self._lock:
+                    self._data.update(integrated)
+                    self.errors.update(errors)
+                    self.processed += len(chunk)
+                self._results.put(rows)
+
+        self._submit_more()
+        with self._lock:
+            if not self._in_flight and (self.cancelled or self._next_chunk >= len(self._chunks)):
+                self.finished.set()
+
+    # ─────────────────────────────────────────────
+    # 🔹 CONSULTA (desde el hilo de la interfaz)
+    # ─────────────────────────────────────────────
+    def drain(self) -> list:
+        """Filas llegadas desde la última llamada (no bloquea)."""
+        rows = []
+        while True:
+            try:
+                rows.extend(self._results.get_nowait())
+            except queue.Empty:
+                return rows
+
+    def data_for(self, project_code: str):
+        with self._lock:
+            return self._data.get(project_code)
+
+    def is_done(self) -> bool:
+        return self.finished.is_set()
+
+
+class PortfolioTableModel:
+    """Filas de la cartera con una vista filtrada y ordenada (índices sobre 'rows')."""
+
+    def __init__(self):
+        self.rows = []
+        self.view = []
+        self._search_keys = []
+        # Clave de orden por fila para la columna activa (se recalcula solo al cambiar de columna)
+        self._sort_keys = []
+        self._overdue = 0
+        self.filter_text = ""
+        self.filter_status = None
+        self.sort_column = "daysOverdue"
+        self.sort_descending = True
+
+    def _search_key(self, row: dict) -> str:
+        return FormatUtils.normalize_key(
+            f"{row['projectCode']} {row['projectName']} {row['beneficiary']} {row['reportType']}"
+        )
+
+    def _matches(self, index: int) -> bool:
+        row = self.rows[index]
+        if self.filter_status and row["status"] != self.filter_status:
+            return False
+        return all(term in self._search_keys[index] for term in self.filter_text.split())
+
+    def _sort_key(self, row: dict):
+        value = row.get(SORT_FIELDS.get(self.sort_column, self.sort_column))
+        if isinstance(value, str):
+            value = FormatUtils.normalize_key(value)
+        return None if value == "" else value
+
+    def _sort_view(self):
+        keys = self._sort_keys
+        filled = [i for i in self.view if keys[i] is not None]
+        # Los vacíos quedan al final en ambos sentidos
+        empty = [i for i in self.view if keys[i] is None]
+        filled.sort(key=keys.__getitem__, reverse=self.sort_descending)
+        self.view = filled + empty
+
+    # ─────────────────────────────────────────────
+    # 🔹 OPERACIONES
+    # ─────────────────────────────────────────────
+    def add_rows(self, rows: list):
+        """Agrega filas manteniendo el filtro y el orden vigentes."""
+        if not rows:
+            return
+        start = len(self.rows)
+        self.rows.extend(rows)
+        self._search_keys.extend(self._search_key(row) for row in rows)
+        self._sort_keys.extend(self._sort_key(row) for row in rows)
+        self._overdue += sum(1 for row in rows if row["status"] == STATUS_OVERDUE)
+        self.view.extend(i for i in range(start, len(self.rows)) if self._matches(i))
+        self._sort_view()
+
+    def set_filter(self, text: str = "", status: str | None = None):
+        self.filter_text = FormatUtils.normalize_key(text or "")
+        self.filter_status = status
+        self.view = [i for i in range(len(self.rows)) if self._matches(i)]
+        self._sort_view()
+
+    def sort_by(self, column: str, descending: bool | None = None):
+        """Ordena por columna; sin 'descending' alterna el sentido si la columna ya estaba activa."""
+        if descending is None:
+            descending = not self.sort_descending if column == self.sort_column else False
+        if column != self.sort_column:
+            self.sort_column = column
+            self._sort_keys = [self._sort_key(row) for row in self.rows]
+        self.sort_descending = descending
+        self._sort_view()
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    def row_at(self, position: int) -> dict:
+        """Fila en la posición 'position' de la vista."""
+        return self.rows[self.view[position]]
+
+    def counts(self) -> dict:
+        return {"total": len(self.rows), "visible": len(self.view), "overdue": self._overdue}
@@ -0,0 +1,221 @@
+import sqlite3
+import threading
+from datetime import datetime
+from architecture.utils.format_utils import FormatUtils
+
+"""
+core/report_schedule.py
+Detección de cambios en el calendario de informes (SEL_SNAPSHOT_INFORMES) entre snapshots.
+Cada informe se identifica por (proyecto, tipo, periodo) y se compara su fecha de entrega
+programada con la del último snapshot guardado en una base SQLite local. Solo se emiten
+los informes agregados, eliminados o reprogramados, para que el seguimiento y la
+regeneración de cartas toquen únicamente lo que cambió.
+
+Acepta datos integrados (IntegrationDataManager, bitácora de lotes) o snapshots crudos
+de scripts/soap_query.py (claves SOAP en español): las claves se traducen igual que en
+la integración y las fechas se normalizan a dd/mm/yyyy.
+"""
+
+CHANGE_ADDED = "added"
+CHANGE_REMOVED = "removed"
+CHANGE_RESCHEDULED = "rescheduled"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS report_schedule (
+    project_code   TEXT NOT NULL,
+    report_type    TEXT NOT NULL,
+    report_period  TEXT NOT NULL,
+    scheduled_date TEXT,
+    updated_at     TEXT NOT NULL,
+    PRIMARY KEY (project_code, report_type, report_period)
+);
+CREATE TABLE IF NOT EXISTS schedule_projects (
+    project_code TEXT PRIMARY KEY,
+    taken_at     TEXT NOT NULL
+);
+"""
+
+
+# ─────────────────────────────────────────────
+# 🔧 CALENDARIO DE UN PROYECTO
+# ─────────────────────────────────────────────
+def _report_fields(report: dict) -> dict:
+    """Campos del informe con claves en camelCase (las ya traducidas tienen prioridad)."""
+    return {**FormatUtils.normalize_keys_to_camel_case(report), **report}
+
+
+def _text(value) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def _normalize_date(value) -> str | None:
+    """Fecha como dd/mm/yyyy (igual que la integración); acepta además fechas ISO con hora."""
+    normalized = _text(FormatUtils.normalize_date(value))
+    try:
+        # Un datetime serializado con str() (p. ej. en el JSON Lines de soap_query)
+        return datetime.fromisoformat(normalized).strftime("%d/%m/%Y")
+    except ValueError:
+        return normalized or None
+
+
+def report_schedule(data: dict) -> dict:
+    """
+    Calendario de informes de un proyecto: (tipo, periodo) → fecha de entrega (dd/mm/yyyy).
+    Si el informe no trae periodo se usa su posición dentro del tipo ('#1', '#2', ...) en el
+    orden del snapshot; un periodo repetido dentro del mismo tipo se desambigua igual.
+    """
+    schedule = {}
+    positions = {}
+    for report in data.get("reports", []) or []:
+        if not isinstance(report, dict):
+            continue
+        fields = _report_fields(report)
+        report_type = _text(fields.get("reportType")).upper()
+        if not report_type:
+            continue
+        positions[report_type] = positions.get(report_type, 0) + 1
+        period = _text(fields.get("reportPeriod")) or f"#{positions[report_type]}"
+        key, n = (report_type, period), 1
+        while key in schedule:
+            n += 1
+            key = (report_type, f"{period}#{n}")
+        schedule[key] = _normalize_date(fields.get("scheduledDeliveryDate"))
+    return schedule
+
+
+def diff_schedules(project_code: str, previous: dict, current: dict) -> list:
+    """Cambios entre dos calendarios de un proyecto, en orden de tipo y periodo."""
+    changes = []
+    for key in sorted(previous.keys() | current.keys()):
+        before, after = previous.get(key), current.get(key)
+        if key not in previous:
+            change = CHANGE_ADDED
+        elif key not in current:
+            change = CHANGE_REMOVED
+        elif before != after:
+            change = CHANGE_RESCHEDULED
+        else:
+            continue
+        changes.append({
+            "projectCode": project_code,
+            "reportType": key[0],
+            "reportPeriod": key[1],
+            "change": change,
+            "previousDate": before,
+            "currentDate": after
+        })
+    return changes
+
+
+def affected_codes(changes: list) -> list:
+    """Códigos con algún cambio (sin duplicados), p. ej. para regenerar sus cartas con --regenerar."""
+    return list(dict.fromkeys(change["projectCode"] for change in changes))
+
+
+# ─────────────────────────────────────────────
+# 💾 ÚLTIMO SNAPSHOT GUARDADO
+# ─────────────────────────────────────────────
+class ScheduleStore:
+    """Último calendario conocido por proyecto (SQLite, seguro entre hilos)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def known_projects(self, codes: list) -> set:
+        """Códigos que ya tienen un snapshot guardado."""
+        with self._lock:
+            return {
+                row[0] for code in codes
+                for row in self._conn.execute(
+                    "SELECT project_code FROM schedule_projects WHERE project_code = ?", (code,)
+                )
+            }
+
+    def load(self, codes: list) -> dict:
+        """Calendario guardado de cada código: código → {(tipo, periodo): fecha}."""
+        schedules = {code: {} for code in codes}
+        with self._lock:
+            for code in codes:
+                rows = self._conn.execute(
+                    "SELECT report_type, report_period, scheduled_date FROM report_schedule "
+                    "WHERE project_code = ?",
+                    (code,)
+                )
+                schedules[code] = {(report_type, period): date for report_type, period, date in rows}
+        return schedules
+
+    def save(self, schedules: dict):
+        """Reemplaza, en una sola transacción, el calendario guardado de los códigos recibidos."""
+        now = self._now()
+        with self._lock, self._conn:
+            for code, schedule in schedules.items():
+                self._conn.execute("DELETE FROM report_schedule WHERE project_code = ?", (code,))
+                self._conn.executemany(
+                    "INSERT INTO report_schedule "
+                    "(project_code, report_type, report_period, scheduled_date, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(code, report_type, period, date, now) for (report_type, period), date in schedule.items()]
+                )
+                self._conn.execute(
+                    "INSERT INTO schedule_projects (project_code, taken_at) VALUES (?, ?) "
+                    "ON CONFLICT(project_code) DO UPDATE SET taken_at = excluded.taken_at",
+                    (code, now)
+                )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ─────────────────────────────────────────────
+# 🔹 DETECCIÓN DE CAMBIOS
+# ─────────────────────────────────────────────
+class ScheduleChangeDetector:
+    """Compara el snapshot actual de un conjunto de proyectos con el último guardado."""
+
+    def __init__(self, store: ScheduleStore):
+        self.store = store
+
+    def detect(self, data_by_code: dict, commit: bool = True) -> dict:
+        """
+        data_by_code: código → datos del proyecto (integrados o snapshot crudo).
+        Solo se comparan los proyectos recibidos: los que no se pudieron consultar deben
+        quedar fuera, o todos sus informes aparecerían como eliminados.
+        Un proyecto sin snapshot previo queda como línea base (sin cambios).
+        Con commit=True el snapshot actual pasa a ser el guardado.
+        Retorna {"changes": [...], "baseline": [códigos nuevos], "projects": n}.
+        """
+        codes = [code.strip() for code in data_by_code]
+        current = {
+            code.strip(): report_schedule(data)
+            for code, data in data_by_code.items()
+        }
+        known = self.store.known_projects(codes)
+        previous = self.store.load([code for code in codes if code in known])
+
+        changes = []
+        for code in codes:
+            if code in known:
+                changes.extend(diff_schedules(code, previous[code], current[code]))
+
+        if commit:
+            self.store.save(current)
+
+        counts = {}
+        for change in changes:
+            counts[change["change"]] = counts.get(change["change"], 0) + 1
+        return {
+            "changes": changes,
+            "counts": counts,
+            "baseline": [code for code in codes if code not in known],
+            "projects": len(codes)
+        }
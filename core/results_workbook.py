@@ -0,0 +1,202 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+"""
+core/results_workbook.py
+Planilla Excel con el resultado de cada carta de un lote, escrita a medida que
+terminan (sin DataFrame en memoria). Cada fila se agrega de inmediato a un archivo
+de respaldo (JSON Lines, con fsync) y cada cierto número de filas o segundos se
+regenera la planilla con openpyxl en modo write-only, leyendo el respaldo en streaming.
+Si la corrida se cae se pierde a lo más el último intervalo de la planilla, y ninguna
+fila del respaldo: al volver a abrir la misma ruta se continúa desde ahí.
+
+Formato igual al de datos_finales_cartasp.xlsx: una hoja 'Hoja1', encabezados en la
+fila 1, 'Código' como primera columna y fechas como fechas de Excel.
+"""
+
+SHEET_NAME = "Hoja1"
+
+# (encabezado, clave del resultado, ancho)
+RESULT_COLUMNS = [
+    ("Código", "projectCode", 18),
+    ("Informe", "reportType", 24),
+    ("Fecha informe", "reportDate", 14),
+    ("Tipo carta", "letterType", 14),
+    ("Destinatario", "recipient", 32),
+    ("Ruta salida", "outputPath", 60),
+    ("Estado", "status", 10),
+    ("Etapa error", "stage", 12),
+    ("Error", "error", 50),
+    ("Segundos datos", "fetchSeconds", 15),
+    ("Segundos carta", "renderSeconds", 15),
+    ("Segundos total", "totalSeconds", 15),
+    ("Fecha proceso", "processedAt", 18)
+]
+DATE_FORMAT = "DD/MM/YYYY HH:MM:SS"
+REPORT_DATE_FORMAT = "DD/MM/YYYY"
+
+
+class ResultsWorkbookWriter:
+    """Escritor incremental y seguro entre hilos de la planilla de resultados de un lote."""
+
+    def __init__(self, path: str, flush_every: int = 500, flush_seconds: float = 60.0):
+        self.path = path
+        self.spool_path = path + ".partial.jsonl"
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # True si quedó un respaldo de una corrida interrumpida: se continúa sobre él
+        # (las cartas ya registradas no deben volver a agregarse como 'skipped')
+        self.resumed = os.path.exists(self.spool_path)
+        if self.resumed:
+            self._drop_partial_line()
+        self._spool = open(self.spool_path, "ab")
+        self.rows = self._count_rows() if self.resumed else 0
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        if self.resumed:
+            print(f"📒 Se retoma la planilla de resultados con {self.rows} filas previas.")
+
+    def _drop_partial_line(self):
+        """Descarta una última línea incompleta (corte durante la escritura)."""
+        with open(self.spool_path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                f.truncate(end)
+
+    def _count_rows(self) -> int:
+        with open(self.spool_path, "rb") as f:
+            return sum(1 for line in f if line.strip())
+
+    # ─────────────────────────────────────────────
+    # 🔹 API
+    # ─────────────────────────────────────────────
+    def append(self, result: dict):
+        """Agrega la fila de una carta; regenera la planilla si corresponde."""
+        record = {key: result.get(key) for _, key, _ in RESULT_COLUMNS}
+        record["processedAt"] = record["processedAt"] or datetime.now().isoformat(timespec="seconds")
+        line = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            self._spool.write(line)
+            self._spool.flush()
+            os.fsync(self._spool.fileno())
+            self.rows += 1
+            self._pending += 1
+            due = (
+                self._pending >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_seconds
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Escribe la planilla con todas las filas hasta ahora (archivo temporal + os.replace)."""
+        # Un solo hilo regenera; los demás siguen agregando filas al respaldo
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            with self._lock:
+                self._pending = 0
+                self._last_flush = time.monotonic()
+                size = self._spool.tell()
+            self._write_workbook(size)
+        finally:
+            self._flush_lock.release()
+
+    def close(self):
+        """Planilla final; el respaldo se elimina solo si la planilla quedó escrita."""
+        with self._flush_lock:
+            with self._lock:
+                if self._spool.closed:
+                    return
+                size = self._spool.tell()
+                self._spool.close()
+            written = self._write_workbook(size)
+        if written:
+            os.remove(self.spool_path)
+            print(f"📊 Planilla de resultados: {self.path} ({self.rows} filas)")
+        else:
+            print(f"⚠️ Las filas quedaron en {self.spool_path}; vuelva a abrir la planilla con la misma ruta.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ─────────────────────────────────────────────
+    # 🔧 ESCRITURA
+    # ─────────────────────────────────────────────
+    def _records(self, size: int):
+        """Filas del respaldo hasta 'size' bytes (lo que estaba escrito al pedir la planilla)."""
+        consumed = 0
+        with open(self.spool_path, "rb") as f:
+            for raw in f:
+                consumed += len(raw)
+                if consumed > size:
+                    return
+                if raw.strip():
+                    yield json.loads(raw)
+
+    def _cell(self, sheet, key: str, value):
+        if key == "processedAt" and value:
+            cell = WriteOnlyCell(sheet, value=datetime.fromisoformat(value))
+            cell.number_format = DATE_FORMAT
+            return cell
+        if key == "reportDate" and isinstance(value, str):
+            try:
+                fecha = datetime.strptime(value.strip(), "%d/%m/%Y")
+            except ValueError:
+                return value  # se deja el texto original si no es dd/mm/yyyy
+            cell = WriteOnlyCell(sheet, value=fecha)
+            cell.number_format = REPORT_DATE_FORMAT
+            return cell
+        if key.endswith("Seconds") and value is not None:
+            return round(float(value), 3)
+        return value
+
+    def _write_workbook(self, size: int) -> bool:
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(SHEET_NAME)
+        for i, (_, _, width) in enumerate(RESULT_COLUMNS, start=1):
+            sheet.column_dimensions[get_column_letter(i)].width = width
+        sheet.freeze_panes = "A2"
+        sheet.auto_filter.ref = f"A1:{get_column_letter(len(RESULT_COLUMNS))}1"
+
+        header = []
+        for title, _, _ in RESULT_COLUMNS:
+            cell = WriteOnlyCell(sheet, value=title)
+            cell.font = Font(bold=True)
+            header.append(cell)
+        sheet.append(header)
+
+        for record in self._records(size):
+            sheet.append([self._cell(sheet, key, record.get(key)) for _, key, _ in RESULT_COLUMNS])
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(prefix=".resultados.", suffix=".xlsx", dir=directory)
+        os.close(fd)
+        try:
+            workbook.save(temp_path)
+            os.replace(temp_path, self.path)
+            return True
+        except PermissionError:
+            # Típico en Windows si la planilla está abierta en Excel: se reintenta en el próximo flush
+            print(f"⚠️ No se pudo actualizar {self.path} (¿abierta en Excel?); se reintentará.")
+            os.remove(temp_path)
+            return False
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
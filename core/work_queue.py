@@ -0,0 +1,301 @@
+import os
+import platform
+import sqlite3
+import threading
+import time
+from concurrent.futures import wait
+from datetime import datetime
+from architecture.data_access.integration_data_manager import IntegrationDataManager
+from architecture.document_processing.document_processor import DocumentProcessor
+from core.work_scheduler import WorkScheduler, get_scheduler, BATCH
+
+"""
+core/work_queue.py
+Cola de trabajo compartida (archivo SQLite en una carpeta común) para repartir
+un lote grande entre varios equipos. Cada nodo reclama códigos con un "lease"
+(arriendo con vencimiento), los procesa con el flujo normal de integración +
+DocumentProcessor y los marca como terminados. Los leases vencidos (nodo caído,
+equipo suspendido) vuelven a la cola y los toma otro nodo.
+
+Nota: SQLite depende del bloqueo de archivos del sistema; en carpetas de red
+debe usarse un recurso compartido SMB, no una carpeta sincronizada por OneDrive.
+"""
+
+STATUS_QUEUED = "queued"
+STATUS_LEASED = "leased"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue_tasks (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_code  TEXT NOT NULL,
+    letter_type   TEXT NOT NULL,
+    report_type   TEXT NOT NULL,
+    report_date   TEXT NOT NULL DEFAULT '',
+    status        TEXT NOT NULL,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    output_path   TEXT,
+    error         TEXT,
+    updated_at    TEXT NOT NULL,
+    UNIQUE (project_code, letter_type, report_type, report_date)
+)
+"""
+
+
+def default_node_id() -> str:
+    """Identificador del nodo: equipo + proceso (permite varios procesos por equipo)."""
+    return f"{platform.node()}-{os.getpid()}"
+
+
+class SharedWorkQueue:
+    """Cola SQLite con leases; cada operación es una transacción corta e independiente."""
+
+    def __init__(self, path: str, lease_seconds: float = 300.0, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        # isolation_level=None: las transacciones se controlan con BEGIN IMMEDIATE explícito
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute(_SCHEMA)
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def _transaction(self, operation):
+        """Ejecuta operation(conn) dentro de BEGIN IMMEDIATE (bloqueo de escritura entre procesos)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = operation(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    # ─────────────────────────────────────────────
+    # 🔹 PRODUCTOR
+    # ─────────────────────────────────────────────
+    def enqueue(self, codes: list, letter_type: str, report_type: str, report_date: str | None = None) -> int:
+        """Agrega los códigos a la cola (los ya existentes se ignoran). Retorna cuántos se agregaron."""
+        rows = [
+            (code.strip(), letter_type, report_type, report_date or "", STATUS_QUEUED, self._now())
+            for code in dict.fromkeys(codes) if code and code.strip()
+        ]
+
+        def operation(conn):
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO queue_tasks "
+                "(project_code, letter_type, report_type, report_date, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            return conn.total_changes - before
+
+        return self._transaction(operation)
+
+    # ─────────────────────────────────────────────
+    # 🔹 CONSUMIDOR
+    # ─────────────────────────────────────────────
+    def _reclaim_expired(self, conn) -> int:
+        now = time.time()
+        # Los que agotaron sus intentos quedan como fallidos; el resto vuelve a la cola
+        conn.execute(
+            "UPDATE queue_tasks SET status = ?, lease_owner = NULL, lease_expires = NULL, "
+            "error = COALESCE(error, 'lease vencido'), updated_at = ? "
+            "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+            (STATUS_FAILED, self._now(), STATUS_LEASED, now, self.max_attempts)
+        )
+        cursor = conn.execute(
+            "UPDATE queue_tasks SET status = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE status = ? AND lease_expires < ?",
+            (STATUS_QUEUED, self._now(), STATUS_LEASED, now)
+        )
+        return cursor.rowcount
+
+    def reclaim_expired(self) -> int:
+        """Devuelve a la cola los leases vencidos. Retorna cuántos se recuperaron."""
+        return self._transaction(self._reclaim_expired)
+
+    def claim(self, node_id: str, limit: int = 1) -> list:
+        """Reclama hasta 'limit' tareas para el nodo, recuperando antes los leases vencidos."""
+        def operation(conn):
+            self._reclaim_expired(conn)
+            rows = conn.execute(
+                "SELECT * FROM queue_tasks WHERE status = ? ORDER BY id LIMIT ?",
+                (STATUS_QUEUED, limit)
+            ).fetchall()
+            expires = time.time() + self.lease_seconds
+            for row in rows:
+                conn.execute(
+                    "UPDATE queue_tasks SET status = ?, lease_owner = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (STATUS_LEASED, node_id, expires, self._now(), row["id"])
+                )
+            return [dict(row) for row in rows]
+
+        return self._transaction(operation)
+
+    def renew(self, task_ids: list, node_id: str) -> int:
+        """Extiende los leases vigentes del nodo (latido mientras procesa)."""
+        if not task_ids:
+            return 0
+        placeholders = ", ".join("?" for _ in task_ids)
+
+        def operation(conn):
+            cursor = conn.execute(
+                f"UPDATE queue_tasks SET lease_expires = ? WHERE status = ? AND lease_owner = ? "
+                f"AND id IN ({placeholders})",
+                (time.time() + self.lease_seconds, STATUS_LEASED, node_id, *task_ids)
+            )
+            return cursor.rowcount
+
+        return self._transaction(operation)
+
+    def complete(self, task_id: int, node_id: str, output_path: str) -> bool:
+        """Marca la tarea como terminada si el nodo aún tiene su lease."""
+        def operation(conn):
+            cursor = conn.execute(
+                "UPDATE queue_tasks SET status = ?, output_path = ?, error = NULL, lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (STATUS_DONE, output_path, self._now(), task_id, STATUS_LEASED, node_id)
+            )
+            return cursor.rowcount == 1
+
+        return self._transaction(operation)
+
+    def fail(self, task_id: int, node_id: str, error: str) -> bool:
+        """Devuelve la tarea a la cola, o la marca fallida si agotó sus intentos."""
+        def operation(conn):
+            cursor = conn.execute(
+                "UPDATE queue_tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (self.max_attempts, STATUS_FAILED, STATUS_QUEUED, error, self._now(),
+                 task_id, STATUS_LEASED, node_id)
+            )
+            return cursor.rowcount == 1
+
+        return self._transaction(operation)
+
+    # ─────────────────────────────────────────────
+    # 📋 CONSULTAS
+    # ─────────────────────────────────────────────
+    def stats(self) -> dict:
+        """Tareas por estado y detalle de las fallidas."""
+        with self._lock:
+            by_status = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM queue_tasks GROUP BY status"
+            ).fetchall())
+            failed = [dict(row) for row in self._conn.execute(
+                "SELECT project_code, attempts, error FROM queue_tasks WHERE status = ?", (STATUS_FAILED,)
+            )]
+        return {"byStatus": by_status, "failed": failed}
+
+    def is_drained(self) -> bool:
+        """True si no quedan tareas en cola ni en proceso."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM queue_tasks WHERE status IN (?, ?)", (STATUS_QUEUED, STATUS_LEASED)
+            ).fetchone()
+        return row[0] == 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class QueueWorker:
+    """Nodo de procesamiento: reclama tareas, genera las cartas y reporta el resultado."""
+
+    def __init__(
+        self,
+        queue: SharedWorkQueue,
+        node_id: str | None = None,
+        output_dir: str | None = None,
+        batch_size: int = 4,
+        scheduler: WorkScheduler | None = None,
+        integration: IntegrationDataManager | None = None,
+        processor: DocumentProcessor | None = None
+    ):
+        self.queue = queue
+        self.node_id = node_id or default_node_id()
+        self.output_dir = output_dir
+        self.batch_size = batch_size
+        self.scheduler = scheduler or get_scheduler()
+        self.integration = integration or IntegrationDataManager()
+        self.processor = processor or DocumentProcessor()
+        self.processed = 0
+        self.failed = 0
+
+    def _process(self, task: dict) -> str:
+        data = self.integration.get_integrated_data(task["project_code"])
+        # Nombre por contenido y escritura atómica: sin colisiones entre nodos en la carpeta compartida
+        output_path, _, _ = self.processor.save_letter(
+            data, task["report_type"], task["report_date"] or None, task["letter_type"], self.output_dir
+        )
+        return output_path
+
+    def _heartbeat(self, task_ids: list, stop_event: threading.Event):
+        # Se renueva el lease a un tercio de su duración
+        while not stop_event.wait(self.queue.lease_seconds / 3):
+            try:
+                self.queue.renew(task_ids, self.node_id)
+            except Exception as e:
+                # Típico en carpetas compartidas: "database is locked". Si el hilo muriera el
+                # lease vencería y otro nodo repetiría las tareas: se sigue intentando
+                print(f"⚠️ Nodo {self.node_id}: no se pudo renovar el lease ({e}); se reintentará.")
+
+    def run(self, poll_interval: float = 5.0, exit_when_drained: bool = True):
+        """
+        Procesa tareas hasta que la cola quede vacía (o indefinidamente si
+        exit_when_drained es False). Retorna (procesadas, fallidas) por este nodo.
+        """
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+        print(f"🛠️ Nodo {self.node_id} conectado a la cola {self.queue.path}")
+
+        while True:
+            tasks = self.queue.claim(self.node_id, self.batch_size)
+            if not tasks:
+                if exit_when_drained and self.queue.is_drained():
+                    break
+                # Quedan leases de otros nodos: se espera por si vencen
+                time.sleep(poll_interval)
+                continue
+
+            stop_event = threading.Event()
+            heartbeat = threading.Thread(
+                target=self._heartbeat, args=([t["id"] for t in tasks], stop_event), daemon=True
+            )
+            heartbeat.start()
+            try:
+                futures = {self.scheduler.submit(self._process, task, priority=BATCH): task for task in tasks}
+                wait(futures)
+            finally:
+                stop_event.set()
+
+            for future, task in futures.items():
+                try:
+                    output_path = future.result()
+                except Exception as e:
+                    self.failed += 1
+                    self.queue.fail(task["id"], self.node_id, str(e))
+                    print(f"❌ {task['project_code']}: {e}")
+                    continue
+                if self.queue.complete(task["id"], self.node_id, output_path):
+                    self.processed += 1
+                    print(f"✅ {task['project_code']} → {output_path}")
+                else:
+                    print(f"⚠️ {task['project_code']}: el lease venció antes de terminar (otro nodo lo retomó).")
+
+        print(f"🏁 Nodo {self.node_id}: {self.processed} procesadas, {self.failed} fallidas.")
+        return self.processed, self.failed
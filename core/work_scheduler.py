@@ -0,0 +1,172 @@
+import heapq
+import itertools
+import os
+import threading
+from concurrent.futures import Future
+
+"""
+core/work_scheduler.py
+Planificador de trabajo compartido con clases de prioridad.
+Las solicitudes interactivas (botón "Buscar" / "Generar" de la GUI) pasan delante
+de la cola; los trabajos por lotes ocupan la capacidad restante sin poder tomar
+los hilos reservados para lo interactivo.
+"""
+
+# Clases de prioridad (menor número = mayor prioridad)
+INTERACTIVE = 0
+BATCH = 1
+
+# Prioridad del trabajo que corre en cada hilo del planificador
+_current = threading.local()
+
+
+def current_priority() -> int | None:
+    """
+    Prioridad del trabajo que se ejecuta en el hilo actual, o None fuera del planificador.
+    Permite que recursos compartidos más abajo (p. ej. el limitador del OSB) atiendan
+    primero lo interactivo.
+    """
+    return getattr(_current, "priority", None)
+
+
+class WorkScheduler:
+    """Pool de hilos con cola de prioridad y cupos reservados para trabajo interactivo."""
+
+    def __init__(self, workers: int | None = None, reserved_interactive: int = 1):
+        self.workers = workers or max(8, (os.cpu_count() or 2) * 2)
+        # Hilos que los trabajos por lotes nunca pueden ocupar
+        self.reserved_interactive = min(reserved_interactive, self.workers - 1)
+
+        self._queue = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._threads = []
+        self._running = {INTERACTIVE: 0, BATCH: 0}
+        self._completed = {INTERACTIVE: 0, BATCH: 0}
+        self._shutdown = False
+
+    # ─────────────────────────────────────────────
+    # 🔹 API PÚBLICA
+    # ─────────────────────────────────────────────
+    def submit(self, func, *args, priority: int = BATCH, **kwargs) -> Future:
+        """Encola func(*args, **kwargs) con la prioridad indicada y retorna un Future."""
+        future = Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("El planificador ya fue detenido.")
+            heapq.heappush(self._queue, (priority, next(self._sequence), future, func, args, kwargs))
+            self._start_workers()
+            self._condition.notify_all()
+        return future
+
+    def shutdown(self, wait: bool = True):
+        """Detiene los hilos; los trabajos pendientes se cancelan."""
+        with self._condition:
+            self._shutdown = True
+            pending, self._queue = self._queue, []
+            self._condition.notify_all()
+        for _, _, future, _, _, _ in pending:
+            future.cancel()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def stats(self) -> dict:
+        """Trabajos en cola, en ejecución y completados por clase de prioridad."""
+        with self._condition:
+            queued = {INTERACTIVE: 0, BATCH: 0}
+            for priority, *_ in self._queue:
+                queued[priority] = queued.get(priority, 0) + 1
+            return {
+                "workers": self.workers,
+                "queued": {"interactive": queued[INTERACTIVE], "batch": queued[BATCH]},
+                "running": {"interactive": self._running[INTERACTIVE], "batch": self._running[BATCH]},
+                "completed": {"interactive": self._completed[INTERACTIVE], "batch": self._completed[BATCH]}
+            }
+
+    # ─────────────────────────────────────────────
+    # 🔧 HILOS DE TRABAJO
+    # ─────────────────────────────────────────────
+    def _start_workers(self):
+        # Los hilos se crean a demanda, hasta el máximo configurado
+        while len(self._threads) < min(self.workers, len(self._threads) + len(self._queue)):
+            thread = threading.Thread(
+                target=self._worker, name=f"scheduler-{len(self._threads) + 1}", daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _can_run(self, priority: int) -> bool:
+        if priority == INTERACTIVE:
+            return True
+        return self._running[BATCH] < self.workers - self.reserved_interactive
+
+    def _next_task(self):
+        with self._condition:
+            while True:
+                if self._shutdown:
+                    return None
+                if self._queue and self._can_run(self._queue[0][0]):
+                    task = heapq.heappop(self._queue)
+                    self._running[task[0]] += 1
+                    return task
+                self._condition.wait()
+
+    def _worker(self):
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+
+            priority, _, future, func, args, kwargs = task
+            _current.priority = priority
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(func(*args, **kwargs))
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                _current.priority = None
+                with self._condition:
+                    self._running[priority] -= 1
+                    self._completed[priority] += 1
+                    self._condition.notify_all()
+
+
+# ─────────────────────────────────────────────
+# 🌐 PLANIFICADOR COMPARTIDO DEL PROCESO
+# ─────────────────────────────────────────────
+_shared_scheduler = None
+_shared_lock = threading.Lock()
+
+
+def get_scheduler() -> WorkScheduler:
+    """Devuelve el planificador compartido por la GUI y los flujos por lotes."""
+    global _shared_scheduler
+    with _shared_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = WorkScheduler()
+        return _shared_scheduler
+
+
+# ─────────────────────────────────────────────
+# 🧾 TRABAJOS DEL DOMINIO
+# ─────────────────────────────────────────────
+def submit_integration(project_code: str, priority: int = BATCH) -> Future:
+    """Encola IntegrationDataManager.get_integrated_data para un proyecto."""
+    from architecture.data_access.integration_data_manager import IntegrationDataManager
+    return get_scheduler().submit(
+        lambda: IntegrationDataManager().get_integrated_data(project_code), priority=priority
+    )
+
+
+def submit_letter(
+    data: dict, report_type: str, report_date: str | None, letter_type: str, priority: int = BATCH, **kwargs
+) -> Future:
+    """Encola DocumentProcessor.generate_letter con datos ya integrados."""
+    from architecture.document_processing.document_processor import DocumentProcessor
+    return get_scheduler().submit(
+        DocumentProcessor().generate_letter, data, report_type, report_date, letter_type,
+        priority=priority, **kwargs
+    )
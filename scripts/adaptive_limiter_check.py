@@ -0,0 +1,107 @@
+"""
+scripts/adaptive_limiter_check.py
+Verifica el incremento aditivo de AdaptiveConcurrencyLimiter sin tocar el OSB:
+- llamadas rápidas en serie (uso bajo, p. ej. consultas sueltas de la GUI) no suben el límite;
+- llamadas rápidas con el límite copado sí lo suben;
+- una falla lo reduce a la mitad;
+- con el límite copado por lotes, una llamada interactiva toma el próximo cupo libre
+  antes que los lotes que ya esperaban.
+Termina con código 1 si alguna verificación falla.
+
+Uso:
+    python scripts/adaptive_limiter_check.py
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Asegurar que se puede importar desde la raíz del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.adaptive_limiter import AdaptiveConcurrencyLimiter
+
+
+def llamadas_en_serie(limiter: AdaptiveConcurrencyLimiter, n: int):
+    for _ in range(n):
+        with limiter.track():
+            pass
+
+
+def llamadas_saturadas(limiter: AdaptiveConcurrencyLimiter, rondas: int):
+    """En cada ronda ocupa todos los cupos a la vez y los libera juntos."""
+    for _ in range(rondas):
+        cupos = limiter.limit
+        dentro = threading.Barrier(cupos + 1)
+        salir = threading.Event()
+
+        def llamada():
+            with limiter.track():
+                dentro.wait()
+                salir.wait()
+
+        hilos = [threading.Thread(target=llamada) for _ in range(cupos)]
+        for hilo in hilos:
+            hilo.start()
+        dentro.wait()  # todas las llamadas en vuelo: límite copado
+        salir.set()
+        for hilo in hilos:
+            hilo.join()
+
+
+def interactiva_con_lotes(limiter: AdaptiveConcurrencyLimiter, lotes_en_espera: int) -> list:
+    """Copa el límite con lotes, encola más lotes y luego una interactiva; retorna el orden de entrada."""
+    orden = []
+    liberar = threading.Event()
+
+    def llamada(nombre: str, interactive: bool = False):
+        with limiter.track(interactive=interactive):
+            orden.append(nombre)
+            liberar.wait()
+
+    hilos = [threading.Thread(target=llamada, args=(f"lote{i}",)) for i in range(limiter.limit + lotes_en_espera)]
+    for hilo in hilos:
+        hilo.start()
+    time.sleep(0.2)  # los primeros ocupan todos los cupos; el resto espera
+    interactiva = threading.Thread(target=llamada, args=("interactiva", True))
+    interactiva.start()
+    time.sleep(0.2)
+    liberar.set()
+    for hilo in hilos + [interactiva]:
+        hilo.join()
+    return orden
+
+
+def main():
+    resultados = []
+
+    serie = AdaptiveConcurrencyLimiter(initial_limit=4)
+    llamadas_en_serie(serie, 50)
+    resultados.append(("50 llamadas en serie no cambian el límite (4)", serie.limit == 4, serie.limit))
+
+    saturado = AdaptiveConcurrencyLimiter(initial_limit=4)
+    llamadas_saturadas(saturado, 3)
+    resultados.append(("llamadas con el límite copado lo suben", saturado.limit > 4, saturado.limit))
+
+    falla = AdaptiveConcurrencyLimiter(initial_limit=8, cooldown=0)
+    try:
+        with falla.track():
+            raise TimeoutError("simulado")
+    except TimeoutError:
+        pass
+    resultados.append(("una falla reduce el límite a la mitad (8 → 4)", falla.limit == 4, falla.limit))
+
+    prioridad = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+    orden = interactiva_con_lotes(prioridad, lotes_en_espera=4)
+    resultados.append(("la interactiva entra antes que los lotes en espera",
+                       orden.index("interactiva") == 2, prioridad.limit))
+
+    for descripcion, ok, limite in resultados:
+        print(f"{'✅' if ok else '❌'} {descripcion} (límite: {limite})")
+    if not all(ok for _, ok, _ in resultados):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
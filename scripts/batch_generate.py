@@ -0,0 +1,104 @@
+"""
+scripts/batch_generate.py
+Genera cartas por lotes con bitácora SQLite reanudable.
+Si la corrida se interrumpe, basta con volver a ejecutar el mismo comando:
+se omiten las cartas ya guardadas y se reintentan solo las pendientes o fallidas.
+
+Uso:
+    python scripts/batch_generate.py codigos.txt --carta perentoria --informe "INFORME DE AVANCE"
+    python scripts/batch_generate.py codigos.txt --carta incumplimiento --informe "INFORME FINAL" \\
+        --journal lote_marzo.sqlite
+    python scripts/batch_generate.py codigos.txt --memory-report memoria_v2.json
+    python scripts/batch_generate.py codigos.txt --profile perfiles/
+    python scripts/batch_generate.py codigos.txt --resultados resultados_lote.xlsx
+    python scripts/batch_generate.py regenerar.txt --regenerar   # rehace cartas ya guardadas
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Asegurar que se puede importar desde la raíz del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from architecture.utils.memory_report import enable_memory_report, disable_memory_report
+from architecture.utils.code_list import leer_codigos
+from architecture.utils.profiling import enable_profiling, disable_profiling
+from core.batch_runner import BatchRunner
+from core.results_workbook import ResultsWorkbookWriter
+from core.work_scheduler import WorkScheduler
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Generación de cartas por lotes (reanudable).")
+    parser.add_argument("codigos", help="Archivo de texto con un código de proyecto por línea.")
+    parser.add_argument("--carta", default="perentoria", choices=["perentoria", "incumplimiento"],
+                        help="Tipo de carta a generar.")
+    parser.add_argument("--informe", default="INFORME DE AVANCE", help="Tipo de informe asociado.")
+    parser.add_argument("--fecha-informe", default=None, help="Fecha de entrega programada (dd/mm/yyyy).")
+    parser.add_argument("--journal", default="lote_cartas.sqlite", help="Ruta de la bitácora SQLite.")
+    parser.add_argument("--refetch", action="store_true",
+                        help="Volver a consultar SOAP aunque la bitácora tenga los datos.")
+    parser.add_argument("--regenerar", action="store_true",
+                        help="Volver a consultar y generar las cartas de los códigos listados aunque ya "
+                             "estén guardadas. Si se interrumpe, se retoma repitiendo el comando sin esta opción.")
+    parser.add_argument("--memory-report", metavar="RUTA_JSON", default=None,
+                        help="Medir memoria por etapa y módulo (tracemalloc) y escribir el reporte JSON. "
+                             "Los proyectos se procesan de a uno para atribuir bien la memoria.")
+    parser.add_argument("--profile", metavar="CARPETA", default=None,
+                        help="Perfilar la corrida y escribir pilas colapsadas (.collapsed) y .pstats en la carpeta.")
+    parser.add_argument("--resultados", metavar="RUTA_XLSX", default=None,
+                        help="Planilla Excel con una fila por carta (se actualiza durante la corrida).")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    codigos = leer_codigos(args.codigos)
+    if not codigos:
+        print("❌ El archivo no contiene códigos de proyecto.")
+        sys.exit(1)
+
+    scheduler = None
+    reporter = None
+    if args.memory_report:
+        reporter = enable_memory_report(label=os.path.basename(args.memory_report))
+        # Un solo hilo por lotes: las etapas no se mezclan entre proyectos
+        scheduler = WorkScheduler(workers=2, reserved_interactive=1)
+    if args.profile:
+        enable_profiling(label="lote")
+
+    results_writer = ResultsWorkbookWriter(args.resultados) if args.resultados else None
+    runner = BatchRunner(
+        journal_path=args.journal,
+        letter_type=args.carta,
+        report_type=args.informe,
+        report_date=args.fecha_informe,
+        scheduler=scheduler,
+        refetch=args.refetch,
+        regenerate=args.regenerar,
+        results_writer=results_writer
+    )
+    try:
+        summary = runner.run(codigos)
+    finally:
+        runner.close()
+        if results_writer is not None:
+            results_writer.close()
+        if reporter is not None:
+            reporter.write(args.memory_report)
+            disable_memory_report()
+        if args.profile:
+            paths = disable_profiling().write(args.profile)
+            print(f"🔬 Perfil escrito en: {', '.join(paths.values())}")
+
+    print(json.dumps(summary["journal"], indent=4, ensure_ascii=False))
+    fallidos = [r for r in summary["results"] if r["status"] == "failed"]
+    if fallidos:
+        print(f"\n⚠️ {len(fallidos)} proyectos fallaron; vuelva a ejecutar el comando para reintentarlos.")
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+scripts/excel_loader_benchmark.py
+Compara memoria (pico tracemalloc) y tiempo de los lectores del Excel institucional:
+pandas (DataFrame completo) vs openpyxl en streaming (índice completo y búsqueda de un código).
+
+Uso:
+    python scripts/excel_loader_benchmark.py                 # genera un libro de 50.000 filas
+    python scripts/excel_loader_benchmark.py --rows 10000
+    python scripts/excel_loader_benchmark.py --excel ruta/datos_finales_cartasp.xlsx
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Asegurar que se puede importar desde la raíz del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import Workbook
+from architecture.data_access.excel_data_manager import ExcelDataManager, SELECTED_FIELDS
+from architecture.data_access.excel_stream_loader import ExcelStreamLoader
+
+# Columnas extra para simular el ancho real de la base (solo se leen las seleccionadas)
+EXTRA_COLUMNS = [f"Columna extra {i}" for i in range(1, 21)]
+
+
+def generar_libro(path: str, rows: int):
+    """Genera un libro sintético con la estructura de datos_finales_cartasp.xlsx."""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Hoja1")
+    sheet.append(SELECTED_FIELDS + EXTRA_COLUMNS)
+
+    base_date = datetime(2024, 1, 1)
+    for i in range(rows):
+        sheet.append([
+            f"24PATI-{100000 + i}",
+            f"SYS-{i}",
+            f"EJECUTIVO TÉCNICO {i % 50}",
+            "Subdirección de Innovación",
+            f"Subdirector {i % 10}",
+            f"representante{i}@empresa.cl",
+            f"beneficiario{i}@empresa.cl",
+            f"director{i}@empresa.cl",
+            100000 + i,
+            2000 + i,
+            base_date + timedelta(days=i % 365),
+        ] + [f"valor {i}-{j}" for j in range(len(EXTRA_COLUMNS))])
+    workbook.save(path)
+
+
+def medir(nombre: str, funcion):
+    """
+    Ejecuta la función dos veces: una para medir tiempo y otra bajo tracemalloc
+    para medir el pico de memoria (tracemalloc distorsiona los tiempos).
+    """
+    inicio = time.perf_counter()
+    funcion()
+    duracion = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    resultado = funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{nombre:<32} {duracion:>9.2f} s {pico / (1024 * 1024):>10.1f} MiB")
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de lectores del Excel institucional.")
+    parser.add_argument("--rows", type=int, default=50000, help="Filas del libro sintético.")
+    parser.add_argument("--excel", help="Usar un libro existente en lugar de generar uno.")
+    args = parser.parse_args()
+
+    temp_dir = None
+    excel_path = args.excel
+    if not excel_path:
+        temp_dir = tempfile.TemporaryDirectory()
+        excel_path = os.path.join(temp_dir.name, "datos_finales_cartasp.xlsx")
+        print(f"🧪 Generando libro sintético de {args.rows} filas...")
+        generar_libro(excel_path, args.rows)
+
+    try:
+        print(f"\n{'Lector':<32} {'Tiempo':>11} {'Pico mem.':>14}")
+        print("-" * 60)
+        pandas_manager = ExcelDataManager(excel_path, loader="pandas")
+        index_pandas = medir("pandas (índice completo)", pandas_manager._read_rows)
+
+        loader = ExcelStreamLoader(excel_path, SELECTED_FIELDS)
+        index_stream = medir("openpyxl (índice completo)", loader.build_index)
+
+        codes = list(index_stream)
+        if codes:
+            medir("openpyxl (buscar primer código)", lambda: loader.find_project(codes[0]))
+            medir("openpyxl (buscar último código)", lambda: loader.find_project(codes[-1]))
+
+        print("-" * 60)
+        iguales = set(index_pandas) == set(index_stream)
+        print(f"Códigos indexados: pandas={len(index_pandas)} openpyxl={len(index_stream)} "
+              f"({'coinciden' if iguales else 'NO coinciden'})")
+    finally:
+        if temp_dir:
+            temp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
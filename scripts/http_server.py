@@ -0,0 +1,41 @@
+"""
+scripts/http_server.py
+Inicia el servicio HTTP local de integración y generación de cartas.
+
+Uso:
+    python scripts/http_server.py                  # http://127.0.0.1:8765
+    python scripts/http_server.py --port 9000
+    python scripts/http_server.py --profile perfiles/   # perfil escrito al detener (Ctrl+C)
+
+Ejemplos de consumo:
+    curl http://127.0.0.1:8765/projects/24PATI-272023
+    curl -X POST http://127.0.0.1:8765/letters -o carta.docx \\
+        -d '{"projectCode": "24PATI-272023", "letterType": "perentoria", "reportType": "INFORME DE AVANCE"}'
+"""
+
+import argparse
+import os
+import sys
+
+# Asegurar que se puede importar desde la raíz del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from architecture.utils.profiling import enable_profiling, disable_profiling
+from services.http_service import serve
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servicio HTTP local de cartas perentorias.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interfaz de escucha (por defecto solo local).")
+    parser.add_argument("--port", type=int, default=8765, help="Puerto de escucha.")
+    parser.add_argument("--profile", metavar="CARPETA", default=None,
+                        help="Perfilar las solicitudes y escribir pilas colapsadas y .pstats al detener el servicio.")
+    args = parser.parse_args()
+    if args.profile:
+        enable_profiling(label="servicio_http")
+    try:
+        serve(args.host, args.port)
+    finally:
+        if args.profile:
+            paths = disable_profiling().write(args.profile)
+            print(f"🔬 Perfil escrito en: {', '.join(paths.values())}")
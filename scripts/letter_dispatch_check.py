@@ -0,0 +1,216 @@
+"""
+scripts/letter_dispatch_check.py
+Verifica el envío masivo de cartas (core/letter_dispatch.py) contra un servidor SMTP
+local de prueba incluido aquí (sin dependencias ni servidor real):
+- reutilización: varias cartas por una sola conexión del pool;
+- omisión: cartas sin destinatario válido o sin archivo no se envían;
+- rechazo: un destinatario rechazado (550) queda 'failed' y se reintenta en otra corrida;
+- sin reenvío: una segunda corrida no vuelve a enviar lo ya aceptado;
+- sesión vencida: si el servidor cortó una sesión inactiva del pool, se reintenta con
+  una conexión nueva y la carta sale (no queda 'unconfirmed');
+- corte después de DATA: la carta queda 'unconfirmed' y no se reenvía.
+Termina con código 1 si alguna verificación falla.
+
+Uso:
+    python scripts/letter_dispatch_check.py
+"""
+
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+
+# Asegurar que se puede importar desde la raíz del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.letter_dispatch import (
+    LetterDispatcher,
+    SendLog,
+    SMTPConnectionPool,
+    STATUS_FAILED,
+    STATUS_SENT,
+    STATUS_SKIPPED,
+    STATUS_UNCONFIRMED
+)
+
+DOMINIO = "prueba.local"
+RECHAZADO = f"rechazo@{DOMINIO}"
+CORTE_DATA = f"corte@{DOMINIO}"
+
+
+# ─────────────────────────────────────────────
+# 📮 SERVIDOR SMTP DE PRUEBA
+# ─────────────────────────────────────────────
+class _SesionSMTP(socketserver.StreamRequestHandler):
+    """Subconjunto de SMTP suficiente para smtplib (sin TLS ni autenticación)."""
+
+    def _responder(self, linea: str):
+        self.wfile.write((linea + "\r\n").encode("ascii"))
+        self.wfile.flush()
+
+    def handle(self):
+        self.server.registrar(self.request)
+        try:
+            self._atender()
+        finally:
+            self.server.olvidar(self.request)
+
+    def _atender(self):
+        self._responder(f"220 {DOMINIO} SMTP de prueba")
+        destinatarios = []
+        while True:
+            linea = self.rfile.readline()
+            if not linea:
+                return
+            comando = linea.decode("ascii", "replace").strip()
+            verbo = comando.split(" ", 1)[0].upper()
+            if verbo in ("EHLO", "HELO"):
+                self._responder(f"250 {DOMINIO}")
+            elif verbo == "MAIL":
+                destinatarios = []
+                self._responder("250 OK")
+            elif verbo == "RCPT":
+                direccion = comando.split(":", 1)[1].strip().strip("<>")
+                if direccion == RECHAZADO:
+                    self._responder("550 Destinatario rechazado")
+                else:
+                    destinatarios.append(direccion)
+                    self._responder("250 OK")
+            elif verbo == "DATA":
+                self._responder("354 Termine con <CRLF>.<CRLF>")
+                cuerpo = []
+                while True:
+                    linea = self.rfile.readline()
+                    if not linea or linea in (b".\r\n", b".\n"):
+                        break
+                    cuerpo.append(linea)
+                if CORTE_DATA in destinatarios:
+                    # Corte sin confirmar: el mensaje llegó pero el cliente no recibe el 250
+                    self.server.recibir(destinatarios, b"".join(cuerpo))
+                    return
+                self.server.recibir(destinatarios, b"".join(cuerpo))
+                self._responder("250 Aceptado")
+            elif verbo in ("RSET", "NOOP"):
+                self._responder("250 OK")
+            elif verbo == "QUIT":
+                self._responder("221 Adiós")
+                return
+            else:
+                self._responder("502 No implementado")
+
+
+class ServidorSMTPDePrueba(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SesionSMTP)
+        self._lock = threading.Lock()
+        self._sockets = set()
+        self.recibidos = []
+
+    def registrar(self, sock):
+        with self._lock:
+            self._sockets.add(sock)
+
+    def olvidar(self, sock):
+        with self._lock:
+            self._sockets.discard(sock)
+
+    def recibir(self, destinatarios: list, cuerpo: bytes):
+        with self._lock:
+            self.recibidos.extend(destinatarios)
+
+    def cortar_sesiones(self):
+        """Cierra todas las sesiones abiertas (como un servidor que corta conexiones inactivas)."""
+        with self._lock:
+            sockets = list(self._sockets)
+        for sock in sockets:
+            try:
+                sock.shutdown(2)
+            except OSError:
+                pass
+
+
+# ─────────────────────────────────────────────
+# 🔎 VERIFICACIONES
+# ─────────────────────────────────────────────
+def main():
+    servidor = ServidorSMTPDePrueba()
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    port = servidor.server_address[1]
+    resultados = []
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        def carta(codigo: str, destinatario: str, existe: bool = True) -> dict:
+            path = os.path.join(carpeta, f"{codigo}_Carta.docx")
+            if existe:
+                with open(path, "wb") as f:
+                    f.write(b"PK docx de prueba " + codigo.encode("ascii"))
+            return {"projectCode": codigo, "letterType": "perentoria", "reportType": "INFORME FINAL",
+                    "recipient": destinatario, "path": path}
+
+        normales = [carta(f"CHK-{i}", f"beneficiario{i}@{DOMINIO}") for i in range(5)]
+        omitidas = [carta("SIN-CORREO", "SIN CORREO REGISTRADO"), carta("SIN-ARCHIVO", f"x@{DOMINIO}", existe=False)]
+        rechazada = carta("RECHAZO", RECHAZADO)
+
+        send_log = SendLog(os.path.join(carpeta, "envios.sqlite"))
+        pool = SMTPConnectionPool("127.0.0.1", port, starttls=False, size=1)
+        dispatcher = LetterDispatcher(pool, send_log, f"cartas@{DOMINIO}", rate_per_minute=0)
+        try:
+            # 1️⃣ Primera corrida: una sola conexión para todas las cartas
+            resumen = dispatcher.dispatch(normales + omitidas + [rechazada])
+            estados = {r["projectCode"]: r["status"] for r in resumen["results"]}
+            resultados.append(("5 cartas enviadas por una sola conexión",
+                               resumen["sent"] == 5 and pool.connections_opened == 1,
+                               f"enviadas={resumen['sent']}, conexiones={pool.connections_opened}"))
+            resultados.append(("sin destinatario o sin archivo se omiten",
+                               estados["SIN-CORREO"] == STATUS_SKIPPED and estados["SIN-ARCHIVO"] == STATUS_SKIPPED,
+                               f"{estados['SIN-CORREO']}, {estados['SIN-ARCHIVO']}"))
+            resultados.append(("destinatario rechazado queda 'failed'",
+                               estados["RECHAZO"] == STATUS_FAILED, estados["RECHAZO"]))
+
+            # 2️⃣ Segunda corrida: nada se reenvía; el rechazado se reintenta
+            recibidos_antes = len(servidor.recibidos)
+            resumen = dispatcher.dispatch(normales + [rechazada])
+            estados = {r["projectCode"]: r["status"] for r in resumen["results"]}
+            resultados.append(("la segunda corrida no reenvía lo ya aceptado",
+                               len(servidor.recibidos) == recibidos_antes
+                               and all(estados[c["projectCode"]] == STATUS_SKIPPED for c in normales),
+                               f"mensajes nuevos={len(servidor.recibidos) - recibidos_antes}"))
+            resultados.append(("el rechazado se reintenta en otra corrida",
+                               estados["RECHAZO"] == STATUS_FAILED and send_log.items(STATUS_FAILED)[0]["attempts"] == 2,
+                               f"intentos={send_log.items(STATUS_FAILED)[0]['attempts']}"))
+
+            # 3️⃣ Sesión del pool cortada por el servidor: reintento con conexión nueva
+            servidor.cortar_sesiones()
+            conexiones_antes = pool.connections_opened
+            resultado = dispatcher.send_one(carta("VENCIDA", f"vencida@{DOMINIO}"))
+            resultados.append(("sesión vencida: se reintenta con conexión nueva y sale",
+                               resultado["status"] == STATUS_SENT and pool.connections_opened == conexiones_antes + 1,
+                               f"{resultado['status']}, conexiones nuevas={pool.connections_opened - conexiones_antes}"))
+
+            # 4️⃣ Corte después de DATA: sin confirmar y sin reenvío posterior
+            cortada = carta("CORTE", CORTE_DATA)
+            primero = dispatcher.send_one(cortada)
+            segundo = dispatcher.send_one(cortada)
+            entregas = servidor.recibidos.count(CORTE_DATA)
+            resultados.append(("corte después de DATA queda 'unconfirmed' y no se reenvía",
+                               primero["status"] == STATUS_UNCONFIRMED and segundo["status"] == STATUS_SKIPPED
+                               and entregas == 1,
+                               f"{primero['status']}, luego {segundo['status']}, entregas={entregas}"))
+        finally:
+            pool.close()
+            send_log.close()
+            servidor.shutdown()
+            servidor.server_close()
+
+    for descripcion, ok, detalle in resultados:
+        print(f"{'✅' if ok else '❌'} {descripcion} ({detalle})")
+    if not all(ok for _, ok, _ in resultados):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+scripts/letter_render_benchmark.py
+Compara cartas por segundo entre python-docx (modelo de objetos por carta) y el
+renderizado rápido sobre document.xml precompilado, y verifica que ambos caminos
+producen exactamente las mismas partes del paquete (nombres, orden y contenido).
+
+Uso:
+    python scripts/letter_render_benchmark.py                   # 200 cartas por camino
+    python scripts/letter_render_benchmark.py --letters 1000 --letter-type incumplimiento
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+# Asegurar que se puede importar desde la raíz del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from architecture.document_processing.document_processor import DocumentProcessor
+from core.letter_generator import LetterGenerator
+
+
+def datos_de_prueba(i: int) -> dict:
+    """Proyecto integrado sintético con la forma de IntegrationDataManager.integrate."""
+    return {
+        "projectCode": f"24PATI-{100000 + i}",
+        "projectinfo": {
+            "projectCode": f"24PATI-{100000 + i}",
+            "projectName": f"Desarrollo de prototipo & validación comercial {i}",
+            "beneficiaryName": f"Empresa <Beneficiaria> {i} Spa",
+            "legalRepresentative": f"Representante Legal {i}",
+            "legalRepresentativeEmail": f"representante{i}@empresa.cl",
+            "resolutionDate": "05/03/2024",
+            "resolutionNumber": 1000 + i,
+            "subdirector": "Subdirector de Innovación",
+            "subdirection": "Subdirección de Innovación",
+            "technicalExecutiveName": f"Ejecutivo Técnico {i % 50}"
+        },
+        "reports": [
+            {"reportType": "INFORME DE AVANCE", "scheduledDeliveryDate": "28/01/2024"},
+            {"reportType": "INFORME DE AVANCE", "scheduledDeliveryDate": "28/11/2024"},
+            {"reportType": "INFORME FINAL", "scheduledDeliveryDate": "01/12/2025"}
+        ]
+    }
+
+
+def partes(docx_bytes: bytes) -> list:
+    with zipfile.ZipFile(io.BytesIO(docx_bytes)) as package:
+        return [(info.filename, package.read(info)) for info in package.infolist()]
+
+
+def medir(nombre: str, letters: int, funcion) -> float:
+    # DocumentProcessor informa cada carta por consola: se silencia durante la medición
+    with contextlib.redirect_stdout(io.StringIO()):
+        funcion(0)  # calentamiento (compila la plantilla en el camino rápido)
+        inicio = time.perf_counter()
+        for i in range(letters):
+            funcion(i)
+        duracion = time.perf_counter() - inicio
+    print(f"{nombre:<36} {duracion:>9.2f} s {letters / duracion:>12.1f}")
+    return letters / duracion
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de renderizado de cartas .docx.")
+    parser.add_argument("--letters", type=int, default=200, help="Cartas por camino.")
+    parser.add_argument("--letter-type", default="perentoria", choices=["perentoria", "incumplimiento"])
+    args = parser.parse_args()
+
+    lento = DocumentProcessor(fast_render=False)
+    rapido = DocumentProcessor(fast_render=True)
+
+    def generar(processor):
+        return lambda i: processor.generate_letter_bytes(
+            datos_de_prueba(i), "INFORME DE AVANCE", "28/11/2024", args.letter_type
+        )
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        iguales = all(partes(generar(lento)(i)) == partes(generar(rapido)(i)) for i in range(5))
+
+    print(f"\n{'Camino':<36} {'Tiempo':>11} {'Cartas/s':>12}")
+    print("-" * 62)
+    base = medir("python-docx (DocumentProcessor)", args.letters, generar(lento))
+    fast = medir("rápido (DocumentProcessor)", args.letters, generar(rapido))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        generadores = []
+        for fast_render in (False, True):
+            generador = LetterGenerator(fast_render=fast_render)
+            generador.output_folder = os.path.join(temp_dir, str(fast_render))
+            os.makedirs(generador.output_folder)
+            generadores.append(generador)
+
+        def carta_basica(generador):
+            return lambda i: generador.generar_carta(
+                f"24PATI-{100000 + i}", "Generar carta perentoria", "INFORME DE AVANCE",
+                {"nombreProyecto": f"Proyecto {i}", "beneficiario": f"Empresa {i}", "representanteLegal": "R. Legal"}
+            )
+
+        medir("python-docx (LetterGenerator)", args.letters, carta_basica(generadores[0]))
+        medir("rápido (LetterGenerator)", args.letters, carta_basica(generadores[1]))
+        with open(carta_basica(generadores[0])(0), "rb") as a, open(carta_basica(generadores[1])(0), "rb") as b:
+            iguales = iguales and partes(a.read()) == partes(b.read())
+
+    print("-" * 62)
+    print(f"Aceleración DocumentProcessor: x{fast / base:.1f}")
+    print(f"Partes del .docx idénticas entre caminos: {'sí' if iguales else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
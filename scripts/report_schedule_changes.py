@@ -0,0 +1,104 @@
+"""
+scripts/report_schedule_changes.py
+Compara el calendario de informes de un snapshot (JSON Lines de scripts/soap_query.py)
+con el último guardado y muestra solo los informes agregados, eliminados o reprogramados.
+Los proyectos que fallaron en la exportación no están en el snapshot y no se comparan.
+
+Uso:
+    python scripts/soap_query.py --codigos cartera.txt --salida snapshot.jsonl
+    python scripts/report_schedule_changes.py snapshot.jsonl --salida cambios.csv \\
+        --afectados regenerar.txt
+    python scripts/batch_generate.py regenerar.txt --regenerar    # solo las cartas afectadas
+    python scripts/report_schedule_changes.py snapshot.jsonl --sin-guardar   # solo mostrar
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+# Asegurar que se puede importar desde la raíz del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.report_schedule import ScheduleChangeDetector, ScheduleStore, affected_codes
+
+CHANGE_COLUMNS = ["projectCode", "reportType", "reportPeriod", "change", "previousDate", "currentDate"]
+CHANGE_ICONS = {"added": "➕", "removed": "➖", "rescheduled": "📅"}
+
+
+def leer_snapshots(path: str, chunk_size: int = 500):
+    """Entrega el snapshot por tramos {código: datos} para no cargar todo el archivo."""
+    chunk = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            snapshot = json.loads(line)
+            chunk[snapshot["projectCode"]] = snapshot
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = {}
+    if chunk:
+        yield chunk
+
+
+def escribir_cambios(path: str, changes: list):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            writer = csv.DictWriter(f, fieldnames=CHANGE_COLUMNS)
+            writer.writeheader()
+            writer.writerows(changes)
+        else:
+            f.writelines(json.dumps(change, ensure_ascii=False) + "\n" for change in changes)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Cambios en el calendario de informes entre snapshots.")
+    parser.add_argument("snapshot", help="Snapshot JSON Lines exportado con scripts/soap_query.py --codigos.")
+    parser.add_argument("--base", default="calendario_informes.sqlite", help="Base SQLite con el último snapshot.")
+    parser.add_argument("--salida", metavar="RUTA", default=None, help="Escribir los cambios (.jsonl o .csv).")
+    parser.add_argument("--afectados", metavar="ARCHIVO", default=None,
+                        help="Escribir los códigos con cambios (uno por línea) para regenerar sus cartas.")
+    parser.add_argument("--sin-guardar", action="store_true",
+                        help="Solo comparar; no reemplazar el snapshot guardado.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    store = ScheduleStore(args.base)
+    detector = ScheduleChangeDetector(store)
+    changes, baseline, projects = [], 0, 0
+    try:
+        for chunk in leer_snapshots(args.snapshot):
+            result = detector.detect(chunk, commit=not args.sin_guardar)
+            changes.extend(result["changes"])
+            baseline += len(result["baseline"])
+            projects += result["projects"]
+    finally:
+        store.close()
+
+    for change in changes:
+        print(f"{CHANGE_ICONS[change['change']]} {change['projectCode']} | {change['reportType']} "
+              f"{change['reportPeriod']}: {change['previousDate'] or '—'} → {change['currentDate'] or '—'}")
+    if args.salida:
+        escribir_cambios(args.salida, changes)
+    if args.afectados:
+        with open(args.afectados, "w", encoding="utf-8") as f:
+            f.writelines(f"{code}\n" for code in affected_codes(changes))
+
+    counts = {}
+    for change in changes:
+        counts[change["change"]] = counts.get(change["change"], 0) + 1
+    print(json.dumps({
+        "proyectos": projects,
+        "lineaBase": baseline,
+        "cambios": counts,
+        "proyectosAfectados": len(affected_codes(changes))
+    }, indent=4, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+scripts/send_letters.py
+Envía por correo las cartas guardadas en una bitácora de lote (scripts/batch_generate.py)
+usando conexiones SMTP reutilizadas, varios workers y un límite de envíos por minuto.
+La bitácora de envíos (SQLite) evita que una carta salga dos veces: volver a ejecutar
+el comando solo reintenta las fallidas.
+
+La contraseña se lee de la variable de entorno CARTAS_SMTP_PASSWORD.
+
+Uso:
+    python scripts/send_letters.py lote_cartas.sqlite --smtp-host smtp.office365.com \\
+        --usuario cartas@corfo.cl --remitente cartas@corfo.cl
+    python scripts/send_letters.py lote_cartas.sqlite --smtp-host localhost --smtp-port 8025 \\
+        --sin-tls --remitente pruebas@localhost          # servidor local (aiosmtpd)
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Asegurar que se puede importar desde la raíz del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.batch_journal import BatchJournal
+from core.letter_dispatch import (
+    LetterDispatcher,
+    SendLog,
+    SMTPConnectionPool,
+    STATUS_FAILED,
+    STATUS_UNCONFIRMED,
+    items_from_journal
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Envío masivo de cartas generadas por SMTP.")
+    parser.add_argument("journal", help="Bitácora SQLite del lote (cartas guardadas).")
+    parser.add_argument("--envios", default="envios_cartas.sqlite", help="Bitácora SQLite de envíos.")
+    parser.add_argument("--smtp-host", required=True, help="Servidor SMTP.")
+    parser.add_argument("--smtp-port", type=int, default=587, help="Puerto SMTP.")
+    parser.add_argument("--usuario", default=None, help="Usuario SMTP (sin usuario no se autentica).")
+    parser.add_argument("--remitente", required=True, help="Dirección del remitente (From).")
+    parser.add_argument("--ssl", action="store_true", help="Conectar con SMTP sobre SSL (puerto 465).")
+    parser.add_argument("--sin-tls", action="store_true", help="No usar STARTTLS (solo servidores locales).")
+    parser.add_argument("--conexiones", type=int, default=2, help="Conexiones SMTP simultáneas.")
+    parser.add_argument("--por-minuto", type=float, default=30, help="Máximo de mensajes por minuto.")
+    parser.add_argument("--reintentar-no-confirmados", action="store_true",
+                        help="Reenviar también las cartas cuyo envío quedó sin confirmar (posible duplicado).")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    journal = BatchJournal(args.journal)
+    items = items_from_journal(journal)
+    journal.close()
+    if not items:
+        print("❌ La bitácora no tiene cartas guardadas para enviar.")
+        sys.exit(1)
+
+    pool = SMTPConnectionPool(
+        host=args.smtp_host,
+        port=args.smtp_port,
+        username=args.usuario,
+        password=os.environ.get("CARTAS_SMTP_PASSWORD"),
+        starttls=not args.sin_tls and not args.ssl,
+        use_ssl=args.ssl,
+        size=args.conexiones
+    )
+    send_log = SendLog(args.envios)
+    dispatcher = LetterDispatcher(
+        pool, send_log, args.remitente,
+        rate_per_minute=args.por_minuto,
+        retry_unconfirmed=args.reintentar_no_confirmados
+    )
+    try:
+        summary = dispatcher.dispatch(items)
+    finally:
+        pool.close()
+        send_log.close()
+
+    print(json.dumps({k: v for k, v in summary.items() if k != "results"}, indent=4, ensure_ascii=False))
+    pendientes = [r for r in summary["results"] if r["status"] in (STATUS_FAILED, STATUS_UNCONFIRMED)]
+    for r in pendientes:
+        print(f"⚠️ {r['projectCode']} → {r['recipient']}: {r['status']} ({r['error']})")
+    if pendientes:
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,17 +5,27 @@ Script CLI para consultar el servicio SOAP de CORFO por código de proyecto.
 Uso:
     python scripts/soap_query.py 24CVIS-255755
     python scripts/soap_query.py 24CVI-264866 --informes
+
+Exportación masiva (un cliente SOAP compartido, varios códigos en paralelo):
+    python scripts/soap_query.py --codigos cartera.txt --salida snapshot.jsonl
+    python scripts/soap_query.py --codigos cartera.txt --salida snapshot.csv --workers 16 \
+        --fallidos fallidos.txt
 """
 
+import argparse
+import csv
 import sys
 import json
 import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 # Asegurar que se puede importar desde la raíz del proyecto
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from architecture.utils.code_list import leer_codigos
 from services.soap_client import SoapClient
-from architecture.data_access.soap_data_manager import SoapDataManager
+from architecture.data_access.soap_data_manager import SoapDataManager, REPORT_TYPES
 
 
 def consultar_proyecto(project_code: str, incluir_informes: bool = False):
@@ -67,16 +77,182 @@ def consultar_proyecto(project_code: str, incluir_informes: bool = False):
             print(json.dumps(ordered_items, indent=4, ensure_ascii=False, default=str))
 
 
-if __name__ == "__main__":
-    codigo = None
-    if len(sys.argv) >= 2:
-        codigo = sys.argv[1]
-    else:
-        codigo = input("Ingrese el código de proyecto a consultar: ").strip()
-
-    if not codigo:
-        print("❌ Debe ingresar un código de proyecto válido.")
+# ─────────────────────────────────────────────
+# 📦 EXPORTACIÓN MASIVA
+# ─────────────────────────────────────────────
+CSV_COLUMNS = ["projectCode", "seccion", "indice", "campo", "valor"]
+
+
+def consultar_snapshot(data_manager: SoapDataManager, project_code: str) -> dict:
+    """
+    Las 4 llamadas SOAP de un proyecto sobre el cliente compartido.
+    SoapClient retorna None cuando una llamada falla: en ese caso se lanza un error para
+    no exportar un snapshot incompleto como si el proyecto no tuviera informes.
+    """
+    client = data_manager.client
+    serialized_project = client.get_snapshot_proyectos(project_code)
+    if serialized_project is None:
+        raise RuntimeError("falló SEL_SNAPSHOT_PROYECTOS")
+    serialized_reports = {}
+    for tipo in REPORT_TYPES:
+        serialized_reports[tipo] = client.get_snapshot_informes(project_code, tipo)
+        if serialized_reports[tipo] is None:
+            raise RuntimeError(f"falló SEL_SNAPSHOT_INFORMES ({tipo})")
+
+    data = data_manager.build_project_data(serialized_project, serialized_reports)
+    if not data["projectInfo"]:
+        raise LookupError("sin datos del proyecto")
+    return {
+        "projectCode": project_code,
+        "projectInfo": dict(sorted(data["projectInfo"].items())),
+        "reports": [dict(sorted(report.items())) for report in data["reports"]]
+    }
+
+
+class SnapshotWriter:
+    """Escribe cada snapshot apenas llega: JSON Lines (un proyecto por línea) o CSV largo."""
+
+    def __init__(self, path: str, formato: str):
+        self.formato = formato
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        if formato == "csv":
+            # Formato largo (proyecto, sección, índice, campo, valor): las columnas no dependen
+            # de qué campos traiga cada proyecto y se puede escribir sin esperar al final
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(CSV_COLUMNS)
+
+    def write(self, snapshot: dict):
+        if self.formato == "jsonl":
+            self._file.write(json.dumps(snapshot, ensure_ascii=False, default=str) + "\n")
+            return
+        code = snapshot["projectCode"]
+        for campo, valor in snapshot["projectInfo"].items():
+            self._csv.writerow([code, "proyecto", 0, campo, valor])
+        indices = {}
+        for report in snapshot["reports"]:
+            tipo = report.get("tipo", "SIN TIPO")
+            indices[tipo] = indices.get(tipo, 0) + 1
+            for campo, valor in report.items():
+                if campo != "tipo":
+                    self._csv.writerow([code, tipo, indices[tipo], campo, valor])
+
+    def close(self):
+        self._file.close()
+
+
+def _progreso(hechos: int, total: int, fallidos: int, inicio: float, final: bool = False):
+    elapsed = time.perf_counter() - inicio
+    linea = f"⏳ {hechos}/{total} códigos | {hechos / elapsed if elapsed else 0:.1f}/s | {fallidos} fallidos"
+    if sys.stderr.isatty():
+        print("\r" + linea, end="\n" if final else "", file=sys.stderr, flush=True)
+    elif final or hechos % 50 == 0:
+        print(linea, file=sys.stderr, flush=True)
+
+
+def exportar_snapshots(codigos: list, salida: str, formato: str, workers: int = 8) -> dict:
+    """
+    Consulta todos los códigos con a lo más 'workers' proyectos en vuelo sobre un único
+    SoapClient (WSDL parseado una vez, pool HTTP compartido) y escribe cada resultado
+    en cuanto termina, en orden de llegada. Retorna el resumen con los fallidos.
+    """
+    data_manager = SoapDataManager(SoapClient(pool_size=workers))
+    writer = SnapshotWriter(salida, formato)
+    fallidos = []
+    pendientes = iter(codigos)
+    hechos = 0
+    inicio = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="soap-export") as executor:
+        en_vuelo = {}
+
+        def lanzar(n: int):
+            for code in pendientes:
+                en_vuelo[executor.submit(consultar_snapshot, data_manager, code)] = code
+                if len(en_vuelo) >= n:
+                    return
+
+        try:
+            # Ventana acotada: no se encolan todos los códigos ni se acumulan resultados
+            lanzar(workers * 2)
+            while en_vuelo:
+                listos, _ = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                for future in listos:
+                    code = en_vuelo.pop(future)
+                    try:
+                        writer.write(future.result())
+                    except Exception as e:
+                        fallidos.append({"projectCode": code, "error": str(e)})
+                    hechos += 1
+                    _progreso(hechos, len(codigos), len(fallidos), inicio)
+                lanzar(workers * 2)
+        finally:
+            writer.close()
+
+    elapsed = time.perf_counter() - inicio
+    _progreso(hechos, len(codigos), len(fallidos), inicio, final=True)
+    exportados = hechos - len(fallidos)
+    return {
+        "codigos": len(codigos),
+        "exportados": exportados,
+        "fallidos": fallidos,
+        "segundos": round(elapsed, 2),
+        "codigosPorSegundo": round(hechos / elapsed, 2) if elapsed else None,
+        "llamadasSoapPorSegundo": round(hechos * (1 + len(REPORT_TYPES)) / elapsed, 2) if elapsed else None,
+        "limitador": data_manager.client.get_limiter_stats()
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Consulta del servicio SOAP de CORFO por código de proyecto.")
+    parser.add_argument("codigo", nargs="?", help="Código de proyecto a consultar (modo individual).")
+    parser.add_argument("--informes", action="store_true", help="Compatibilidad: los informes siempre se incluyen.")
+    parser.add_argument("--codigos", metavar="ARCHIVO", default=None,
+                        help="Exportación masiva: archivo con un código de proyecto por línea.")
+    parser.add_argument("--salida", metavar="RUTA", default=None,
+                        help="Archivo de salida de la exportación (.jsonl o .csv).")
+    parser.add_argument("--formato", choices=["jsonl", "csv"], default=None,
+                        help="Formato de salida (por defecto según la extensión de --salida).")
+    parser.add_argument("--workers", type=int, default=8, help="Proyectos consultados en paralelo.")
+    parser.add_argument("--fallidos", metavar="ARCHIVO", default=None,
+                        help="Escribir los códigos fallidos (uno por línea) para reintentarlos con --codigos.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.codigos is None:
+        codigo = args.codigo or input("Ingrese el código de proyecto a consultar: ").strip()
+        if not codigo:
+            print("❌ Debe ingresar un código de proyecto válido.")
+            sys.exit(1)
+        # Siempre consultar informes asociados
+        consultar_proyecto(codigo, True)
+        return
+
+    if not args.salida:
+        print("❌ La exportación masiva requiere --salida (.jsonl o .csv).")
         sys.exit(1)
+    formato = args.formato or ("csv" if args.salida.lower().endswith(".csv") else "jsonl")
+    codigos = leer_codigos(args.codigos, unique=True)
+    if not codigos:
+        print("❌ El archivo no contiene códigos de proyecto.")
+        sys.exit(1)
+
+    print(f"🚀 Exportando {len(codigos)} proyectos a {args.salida} ({formato}, {args.workers} en paralelo)...",
+          file=sys.stderr)
+    resumen = exportar_snapshots(codigos, args.salida, formato, max(1, args.workers))
 
-    # Siempre consultar informes asociados
-    consultar_proyecto(codigo, True)
+    for fallido in resumen["fallidos"]:
+        print(f"⚠️ {fallido['projectCode']}: {fallido['error']}", file=sys.stderr)
+    if args.fallidos:
+        with open(args.fallidos, "w", encoding="utf-8") as f:
+            f.writelines(f"{fallido['projectCode']}\n" for fallido in resumen["fallidos"])
+    print(json.dumps({**resumen, "fallidos": len(resumen["fallidos"])}, indent=4, ensure_ascii=False),
+          file=sys.stderr)
+    if resumen["fallidos"]:
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
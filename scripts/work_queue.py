@@ -0,0 +1,80 @@
+"""
+scripts/work_queue.py
+Ejecución por lotes repartida entre varios equipos sobre una cola SQLite compartida.
+
+Uso:
+    # 1) Un analista carga los códigos en la cola (carpeta compartida)
+    python scripts/work_queue.py enqueue \\\\servidor\\lotes\\cola.sqlite codigos.txt \\
+        --carta perentoria --informe "INFORME DE AVANCE"
+
+    # 2) Cada equipo (o varios procesos en el mismo equipo) se suma como nodo
+    python scripts/work_queue.py worker \\\\servidor\\lotes\\cola.sqlite --salida \\\\servidor\\lotes\\cartas
+
+    # 3) Estado de la cola
+    python scripts/work_queue.py status \\\\servidor\\lotes\\cola.sqlite
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Asegurar que se puede importar desde la raíz del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from architecture.utils.profiling import enable_profiling, disable_profiling
+from architecture.utils.code_list import leer_codigos
+from core.work_queue import SharedWorkQueue, QueueWorker
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Cola de trabajo compartida para lotes de cartas.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    enqueue = sub.add_parser("enqueue", help="Agregar códigos a la cola.")
+    enqueue.add_argument("cola", help="Ruta del archivo SQLite compartido.")
+    enqueue.add_argument("codigos", help="Archivo de texto con un código por línea.")
+    enqueue.add_argument("--carta", default="perentoria", choices=["perentoria", "incumplimiento"])
+    enqueue.add_argument("--informe", default="INFORME DE AVANCE")
+    enqueue.add_argument("--fecha-informe", default=None)
+
+    worker = sub.add_parser("worker", help="Procesar tareas de la cola como un nodo.")
+    worker.add_argument("cola", help="Ruta del archivo SQLite compartido.")
+    worker.add_argument("--salida", default=None, help="Carpeta de salida (por defecto, Descargas).")
+    worker.add_argument("--lote", type=int, default=4, help="Tareas reclamadas por vez.")
+    worker.add_argument("--lease", type=float, default=300.0, help="Duración del lease en segundos.")
+    worker.add_argument("--node-id", default=None, help="Identificador del nodo.")
+    worker.add_argument("--esperar", action="store_true",
+                        help="Seguir esperando nuevas tareas cuando la cola se vacía.")
+    worker.add_argument("--profile", metavar="CARPETA", default=None,
+                        help="Perfilar el nodo y escribir pilas colapsadas (.collapsed) y .pstats en la carpeta.")
+
+    status = sub.add_parser("status", help="Mostrar el estado de la cola.")
+    status.add_argument("cola", help="Ruta del archivo SQLite compartido.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    queue = SharedWorkQueue(args.cola, lease_seconds=getattr(args, "lease", 300.0))
+    try:
+        if args.comando == "enqueue":
+            agregados = queue.enqueue(leer_codigos(args.codigos), args.carta, args.informe, args.fecha_informe)
+            print(f"📥 {agregados} tareas agregadas a la cola.")
+        elif args.comando == "worker":
+            worker = QueueWorker(queue, node_id=args.node_id, output_dir=args.salida, batch_size=args.lote)
+            if args.profile:
+                enable_profiling(label=f"nodo_{worker.node_id}")
+            try:
+                worker.run(exit_when_drained=not args.esperar)
+            finally:
+                if args.profile:
+                    paths = disable_profiling().write(args.profile)
+                    print(f"🔬 Perfil escrito en: {', '.join(paths.values())}")
+        print(json.dumps(queue.stats(), indent=4, ensure_ascii=False))
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
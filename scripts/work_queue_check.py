@@ -0,0 +1,125 @@
+"""
+scripts/work_queue_check.py
+Verifica la cola de trabajo compartida con varios procesos locales, sin OSB ni plantillas:
+encola N códigos en una cola SQLite temporal, lanza varios procesos QueueWorker con una
+integración y un procesador de prueba, y comprueba que cada tarea terminó exactamente
+una vez (estado 'done' en la cola y una sola ejecución registrada por código).
+Termina con código 1 si alguna verificación falla.
+
+Uso:
+    python scripts/work_queue_check.py
+    python scripts/work_queue_check.py --procesos 5 --tareas 300
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Asegurar que se puede importar desde la raíz del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.work_queue import SharedWorkQueue, QueueWorker, STATUS_DONE
+
+
+class IntegracionDePrueba:
+    """Reemplaza la consulta SOAP + Excel por una espera corta."""
+
+    def get_integrated_data(self, project_code: str) -> dict:
+        time.sleep(random.uniform(0.005, 0.02))
+        return {"projectCode": project_code}
+
+
+class ProcesadorDePrueba:
+    """Registra cada ejecución como un archivo propio (código + proceso + número)."""
+
+    def __init__(self, registro: str):
+        self.registro = registro
+        self.ejecuciones = 0
+
+    def save_letter(self, data, report_type, report_date, letter_type, output_dir=None):
+        self.ejecuciones += 1
+        path = os.path.join(self.registro, f"{data['projectCode']}__{os.getpid()}__{self.ejecuciones}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(letter_type)
+        return path, {}, False
+
+
+def nodo(cola: str, registro: str, lease: float):
+    """Proceso trabajador: consume la cola hasta vaciarla."""
+    queue = SharedWorkQueue(cola, lease_seconds=lease)
+    worker = QueueWorker(
+        queue, integration=IntegracionDePrueba(), processor=ProcesadorDePrueba(registro), batch_size=4
+    )
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            worker.run(poll_interval=0.2)
+    finally:
+        queue.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verificación multiproceso de la cola compartida.")
+    parser.add_argument("--procesos", type=int, default=3, help="Procesos trabajadores.")
+    parser.add_argument("--tareas", type=int, default=200, help="Códigos a encolar.")
+    parser.add_argument("--lease", type=float, default=30.0, help="Duración del lease en segundos.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        cola = os.path.join(carpeta, "cola.sqlite")
+        registro = os.path.join(carpeta, "ejecuciones")
+        os.makedirs(registro)
+
+        codigos = [f"CHK-{i:05d}" for i in range(args.tareas)]
+        queue = SharedWorkQueue(cola, lease_seconds=args.lease)
+        queue.enqueue(codigos, "perentoria", "INFORME DE AVANCE")
+        queue.close()
+
+        inicio = time.perf_counter()
+        procesos = [
+            multiprocessing.Process(target=nodo, args=(cola, registro, args.lease))
+            for _ in range(args.procesos)
+        ]
+        for proceso in procesos:
+            proceso.start()
+        for proceso in procesos:
+            proceso.join()
+        segundos = time.perf_counter() - inicio
+
+        ejecuciones = {}
+        nodos = set()
+        for nombre in os.listdir(registro):
+            codigo, pid, _ = nombre.split("__")
+            ejecuciones[codigo] = ejecuciones.get(codigo, 0) + 1
+            nodos.add(pid)
+
+        queue = SharedWorkQueue(cola, lease_seconds=args.lease)
+        stats = queue.stats()
+        queue.close()
+
+    repetidas = {c: n for c, n in ejecuciones.items() if n > 1}
+    faltantes = [c for c in codigos if c not in ejecuciones]
+    resultados = [
+        ("todos los procesos terminaron sin error",
+         all(p.exitcode == 0 for p in procesos), [p.exitcode for p in procesos]),
+        (f"las {args.tareas} tareas quedaron 'done'",
+         stats["byStatus"] == {STATUS_DONE: args.tareas}, stats["byStatus"]),
+        ("ninguna tarea se procesó dos veces", not repetidas, repetidas or "-"),
+        ("ninguna tarea quedó sin procesar", not faltantes, faltantes[:5] or "-")
+    ]
+
+    print(f"⏱️ {args.procesos} procesos, {args.tareas} tareas en {segundos:.1f} s "
+          f"({len(nodos)} nodos procesaron tareas)")
+    for descripcion, ok, detalle in resultados:
+        print(f"{'✅' if ok else '❌'} {descripcion} ({detalle})")
+    if not all(ok for _, ok, _ in resultados):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+"""
+services/adaptive_limiter.py
+Limitador de concurrencia adaptativo (AIMD) para el OSB de CORFO.
+Aumenta de a poco las llamadas simultáneas mientras la latencia se mantiene baja
+y el límite se está usando completo, y lo reduce a la mitad ante timeouts o SOAP faults.
+Las llamadas interactivas que esperan cupo pasan delante de las de lotes.
+"""
+
+
+class AdaptiveConcurrencyLimiter:
+    """Semáforo con límite variable: incremento aditivo, reducción multiplicativa."""
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        latency_target: float = 2.0,
+        backoff_ratio: float = 0.5,
+        cooldown: float = 1.0,
+        window: int = 500
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff_ratio = backoff_ratio
+        self.cooldown = cooldown
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        # Llamadas interactivas esperando cupo: mientras haya alguna, los lotes no toman cupos
+        self._interactive_waiting = 0
+        # Cuántas veces se llegó al límite (las llamadas comparan antes y después)
+        self._saturations = 0
+        self._latencies = deque(maxlen=window)
+        self._successes = 0
+        self._failures = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    # ─────────────────────────────────────────────
+    # 🔹 ADQUISICIÓN
+    # ─────────────────────────────────────────────
+    @property
+    def limit(self) -> int:
+        """Límite actual de llamadas simultáneas."""
+        return int(self._limit)
+
+    @contextmanager
+    def track(self, interactive: bool = False):
+        """
+        Reserva un cupo (bloquea si se alcanzó el límite) y registra la latencia.
+        Con interactive=True la llamada toma el próximo cupo libre antes que las de lotes.
+        Si el bloque lanza una excepción se cuenta como falla y se reduce el límite.
+        """
+        with self._condition:
+            if interactive:
+                self._interactive_waiting += 1
+                try:
+                    while self._in_flight >= self.limit:
+                        self._condition.wait()
+                finally:
+                    self._interactive_waiting -= 1
+            else:
+                while self._in_flight >= self.limit or self._interactive_waiting:
+                    self._condition.wait()
+            marker = self._saturations
+            self._in_flight += 1
+            if self._in_flight >= self.limit:
+                self._saturations += 1
+
+        start = time.perf_counter()
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            self._release(time.perf_counter() - start, success, marker)
+
+    def _release(self, latency: float, success: bool, marker: int):
+        with self._condition:
+            self._in_flight -= 1
+            self._latencies.append(latency)
+            if success:
+                self._successes += 1
+                # Incremento aditivo: +1 cupo por cada "ventana" de llamadas rápidas, solo si
+                # el límite se copó mientras la llamada estaba en vuelo (con poco uso no hay
+                # evidencia de que el OSB soporte más, y el límite subiría solo hasta max_limit)
+                saturated = self._saturations != marker
+                if saturated and latency <= self.latency_target and self._limit < self.max_limit:
+                    self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+            else:
+                self._failures += 1
+                # Reducción multiplicativa, como máximo una vez por período de enfriamiento
+                now = time.monotonic()
+                if now - self._last_decrease >= self.cooldown:
+                    self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                    self._last_decrease = now
+            self._condition.notify_all()
+
+    # ─────────────────────────────────────────────
+    # 📈 MÉTRICAS
+    # ─────────────────────────────────────────────
+    def latency_percentiles(self, percentiles=(50, 90, 99)) -> dict:
+        """Percentiles de latencia (segundos) sobre la ventana de llamadas recientes."""
+        with self._condition:
+            values = sorted(self._latencies)
+        if not values:
+            return {f"p{p}": None for p in percentiles}
+        result = {}
+        for p in percentiles:
+            rank = max(0, math.ceil(p / 100 * len(values)) - 1)
+            result[f"p{p}"] = round(values[rank], 4)
+        return result
+
+    def stats(self) -> dict:
+        """Límite actual, llamadas en vuelo, contadores y percentiles de latencia."""
+        with self._condition:
+            stats = {
+                "limit": self.limit,
+                "inFlight": self._in_flight,
+                "successes": self._successes,
+                "failures": self._failures
+            }
+        stats["latency"] = self.latency_percentiles()
+        return stats
@@ -0,0 +1,266 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import urlparse, unquote
+from architecture.data_access.excel_data_manager import ExcelDataManager
+from architecture.data_access.errors import SoapUnavailableError
+from architecture.data_access.excel_watcher import ExcelFileWatcher
+from architecture.data_access.integration_data_manager import IntegrationDataManager
+from architecture.data_access.single_flight import SingleFlight
+from architecture.data_access.soap_data_manager import SoapDataManager
+from architecture.document_processing.document_processor import DocumentProcessor
+from architecture.utils.path_utils import build_letter_file_name
+from architecture.utils.profiling import profiled
+from core.work_scheduler import WorkScheduler, get_scheduler, INTERACTIVE
+from services.soap_client import SoapClient
+
+"""
+services/http_service.py
+Servicio HTTP local de larga duración que expone la integración de datos
+y la generación de cartas a otras herramientas internas:
+
+    GET  /projects/{code}   → JSON integrado (SOAP + Excel)
+    POST /letters           → .docx generado (cuerpo JSON: projectCode, letterType, reportType, reportDate)
+    GET  /health            → estado del planificador, del OSB y de las cachés
+
+Mantiene caliente el índice Excel (watcher), reutiliza un único cliente SOAP con
+pool de conexiones, cachea los datos integrados y delega el trabajo al planificador compartido.
+Si el OSB no responde se contesta 503 y no se cachea nada.
+"""
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class IntegratedDataCache:
+    """Caché con vencimiento de datos integrados, invalidada por los cambios del Excel."""
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, project_code: str):
+        with self._lock:
+            entry = self._entries.get(project_code)
+            if entry and time.monotonic() - entry[0] < self.ttl:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, project_code: str, data: dict):
+        with self._lock:
+            self._entries[project_code] = (time.monotonic(), data)
+
+    def invalidate(self, project_codes: list):
+        with self._lock:
+            for code in project_codes:
+                self._entries.pop(code, None)
+
+    def on_excel_change(self, change_log):
+        """Suscriptor de ExcelDataManager: descarta solo los proyectos afectados."""
+        self.invalidate(change_log.affected)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class LetterService:
+    """Estado compartido del servicio: managers, cachés y planificador."""
+
+    def __init__(
+        self,
+        excel_manager: ExcelDataManager | None = None,
+        soap_pool_size: int = 16,
+        cache_ttl: float = 300.0,
+        scheduler: WorkScheduler | None = None
+    ):
+        self.excel_manager = excel_manager or ExcelDataManager.shared()
+        self.soap_manager = SoapDataManager(SoapClient(pool_size=soap_pool_size))
+        self.integration = IntegrationDataManager(self.soap_manager, self.excel_manager)
+        self.processor = DocumentProcessor()
+        self.scheduler = scheduler or get_scheduler()
+
+        self.cache = IntegratedDataCache(cache_ttl)
+        self.excel_manager.subscribe(self.cache.on_excel_change)
+        self.watcher = ExcelFileWatcher(self.excel_manager)
+        self._inflight = SingleFlight()
+
+    def start(self):
+        self.watcher.start()
+        return self
+
+    def stop(self):
+        self.watcher.stop()
+
+    # ─────────────────────────────────────────────
+    # 🔹 OPERACIONES
+    # ─────────────────────────────────────────────
+    @profiled("get_integrated_data")
+    def _fetch_integrated(self, project_code: str) -> dict:
+        # Sin diálogos: un código ausente del Excel solo deja sin campos Excel.
+        # Si el OSB falla se lanza SoapUnavailableError: nada llega a la caché
+        soap_data = self.soap_manager.get_project_data(project_code)
+        excel_data = self.excel_manager.find_project(project_code) or {}
+        return self.integration.integrate(project_code, soap_data, excel_data)
+
+    def get_integrated_data(self, project_code: str) -> dict:
+        """Datos integrados desde caché, o consultados una sola vez aunque lleguen varios clientes."""
+        project_code = project_code.strip()
+        data = self.cache.get(project_code)
+        if data is not None:
+            return data
+
+        future = self.scheduler.submit(
+            self._inflight.do, project_code, self._fetch_integrated, project_code, priority=INTERACTIVE
+        )
+        # Solo se guarda lo que llegó completo de SOAP: durante una caída del OSB
+        # future.result() lanza SoapUnavailableError y no se cachea nada
+        data = future.result()
+        if data.get("projectinfo"):
+            self.cache.put(project_code, data)
+        return data
+
+    def generate_letter_bytes(self, request: dict) -> tuple[str, bytes]:
+        """Genera la carta en memoria. Retorna (nombre_archivo, bytes_docx)."""
+        if not isinstance(request, dict):
+            raise ValueError("El cuerpo debe ser un objeto JSON.")
+        project_code = str(request.get("projectCode", "")).strip()
+        letter_type = str(request.get("letterType", "perentoria")).strip().lower()
+        report_type = str(request.get("reportType", "")).strip()
+        report_date = request.get("reportDate") or None
+        if not project_code or not report_type:
+            raise ValueError("Se requieren 'projectCode' y 'reportType'.")
+
+        data = self.get_integrated_data(project_code)
+        buffer = BytesIO()
+        future = self.scheduler.submit(
+            self.processor.generate_letter, data, report_type, report_date, letter_type,
+            output=buffer, priority=INTERACTIVE
+        )
+        future.result()
+        return build_letter_file_name(project_code, letter_type), buffer.getvalue()
+
+    def health(self) -> dict:
+        return {
+            "scheduler": self.scheduler.stats(),
+            "osb": self.soap_manager.client.get_limiter_stats(),
+            "cache": self.cache.stats(),
+            "coalescing": self._inflight.stats(),
+            "excelLoaded": self.excel_manager.is_loaded()
+        }
+
+
+class LetterRequestHandler(BaseHTTPRequestHandler):
+    """Atiende las rutas HTTP; cada solicitud corre en su propio hilo (ThreadingHTTPServer)."""
+
+    server_version = "CartasPerentorias/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self) -> LetterService:
+        return self.server.letter_service
+
+    def _send_json(self, status: int, payload):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_docx(self, file_name: str, content: bytes):
+        self.send_response(200)
+        self.send_header("Content-Type", DOCX_MIME)
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("Content-Disposition", f'attachment; filename="{file_name}"')
+        self.end_headers()
+        view = memoryview(content)
+        for start in range(0, len(view), STREAM_CHUNK_SIZE):
+            self.wfile.write(view[start:start + STREAM_CHUNK_SIZE])
+
+    def _read_body(self) -> bytes:
+        """Lee el cuerpo completo (Content-Length) para no dejar bytes en la conexión keep-alive."""
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            # Sin un largo válido no se sabe dónde termina el cuerpo: se cierra la conexión
+            self.close_connection = True
+            raise ValueError("Content-Length inválido.")
+        return self.rfile.read(length) if length else b""
+
+    def do_GET(self):
+        path = urlparse(self.path).path.rstrip("/")
+        try:
+            if path == "/health":
+                self._send_json(200, self.service.health())
+            elif path.startswith("/projects/"):
+                code = unquote(path[len("/projects/"):])
+                data = self.service.get_integrated_data(code)
+                if not data.get("projectinfo"):
+                    self._send_json(404, {"error": f"No se encontró el proyecto {code}"})
+                else:
+                    self._send_json(200, data)
+            else:
+                self._send_json(404, {"error": "Ruta no encontrada"})
+        except SoapUnavailableError as e:
+            self._send_json(503, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+
+    def do_POST(self):
+        path = urlparse(self.path).path.rstrip("/")
+        try:
+            # El cuerpo se consume siempre, también en rutas desconocidas (conexión keep-alive)
+            body = self._read_body()
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        if path != "/letters":
+            self._send_json(404, {"error": "Ruta no encontrada"})
+            return
+        try:
+            request = json.loads(body or b"{}")
+            file_name, content = self.service.generate_letter_bytes(request)
+        except SoapUnavailableError as e:
+            self._send_json(503, {"error": str(e)})
+            return
+        except (ValueError, KeyError) as e:
+            # Datos de entrada o del proyecto insuficientes para generar la carta
+            self._send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send_docx(file_name, content)
+
+    def log_message(self, format, *args):
+        print(f"🌐 {self.address_string()} - {format % args}")
+
+
+def create_server(host: str = "127.0.0.1", port: int = 8765, service: LetterService | None = None):
+    """Crea el servidor HTTP (sin iniciarlo) con el servicio ya precalentado."""
+    server = ThreadingHTTPServer((host, port), LetterRequestHandler)
+    server.daemon_threads = True
+    server.letter_service = (service or LetterService()).start()
+    return server
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765):
+    server = create_server(host, port)
+    print(f"🚀 Servicio de cartas escuchando en http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Deteniendo servicio...")
+    finally:
+        server.letter_service.stop()
+        server.server_close()
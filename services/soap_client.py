@@ -1,5 +1,10 @@
+import requests
+from requests.adapters import HTTPAdapter
 from zeep import Client
 from zeep.helpers import serialize_object
+from zeep.transports import Transport
+from services.adaptive_limiter import AdaptiveConcurrencyLimiter
+from core.work_scheduler import current_priority, INTERACTIVE
 
 """
 services/soap_client.py
@@ -11,18 +16,40 @@ Provee funciones genéricas para invocar los métodos del WSDL.
 
 WSDL_URL = "http://osblb2.corfo.cl/OSB/PX000451_ConsultaSnapshotSGP?wsdl"
 
+# Limitador compartido por todos los clientes del proceso (un único OSB)
+OSB_LIMITER = AdaptiveConcurrencyLimiter()
+
 
 class SoapClient:
     """Cliente SOAP genérico para consumir los métodos del WSDL de CORFO."""
 
-    def __init__(self, wsdl_url=WSDL_URL):
-        self.client = Client(wsdl=wsdl_url)
+    def __init__(
+        self,
+        wsdl_url=WSDL_URL,
+        limiter: AdaptiveConcurrencyLimiter | None = None,
+        pool_size: int | None = None
+    ):
+        if pool_size:
+            # Sesión HTTP con pool de conexiones reutilizables para uso concurrente
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self.client = Client(wsdl=wsdl_url, transport=Transport(session=session))
+        else:
+            self.client = Client(wsdl=wsdl_url)
+        self.limiter = limiter or OSB_LIMITER
+
+    def _track(self):
+        """Cupo del limitador; lo pedido desde un trabajo interactivo pasa delante de los lotes."""
+        return self.limiter.track(interactive=current_priority() == INTERACTIVE)
 
     def get_snapshot_proyectos(self, project_code: str):
         """Obtiene datos generales del proyecto."""
         params = {"PROYECTO": project_code}
         try:
-            response = self.client.service.SEL_SNAPSHOT_PROYECTOS(**params)
+            with self._track():
+                response = self.client.service.SEL_SNAPSHOT_PROYECTOS(**params)
             return serialize_object(response)
         except Exception as e:
             print(f"❌ Error en SEL_SNAPSHOT_PROYECTOS: {e}")
@@ -32,8 +59,13 @@ class SoapClient:
         """Obtiene informes asociados al proyecto según tipo."""
         params = {"GERENCIA": "", "PROYECTO": project_code, "TIPO": report_type}
         try:
-            response = self.client.service.SEL_SNAPSHOT_INFORMES(**params)
+            with self._track():
+                response = self.client.service.SEL_SNAPSHOT_INFORMES(**params)
             return serialize_object(response)
         except Exception as e:
             print(f"⚠️ Error en SEL_SNAPSHOT_INFORMES ({report_type}): {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def get_limiter_stats(self) -> dict:
+        """Límite adaptativo actual y percentiles de latencia del OSB."""
+        return self.limiter.stats()